@@ -0,0 +1 @@
+"""Offline benchmarks for auditor-agent (run with `python -m benchmarks.<name>`)."""
@@ -0,0 +1,86 @@
+"""
+Deterministic checks throughput on large synthetic ledgers.
+
+Builds the columnar table directly from columns (no Txn models) and times
+table construction and each vectorized check separately. Check times
+include building the findings, whose detail text is rendered lazily.
+
+Usage:
+    python -m benchmarks.bench_checks --rows 1000000 10000000
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from src.checks.deterministic import (
+    find_duplicate_invoices,
+    find_round_numbers,
+    find_weekend_postings,
+)
+from src.checks.registry import default_registry
+from src.checks.table import TxnTable
+
+
+def make_columns(rows: int, seed: int = 5) -> dict:
+    """Synthetic ledger: 2 years of mostly business-day postings, 5k vendors, 1% round amounts."""
+    rng = np.random.default_rng(seed)
+    days = np.datetime64("2023-01-01") + np.arange(730)
+    weekend = np.isin((days.astype(np.int64) + 3) % 7, (5, 6))
+    # Each weekend day is 1/20 as likely as a business day
+    weights = np.where(weekend, 0.05, 1.0)
+    date_labels = [str(day) for day in days]
+    vendor_labels = [f"Vendor {i}" for i in range(5000)]
+
+    amounts = np.round(rng.lognormal(5, 2, rows), 2)
+    round_rows = rng.random(rows) < 0.01
+    amounts[round_rows] = rng.integers(10, 100, round_rows.sum()) * 100.0
+
+    return {
+        "ids": [f"txn_{i}" for i in range(rows)],
+        "amounts": amounts,
+        "dates": [
+            date_labels[i] for i in rng.choice(len(date_labels), rows, p=weights / weights.sum())
+        ],
+        "vendors": [vendor_labels[i] for i in rng.integers(0, len(vendor_labels), rows)],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--workers", type=int, default=4, help="Pool size for the registry run")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'rows':>12}{'table s':>10}{'dup s':>8}{'round s':>9}{'weekend s':>11}{'findings':>10}")
+    for rows in args.rows:
+        columns = make_columns(rows)
+
+        start = time.perf_counter()
+        table = TxnTable.from_columns(**columns)
+        built = time.perf_counter()
+        dups = find_duplicate_invoices(table)
+        t_dup = time.perf_counter()
+        rounds = find_round_numbers(table)
+        t_round = time.perf_counter()
+        weekends = find_weekend_postings(table)
+        t_weekend = time.perf_counter()
+
+        total = len(dups) + len(rounds) + len(weekends)
+        print(
+            f"{rows:>12,}{built - start:>10.2f}{t_dup - built:>8.2f}"
+            f"{t_round - t_dup:>9.2f}{t_weekend - t_round:>11.2f}{total:>10,}"
+        )
+
+        start = time.perf_counter()
+        results = default_registry.run({"table": table}, max_workers=args.workers)
+        pooled = time.perf_counter() - start
+        per_check = ", ".join(f"{r.name} {r.seconds:.2f}s" for r in results)
+        print(f"{'':>12}registry ({args.workers} workers): {pooled:.2f}s [{per_check}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Chunking throughput at increasing document sizes.
+
+Time per MB should stay flat as the input grows (linear scaling).
+
+Usage:
+    python -m benchmarks.bench_chunking --sizes 1 10 100
+"""
+
+import argparse
+import random
+import time
+
+from src.chunking import iter_chunk_spans
+
+# fmt: off
+WORDS = [
+    "Invoice", "payment", "vendor", "total", "$1,234.56", "account", "ledger",
+    "balance.", "period", "adjustment", "01/15/2024", "accrual", "reconciled.\n",
+]
+# fmt: on
+
+
+def make_text(megabytes: int, seed: int = 3) -> str:
+    """Generate roughly megabytes MB of ledger-like prose."""
+    rng = random.Random(seed)
+    block = " ".join(rng.choice(WORDS) for _ in range(200_000))
+    repeats = max(1, megabytes * 1_000_000 // len(block))
+    return (block + " ") * repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--max-tokens", type=int, default=384)
+    parser.add_argument("--overlap-tokens", type=int, default=48)
+    args = parser.parse_args()
+
+    print(f"{'MB':>6}{'chunks':>10}{'seconds':>10}{'s/MB':>8}")
+    for size in args.sizes:
+        text = make_text(size)
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_chunk_spans(text, args.max_tokens, args.overlap_tokens))
+        elapsed = time.perf_counter() - start
+        mb = len(text) / 1_000_000
+        print(f"{mb:>6.0f}{count:>10}{elapsed:>10.2f}{elapsed / mb:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Recall@k versus size tradeoff for embedding compression.
+
+Compares each compression setting against exact cosine search over the
+full-width float32 vectors and reports recall@k with bytes per vector at
+rest and on the wire (JSON, as sent to /vector/upsert).
+
+Usage:
+    python -m benchmarks.bench_embeddings
+    python -m benchmarks.bench_embeddings --corpus embeddings.npy --k 10
+
+Without --corpus, a synthetic corpus is generated whose variance is
+concentrated in the leading dimensions, like text-embedding-004 output.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import orjson
+
+from src.embeddings import (
+    FULL_DIMENSIONS,
+    EmbeddingCompressor,
+    dequantize_int8,
+    quantize_int8,
+    truncate_dimensions,
+)
+
+SETTINGS = [
+    (None, False),
+    (None, True),
+    (512, False),
+    (256, False),
+    (256, True),
+    (128, True),
+]
+
+
+def synthetic_corpus(n: int, dims: int, clusters: int, seed: int) -> np.ndarray:
+    """Clustered unit vectors with a decaying per-dimension spectrum."""
+    rng = np.random.default_rng(seed)
+    spectrum = np.arange(1, dims + 1, dtype=np.float32) ** -0.5
+    centers = rng.standard_normal((clusters, dims)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n, dims)).astype(np.float32)
+    vectors *= spectrum
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k most similar corpus rows for each query (cosine)."""
+    corpus = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = queries @ corpus.T
+    part = np.argpartition(-scores, k, axis=1)[:, :k]
+    order = np.take_along_axis(scores, part, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(part, order, axis=1)
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray) -> float:
+    """Mean fraction of true neighbours recovered."""
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+    return hits / truth.size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="Path to an (n, 768) .npy file of embeddings")
+    parser.add_argument("--n", type=int, default=20000, help="Synthetic corpus size")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = np.load(args.corpus).astype(np.float32)
+    else:
+        corpus = synthetic_corpus(args.n, FULL_DIMENSIONS, clusters=200, seed=args.seed)
+
+    rng = np.random.default_rng(args.seed + 1)
+    picks = rng.choice(len(corpus), size=args.queries, replace=False)
+    queries = corpus[picks] + 0.05 * rng.standard_normal((args.queries, corpus.shape[1]))
+    queries = queries.astype(np.float32)
+    truth = top_k(corpus, queries, args.k)
+
+    print(f"corpus={corpus.shape} queries={len(queries)} k={args.k}")
+    print(f"{'setting':<16}{'recall@k':>10}{'bytes/vec':>12}{'wire/vec':>12}{'ratio':>8}{'ms':>8}")
+
+    baseline_bytes = corpus.shape[1] * 4
+    for dimensions, quantize in SETTINGS:
+        compressor = EmbeddingCompressor(dimensions, quantize)
+        start = time.perf_counter()
+
+        stored = corpus
+        if dimensions:
+            stored = truncate_dimensions(stored, dimensions)
+        if quantize:
+            codes, scales = quantize_int8(stored)
+            stored = dequantize_int8(codes, scales)
+            wire_sample = codes[:200].tolist()
+        else:
+            wire_sample = stored[:200].tolist()
+
+        q = truncate_dimensions(queries, dimensions) if dimensions else queries
+        found = top_k(stored, q, args.k)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        label = f"{dimensions or corpus.shape[1]}d {'int8' if quantize else 'f32'}"
+        at_rest = compressor.bytes_per_vector(corpus.shape[1])
+        wire = len(orjson.dumps(wire_sample)) / len(wire_sample)
+        print(
+            f"{label:<16}{recall_at_k(truth, found):>10.3f}{at_rest:>12}{wire:>12.0f}"
+            f"{baseline_bytes / at_rest:>7.1f}x{elapsed_ms:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Transaction extraction throughput on multi-megabyte statements.
+
+Compares the streaming extractor with the previous unbounded findall pattern
+on two inputs: a regular statement (one transaction per line) and a narrative
+document whose long lines contain many dates but no amounts, where the lazy
+".*?" scan of the old pattern degrades to quadratic time per line.
+
+Usage:
+    python -m benchmarks.bench_extraction --sizes 1 5 20
+"""
+
+import argparse
+import random
+import re
+import time
+
+from src.state import Txn
+from src.transactions import iter_transactions
+
+LEGACY_PATTERN = re.compile(r"(\d{1,2}[-/]\d{1,2}[-/]\d{2,4}).*?\$?([\d,]+\.\d{2})")
+
+VENDORS = ["Acme Corp", "Beta Inc", "Cafe Luna", "Delta Supplies", "Echo Travel"]
+MEMOS = ["Invoice 4411", "Monthly retainer", "Office supplies", "Travel", "Refund"]
+
+
+def make_statement(megabytes: float, seed: int = 5) -> str:
+    """Generate roughly megabytes MB of statement rows."""
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    while size < megabytes * 1_000_000:
+        line = (
+            f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2024  "
+            f"{rng.choice(VENDORS)}  {rng.choice(MEMOS)}  "
+            f"${rng.randint(1, 99_999):,}.{rng.randint(0, 99):02d}"
+        )
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def make_narrative(megabytes: float, line_chars: int = 20_000) -> str:
+    """Generate long lines full of dates that are never followed by an amount."""
+    sentence = "Reviewed on 01/15/2024 with the controller and filed. "
+    line = sentence * (line_chars // len(sentence))
+    return "\n".join([line] * max(1, int(megabytes * 1_000_000) // len(line)))
+
+
+def legacy_count(text: str) -> int:
+    """Transactions built by the previous extractor (without its 100-row cap)."""
+    return sum(
+        1
+        for i, (date, amount) in enumerate(LEGACY_PATTERN.findall(text))
+        if Txn(id=f"txn_{i}", amount=float(amount.replace(",", "")), date=date)
+    )
+
+
+def streaming_count(text: str) -> int:
+    """Transaction count of the streaming extractor."""
+    return sum(1 for _ in iter_transactions(text))
+
+
+def timed(fn, text: str) -> tuple[int, float]:
+    start = time.perf_counter()
+    count = fn(text)
+    return count, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5, 20])
+    parser.add_argument(
+        "--narrative-mb",
+        type=float,
+        default=0.2,
+        help="Size of the narrative input (the legacy pattern is quadratic on it)",
+    )
+    args = parser.parse_args()
+
+    print("Statement rows")
+    print(f"{'MB':>6}{'txns':>10}{'stream s':>10}{'s/MB':>8}{'legacy s':>10}")
+    for size in args.sizes:
+        text = make_statement(size)
+        mb = len(text) / 1_000_000
+        count, elapsed = timed(streaming_count, text)
+        _, legacy = timed(legacy_count, text)
+        print(f"{mb:>6.1f}{count:>10}{elapsed:>10.2f}{elapsed / mb:>8.3f}{legacy:>10.2f}")
+
+    print("\nNarrative lines (dates without amounts)")
+    text = make_narrative(args.narrative_mb)
+    mb = len(text) / 1_000_000
+    count, elapsed = timed(streaming_count, text)
+    _, legacy = timed(legacy_count, text)
+    print(f"{mb:.1f} MB: streaming {elapsed:.2f}s ({count} txns), legacy {legacy:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Cross-run fingerprint lookups as tenant history grows.
+
+Records a history of earlier runs, then times one run's lookup (mostly new
+transactions plus some repeats). Lookup time per transaction should stay flat
+as the history grows: the Bloom filter rejects new transactions in memory and
+repeats cost one primary-key probe each.
+
+Usage:
+    python -m benchmarks.bench_fingerprints --history 100000 1000000 5000000
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+
+import numpy as np
+
+from src.fingerprints import FingerprintStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--history", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--run-size", type=int, default=20_000)
+    parser.add_argument("--repeat-rate", type=float, default=0.05)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(11)
+    print(
+        f"{'history':>12}{'record s':>10}{'filter s':>10}{'lookup ms':>11}{'us/txn':>8}{'hits':>7}"
+    )
+    for history in args.history:
+        with tempfile.TemporaryDirectory() as directory:
+            store = FingerprintStore(directory)
+            recorded = rng.integers(-(2**63), 2**63 - 1, history, dtype=np.int64)
+
+            start = time.perf_counter()
+            for run, offset in enumerate(range(0, history, args.run_size)):
+                batch = recorded[offset : offset + args.run_size].tolist()
+                store.record(
+                    "tenant", f"run-{run}", ((fp, f"txn_{i}") for i, fp in enumerate(batch))
+                )
+            record_s = time.perf_counter() - start
+
+            # First lookup after a restart builds the filter from the database
+            store = FingerprintStore(directory)
+            start = time.perf_counter()
+            store.lookup("tenant", [])
+            filter_s = time.perf_counter() - start
+
+            repeats = rng.choice(recorded, int(args.run_size * args.repeat_rate))
+            fresh = rng.integers(-(2**63), 2**63 - 1, args.run_size - len(repeats), dtype=np.int64)
+            keys = np.concatenate([repeats, fresh]).tolist()
+
+            start = time.perf_counter()
+            matches = store.lookup("tenant", keys, exclude_run_id="current")
+            lookup_s = time.perf_counter() - start
+
+        print(
+            f"{history:>12,}{record_s:>10.2f}{filter_s:>10.2f}{lookup_s * 1000:>11.1f}"
+            f"{lookup_s / len(keys) * 1e6:>8.2f}{len(matches):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
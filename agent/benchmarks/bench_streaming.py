@@ -0,0 +1,68 @@
+"""
+Streaming checks over a ledger generated chunk by chunk.
+
+Generates a date-ordered synthetic ledger one chunk at a time (the whole
+ledger never exists in memory), runs every streamable check over it and
+reports throughput and peak resident memory. Peak memory should depend on
+the chunk size and the rows in the duplicate-check window, not on the
+ledger size.
+
+Usage:
+    python -m benchmarks.bench_streaming --rows 5000000 50000000 --chunk-rows 500000
+"""
+
+import argparse
+import logging
+import resource
+import time
+from collections.abc import Iterator
+
+import numpy as np
+
+from src.checks.streaming import CheckStream
+from src.checks.table import TxnTable
+
+
+def ledger_chunks(rows: int, chunk_rows: int, days: int = 730, seed: int = 5) -> Iterator[TxnTable]:
+    """Date-ordered synthetic ledger over the given number of days, 5k vendors, 1% repeats."""
+    rng = np.random.default_rng(seed)
+    start_day = np.datetime64("2023-01-01")
+    for offset in range(0, rows, chunk_rows):
+        size = min(chunk_rows, rows - offset)
+        day = (offset + np.arange(size)) * days // rows
+        amounts = np.round(rng.lognormal(5, 2, size), 2)
+        vendors = rng.integers(0, 5000, size)
+        repeat = rng.random(size) < 0.01
+        amounts[1:][repeat[1:]] = amounts[:-1][repeat[1:]]
+        vendors[1:][repeat[1:]] = vendors[:-1][repeat[1:]]
+        yield TxnTable.from_columns(
+            ids=[f"txn_{offset + i}" for i in range(size)],
+            amounts=amounts,
+            dates=[str(start_day + d) for d in day.tolist()],
+            vendors=[f"Vendor {v}" for v in vendors.tolist()],
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=500_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'rows':>12}{'seconds':>10}{'rows/s':>12}{'findings':>10}{'peak MB':>9}")
+    for rows in args.rows:
+        stream = CheckStream({"state": None, "fingerprint_store": None})
+        findings = 0
+        start = time.perf_counter()
+        for chunk in ledger_chunks(rows, args.chunk_rows):
+            findings += len(stream.update(chunk))
+        findings += len(stream.finish())
+        seconds = time.perf_counter() - start
+        # ru_maxrss is in KiB on Linux; peak over the process so far
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"{rows:>12,}{seconds:>10.1f}{rows / seconds:>12,.0f}{findings:>10,}{peak_mb:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Local vector index: exact versus IVF search.
+
+Reports build time, queries per second and recall@k of approximate IVF
+search (at several nprobe values) against exact blocked search.
+
+Usage:
+    python -m benchmarks.bench_vector_index
+    python -m benchmarks.bench_vector_index --n 200000 --nlist 512
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_embeddings import recall_at_k, synthetic_corpus
+from src.vector_index import LocalVectorIndex
+
+
+def run_queries(index: LocalVectorIndex, queries: np.ndarray, k: int) -> tuple[np.ndarray, float]:
+    """Row indices of the top-k matches for each query, and queries per second."""
+    start = time.perf_counter()
+    results = index.vector_query_batch(queries, top_k=k)
+    elapsed = time.perf_counter() - start
+    found = np.array([[int(m["id"]) for m in matches] for matches in results])
+    return found, len(queries) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=50000, help="Corpus size")
+    parser.add_argument("--dims", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.n, args.dims, clusters=200, seed=args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    picks = rng.choice(len(corpus), size=args.queries, replace=False)
+    queries = (corpus[picks] + 0.05 * rng.standard_normal((args.queries, args.dims))).astype(
+        np.float32
+    )
+
+    index = LocalVectorIndex()
+    start = time.perf_counter()
+    index.vector_upsert([str(i) for i in range(args.n)], corpus)
+    print(f"corpus={corpus.shape} upsert={time.perf_counter() - start:.2f}s")
+
+    truth, qps = run_queries(index, queries, args.k)
+    print(f"{'mode':<16}{'recall@k':>10}{'qps':>10}")
+    print(f"{'exact':<16}{1.0:>10.3f}{qps:>10.0f}")
+
+    start = time.perf_counter()
+    index.build_ivf(args.nlist)
+    print(f"ivf build={time.perf_counter() - start:.2f}s")
+
+    for nprobe in (1, 4, 16, 64):
+        index.nprobe = nprobe
+        found, qps = run_queries(index, queries, args.k)
+        print(f"{f'ivf nprobe={nprobe}':<16}{recall_at_k(truth, found):>10.3f}{qps:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
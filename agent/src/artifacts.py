@@ -0,0 +1,216 @@
+"""Per-run store for large payloads passed between graph nodes."""
+
+import logging
+import pickle
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Items pickled to estimate the size of a large sequence
+_SAMPLE_ITEMS = 64
+
+
+@dataclass(frozen=True, slots=True)
+class ArtifactRef:
+    """Handle to a stored payload, kept in RunState in place of the payload itself."""
+
+    run_id: str
+    name: str
+    # Estimated payload size in bytes
+    size: int
+    # File holding the payload, if it was written to disk
+    path: str | None = None
+
+
+@dataclass(slots=True)
+class _Entry:
+    ref: ArtifactRef
+    refs: int
+    value: Any = None
+    in_memory: bool = False
+
+
+def estimate_nbytes(value: Any) -> int:
+    """
+    Approximate size of a payload.
+
+    Strings and bytes count their length; other sequences are extrapolated
+    from the pickled size of their first items.
+
+    Args:
+        value: Payload
+
+    Returns:
+        Estimated size in bytes
+    """
+    if isinstance(value, str | bytes | bytearray | memoryview):
+        return len(value)
+    if isinstance(value, list | tuple):
+        if not value:
+            return 0
+        sample = value[:_SAMPLE_ITEMS]
+        return len(pickle.dumps(sample, protocol=5)) * len(value) // len(sample)
+    return len(pickle.dumps(value, protocol=5))
+
+
+class ArtifactStore:
+    """
+    Reference-counted store of large run payloads, spilling big ones to disk.
+
+    A payload is stored with the number of consumers that will read it; each
+    consumer releases its reference once done, and the last release frees the
+    payload. Payloads larger than spill_threshold_bytes are written to
+    spill_dir instead of being kept in memory, and read back on access.
+    Payloads are keyed by run and name, so one store serves every run of a
+    worker; drop_run frees whatever a run left behind.
+
+    A durable store writes every payload to spill_dir and keeps the files
+    after the last release, until drop_run: a ref restored from a graph
+    checkpoint, even in another process, can still be read.
+    """
+
+    def __init__(
+        self,
+        spill_dir: str | Path | None = None,
+        spill_threshold_bytes: int = 64 * 1024 * 1024,
+        durable: bool = False,
+    ):
+        if durable and spill_dir is None:
+            raise ValueError("A durable artifact store needs a spill directory")
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.durable = durable
+        # Bytes of payloads held in memory, and the most held at once
+        self.nbytes = 0
+        self.peak_nbytes = 0
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._lock = threading.Lock()
+
+    def put(self, run_id: str, name: str, value: Any, consumers: int) -> ArtifactRef:
+        """
+        Store a payload, replacing any previous payload of the same name.
+
+        Args:
+            run_id: Run the payload belongs to
+            name: Payload name (e.g. the RunState field)
+            value: Payload
+            consumers: Number of release() calls that free it
+
+        Returns:
+            Reference to the payload
+        """
+        size = estimate_nbytes(value)
+        in_memory = self.spill_dir is None or size <= self.spill_threshold_bytes
+        # A durable store keeps payloads without consumers on disk only
+        if self.durable and not consumers:
+            in_memory = False
+        path = None
+        if self.durable or not in_memory:
+            path = str(self._spill(run_id, name, value))
+        ref = ArtifactRef(run_id, name, size, path)
+        entry = _Entry(ref, consumers, value if in_memory else None, in_memory)
+
+        with self._lock:
+            previous = self._entries.pop((run_id, name), None)
+            self._entries[(run_id, name)] = entry
+            if in_memory:
+                self.nbytes += ref.size
+                self.peak_nbytes = max(self.peak_nbytes, self.nbytes)
+        if previous is not None:
+            self._free(previous)
+        logger.debug(
+            f"[{run_id}] Stored {name} ({ref.size} bytes"
+            f"{'' if in_memory else ', spilled'}, {consumers} consumers)"
+        )
+        return ref
+
+    def get(self, ref: ArtifactRef) -> Any:
+        """
+        Read a payload.
+
+        Args:
+            ref: Reference returned by put
+
+        Returns:
+            The payload
+
+        Raises:
+            KeyError: If the payload was already freed
+        """
+        with self._lock:
+            entry = self._entries.get((ref.run_id, ref.name))
+        if entry is not None and entry.in_memory:
+            return entry.value
+        if ref.path is None or not Path(ref.path).exists():
+            raise KeyError(f"Artifact {ref.name} of run {ref.run_id} was already freed")
+        path = Path(ref.path)
+        if path.suffix == ".txt":
+            return path.read_text(encoding="utf-8")
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def release(self, ref: ArtifactRef) -> None:
+        """
+        Drop one consumer's reference, freeing the payload after the last one.
+
+        Args:
+            ref: Reference returned by put
+        """
+        with self._lock:
+            entry = self._entries.get((ref.run_id, ref.name))
+            if entry is None or entry.ref != ref:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[(ref.run_id, ref.name)]
+        self._free(entry)
+        logger.debug(f"[{ref.run_id}] Freed {ref.name}")
+
+    def drop_run(self, run_id: str, keep_files: bool = False) -> None:
+        """
+        Free every payload of a run, whether or not all consumers released it.
+
+        Args:
+            run_id: Run to drop
+            keep_files: Keep a durable store's files, for a later retry of the run
+        """
+        with self._lock:
+            entries = [entry for key, entry in self._entries.items() if key[0] == run_id]
+            for entry in entries:
+                del self._entries[(run_id, entry.ref.name)]
+        for entry in entries:
+            self._free(entry, keep_file=keep_files)
+        if self.spill_dir is not None and not keep_files:
+            shutil.rmtree(self.spill_dir / run_id, ignore_errors=True)
+
+    def _spill(self, run_id: str, name: str, value: Any) -> Path:
+        if self.spill_dir is None:
+            raise ValueError("The artifact store has no spill directory")
+        run_dir = self.spill_dir / run_id
+        run_dir.mkdir(parents=True, exist_ok=True)
+        # Unique even across processes sharing spill_dir (a resumed run may
+        # run elsewhere), so a replaced payload's file can be removed safely
+        stem = f"{name}-{uuid.uuid4().hex}"
+        if isinstance(value, str):
+            path = run_dir / f"{stem}.txt"
+            path.write_text(value, encoding="utf-8")
+        else:
+            path = run_dir / f"{stem}.pickle"
+            with open(path, "wb") as f:
+                pickle.dump(value, f, protocol=5)
+        return path
+
+    def _free(self, entry: _Entry, keep_file: bool = False) -> None:
+        if entry.ref.path is not None and not (self.durable or keep_file):
+            Path(entry.ref.path).unlink(missing_ok=True)
+        if entry.in_memory:
+            with self._lock:
+                self.nbytes -= entry.ref.size
+            entry.value = None
+            entry.in_memory = False
@@ -0,0 +1,178 @@
+"""In-place buffers for downloaded objects."""
+
+import logging
+import mmap
+import os
+import tempfile
+from typing import IO, Any
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+logger = logging.getLogger(__name__)
+
+# Size of body reads when filling a blob
+_READ_SIZE = 1024 * 1024
+
+
+class Blob:
+    """
+    Downloaded object contents, held without an intermediate bytes copy.
+
+    Objects up to spool_max_bytes live in a preallocated bytearray; larger
+    ones in an anonymous temporary file mapped into memory, so they are
+    backed by the page cache rather than the heap. Ranged parts are written
+    in place at their offsets, and view() exposes the contents as a
+    memoryview that can be passed to anything accepting bytes-like objects.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        content_type: str | None = None,
+        etag: str | None = None,
+        metadata: dict | None = None,
+        spool_max_bytes: int = 16 * 1024 * 1024,
+    ):
+        self.size = size
+        self.content_type = content_type
+        self.etag = etag
+        self.metadata = metadata or {}
+        self._file: IO[bytes] | None = None
+        if size <= spool_max_bytes:
+            self._buffer: bytearray | mmap.mmap = bytearray(size)
+        else:
+            self._file = tempfile.TemporaryFile()
+            self._file.truncate(size)
+            self._buffer = mmap.mmap(self._file.fileno(), size)
+        self._view: memoryview | None = memoryview(self._buffer)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | os.PathLike,
+        content_type: str | None = None,
+        etag: str | None = None,
+        metadata: dict | None = None,
+        spool_max_bytes: int = 16 * 1024 * 1024,
+    ) -> "Blob":
+        """
+        Blob with the contents of a file.
+
+        Files up to spool_max_bytes are read into memory; larger ones are
+        mapped read-only, without a copy. A mapping stays valid if the path
+        is later replaced or removed.
+
+        Args:
+            path: File to read
+            content_type: MIME type of the contents
+            etag: ETag of the object the file holds
+            metadata: Object user metadata
+            spool_max_bytes: Largest file read into memory
+
+        Returns:
+            Blob over the file contents
+        """
+        file = open(path, "rb")
+        size = os.fstat(file.fileno()).st_size
+        if size <= spool_max_bytes:
+            with file:
+                blob = cls(size, content_type, etag, metadata, spool_max_bytes)
+                if file.readinto(blob.view()) != size:
+                    blob.close()
+                    raise OSError(f"Short read from {path}")
+            return blob
+
+        blob = cls(0, content_type, etag, metadata)
+        blob.view().release()
+        blob.size = size
+        blob._file = file
+        blob._buffer = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+        blob._view = memoryview(blob._buffer)
+        return blob
+
+    @property
+    def spooled(self) -> bool:
+        """Whether the contents are in a memory-mapped file rather than memory."""
+        return self._file is not None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def view(self) -> memoryview:
+        """Contents as a memoryview (no copy)."""
+        if self._view is None:
+            raise ValueError("Blob is closed")
+        return self._view
+
+    def fill(self, offset: int, body: Any, length: int) -> None:
+        """
+        Copy a response body into the blob at an offset.
+
+        Args:
+            offset: First byte to write
+            body: Readable body (read(amt) -> bytes)
+            length: Expected number of bytes
+
+        Raises:
+            OSError: If the body is shorter or longer than length
+        """
+        view = self.view()
+        position, end = offset, offset + length
+        while chunk := body.read(_READ_SIZE):
+            if position + len(chunk) > end:
+                raise OSError(f"Body longer than {length} bytes at offset {offset}")
+            view[position : position + len(chunk)] = chunk
+            position += len(chunk)
+        if position != end:
+            raise OSError(f"Body ended after {position - offset} of {length} bytes")
+
+    def close(self) -> None:
+        """Release the buffer and any temporary file."""
+        if self._view is None:
+            return
+        self._view.release()
+        self._view = None
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # A caller still holds a view; the map is released with it
+                logger.warning("Blob closed while a view is still in use")
+        if self._file is not None:
+            self._file.close()
+        self._buffer = bytearray()
+
+    def __enter__(self) -> "Blob":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        state = "closed" if self._view is None else ("spooled" if self.spooled else "in memory")
+        return f"Blob(size={self.size}, content_type={self.content_type!r}, {state})"
+
+    def __reduce__(self) -> tuple:
+        # Pickles (e.g. graph checkpoints) keep the metadata only, never the contents
+        return (_detached, (self.size, self.content_type, self.etag))
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        # Held by reference in the run state; serialized as a description only
+        return core_schema.is_instance_schema(
+            cls,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda blob: {"size": blob.size, "content_type": blob.content_type}
+            ),
+        )
+
+
+def _detached(size: int, content_type: str | None, etag: str | None) -> Blob:
+    """Closed blob standing in for an unpickled one, whose contents were not kept."""
+    blob = Blob(0, content_type, etag)
+    blob.close()
+    blob.size = size
+    return blob
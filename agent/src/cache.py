@@ -0,0 +1,297 @@
+"""Local disk caches for LLM responses and R2 objects."""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from .blob import Blob
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a canonical digest for a set of JSON-serializable parts.
+
+    Dictionaries are serialized with sorted keys so that logically equal
+    inputs always produce the same key.
+
+    Args:
+        parts: Values that together identify a cached response
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    payload = orjson.dumps(list(parts), option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ResponseCache:
+    """Disk-backed response cache with TTL expiry and LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        ttl_seconds: int = 604800,
+        max_entries: int = 512,
+        bypass: bool = False,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # When set, lookups always miss but fresh responses are still stored
+        self.bypass = bypass
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        """
+        Look up a cached response.
+
+        A hit refreshes the entry's position in the LRU order; expired
+        entries are removed and reported as misses.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        if self.bypass:
+            return None
+
+        path = self._path(key)
+        with self._lock:
+            try:
+                entry = orjson.loads(path.read_bytes())
+            except FileNotFoundError:
+                return None
+            except orjson.JSONDecodeError:
+                logger.warning(f"Discarding corrupt cache entry {key}")
+                path.unlink(missing_ok=True)
+                return None
+
+            if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+                logger.debug(f"Cache entry {key} expired")
+                path.unlink(missing_ok=True)
+                return None
+
+            # Bump mtime so eviction treats this entry as recently used
+            os.utime(path)
+
+        logger.info(f"Response cache hit: {key[:12]}")
+        return entry.get("value")
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response and evict least recently used entries over the limit.
+
+        Args:
+            key: Cache key from make_cache_key
+            value: Response text to cache
+        """
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            tmp_path.write_bytes(orjson.dumps({"created_at": time.time(), "value": value}))
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            self._path(key).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries beyond max_entries."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+
+        entries.sort()
+        for _, path in entries[:overflow]:
+            path.unlink(missing_ok=True)
+        logger.debug(f"Evicted {overflow} cache entries")
+
+
+class BlobCache:
+    """
+    Disk cache of R2 objects, revalidated by ETag, with LRU eviction by total size.
+
+    Each object is stored as its contents plus a JSON sidecar holding its key,
+    ETag, content type and metadata. R2Client.download sends the cached ETag
+    as If-None-Match; on 304 Not Modified the entry is served from disk, so a
+    repeat read of an unchanged object costs one empty response. Hit and miss
+    counters cover the worker's lifetime (see stats()).
+    """
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = 1024 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+        # Entries are plain copies of documents: keep them private to the worker
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.cache_dir / f"{digest}.bin", self.cache_dir / f"{digest}.json"
+
+    def lookup(self, key: str) -> dict[str, Any] | None:
+        """
+        Cached entry for an object, to be revalidated against R2.
+
+        Args:
+            key: Object key
+
+        Returns:
+            Entry with "etag", "size", "content_type" and "metadata", or None
+        """
+        data_path, meta_path = self._paths(key)
+        try:
+            entry: dict[str, Any] = orjson.loads(meta_path.read_bytes())
+            size = data_path.stat().st_size
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return None
+        if entry.get("key") != key or entry.get("size") != size or not entry.get("etag"):
+            logger.warning(f"Discarding inconsistent blob cache entry for {key}")
+            self._remove(data_path, meta_path)
+            return None
+        return entry
+
+    def open(self, key: str, entry: dict[str, Any], spool_max_bytes: int) -> Blob | None:
+        """
+        Serve a revalidated entry and count a hit.
+
+        Args:
+            key: Object key
+            entry: Entry returned by lookup
+            spool_max_bytes: Largest object read into memory rather than mapped
+
+        Returns:
+            Blob with the cached contents, or None if the entry was evicted meanwhile
+        """
+        data_path, _ = self._paths(key)
+        try:
+            blob = Blob.from_file(
+                data_path,
+                content_type=entry.get("content_type"),
+                etag=entry["etag"],
+                metadata=entry.get("metadata"),
+                spool_max_bytes=spool_max_bytes,
+            )
+            # Bump mtime so eviction treats this entry as recently used
+            os.utime(data_path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_served += len(blob)
+        logger.info(f"Blob cache hit: {key} ({self._ratio_text()})")
+        return blob
+
+    def store(self, key: str, blob: Blob) -> None:
+        """
+        Cache a freshly downloaded object and count a miss.
+
+        Objects without an ETag or larger than max_bytes are not stored.
+        Write errors are logged, not raised: the download itself succeeded.
+
+        Args:
+            key: Object key
+            blob: Downloaded contents
+        """
+        with self._lock:
+            self.misses += 1
+        logger.info(f"Blob cache miss: {key} ({self._ratio_text()})")
+        if not blob.etag or len(blob) > self.max_bytes:
+            return
+
+        data_path, meta_path = self._paths(key)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        entry = {
+            "key": key,
+            "etag": blob.etag,
+            "size": len(blob),
+            "content_type": blob.content_type,
+            "metadata": blob.metadata,
+        }
+        try:
+            data_tmp = data_path.with_name(data_path.name + suffix)
+            with open(data_tmp, "wb") as f:
+                f.write(blob.view())
+            meta_tmp = meta_path.with_name(meta_path.name + suffix)
+            meta_tmp.write_bytes(orjson.dumps(entry))
+            with self._lock:
+                os.replace(data_tmp, data_path)
+                os.replace(meta_tmp, meta_path)
+                self._evict()
+        except OSError as e:
+            logger.warning(f"Could not cache {key}: {e}")
+
+    def stats(self) -> dict[str, float]:
+        """
+        Lookup counters since the cache was created.
+
+        Returns:
+            Dict with hits, misses, hit_ratio and bytes_served
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "bytes_served": self.bytes_served,
+            }
+
+    def _ratio_text(self) -> str:
+        stats = self.stats()
+        return f"hit ratio {stats['hit_ratio']:.0%} over {stats['hits'] + stats['misses']}"
+
+    @staticmethod
+    def _remove(*paths: Path) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries until the total size fits max_bytes."""
+        entries = []
+        for path in self.cache_dir.glob("*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path, path.with_suffix(".json"))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} blob cache entries")
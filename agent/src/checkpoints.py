@@ -0,0 +1,352 @@
+"""Durable LangGraph checkpoints in a local SQLite database."""
+
+import logging
+import sqlite3
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+logger = logging.getLogger(__name__)
+
+# State types restored from checkpoints; anything msgpack cannot encode is pickled
+_ALLOWED_TYPES = [
+    ("src.state", "RunState"),
+    ("src.state", "Txn"),
+    ("src.artifacts", "ArtifactRef"),
+]
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS checkpoints ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+    "parent_id TEXT, checkpoint_type TEXT NOT NULL, checkpoint BLOB NOT NULL, "
+    "metadata_type TEXT NOT NULL, metadata BLOB NOT NULL, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, channel TEXT NOT NULL, "
+    "version TEXT NOT NULL, value_type TEXT NOT NULL, value BLOB, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, channel, version)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS writes ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+    "task_id TEXT NOT NULL, idx INTEGER NOT NULL, channel TEXT NOT NULL, "
+    "value_type TEXT NOT NULL, value BLOB, task_path TEXT NOT NULL, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)) WITHOUT ROWID",
+    # When each thread last saved a checkpoint, for pruning abandoned threads
+    "CREATE TABLE IF NOT EXISTS threads (thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)",
+)
+_TABLES = ("checkpoints", "blobs", "writes", "threads")
+
+
+class SqliteCheckpointer(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpoint saver backed by a local SQLite file.
+
+    LangGraph saves a checkpoint after every superstep and the writes of
+    each finished task, keyed by thread ID (the run ID in this pipeline), so
+    a re-queued job can resume where its previous attempt stopped. As in
+    LangGraph's in-memory saver, a channel value is stored once per version
+    rather than in every checkpoint.
+    """
+
+    def __init__(self, path: str | Path):
+        super().__init__(
+            serde=JsonPlusSerializer(pickle_fallback=True, allowed_msgpack_modules=_ALLOWED_TYPES)
+        )
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Connection to the database; commits on success and always closes."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """
+        Checkpoint of a thread: the one named in config, else the latest.
+
+        Args:
+            config: Config with thread_id and optionally checkpoint_id
+
+        Returns:
+            Checkpoint tuple, or None if the thread has none
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT checkpoint_id, parent_id, checkpoint_type, checkpoint, metadata_type, "
+            "metadata FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: list[Any] = [thread_id, checkpoint_ns]
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        query += " ORDER BY checkpoint_id DESC LIMIT 1"
+
+        with self._connection() as conn:
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            return self._tuple(conn, thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        Checkpoints matching the criteria, newest first.
+
+        Args:
+            config: Config selecting a thread (and optionally a namespace or checkpoint)
+            filter: Metadata values checkpoints must have
+            before: Only checkpoints older than this one
+            limit: Maximum number of checkpoints
+
+        Returns:
+            Iterator of checkpoint tuples
+        """
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_id, checkpoint_type, "
+            "checkpoint, metadata_type, metadata FROM checkpoints WHERE 1 = 1"
+        )
+        params: list[Any] = []
+        if config:
+            query += " AND thread_id = ?"
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                query += " AND checkpoint_ns = ?"
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query += " AND checkpoint_id < ?"
+            params.append(before_id)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and limit <= 0:
+                    break
+                checkpoint_tuple = self._tuple(conn, thread_id, checkpoint_ns, row)
+                if filter and any(
+                    checkpoint_tuple.metadata.get(key) != value for key, value in filter.items()
+                ):
+                    continue
+                if limit is not None:
+                    limit -= 1
+                yield checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Save a checkpoint and the channel values that changed since its parent.
+
+        Args:
+            config: Config of the parent checkpoint
+            checkpoint: Checkpoint to save
+            metadata: Checkpoint metadata
+            new_versions: Channel versions written by this checkpoint
+
+        Returns:
+            Config of the saved checkpoint
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        values = checkpoint["channel_values"]
+        stored = {key: value for key, value in checkpoint.items() if key != "channel_values"}
+        blobs = [
+            (
+                thread_id,
+                checkpoint_ns,
+                channel,
+                str(version),
+                *(
+                    self.serde.dumps_typed(values[channel])
+                    if channel in values
+                    else ("empty", None)
+                ),
+            )
+            for channel, version in new_versions.items()
+        ]
+        checkpoint_type, checkpoint_bytes = self.serde.dumps_typed(stored)
+        metadata_type, metadata_bytes = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        with self._connection() as conn:
+            conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blobs)
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    checkpoint_type,
+                    checkpoint_bytes,
+                    metadata_type,
+                    metadata_bytes,
+                ),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO threads VALUES (?, ?)", (thread_id, time.time())
+            )
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Save the writes of a finished task, so a resumed step does not re-run it.
+
+        Args:
+            config: Config of the checkpoint the task ran from
+            writes: (channel, value) pairs
+            task_id: Task identifier
+            task_path: Task path
+        """
+        rows = [
+            (
+                config["configurable"]["thread_id"],
+                config["configurable"].get("checkpoint_ns", ""),
+                config["configurable"]["checkpoint_id"],
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
+                task_path,
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        # Special writes (errors, interrupts) replace earlier ones; regular writes are kept
+        with self._connection() as conn:
+            for verb, selected in (
+                ("REPLACE", [row for row in rows if row[4] < 0]),
+                ("IGNORE", [row for row in rows if row[4] >= 0]),
+            ):
+                conn.executemany(
+                    f"INSERT OR {verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", selected
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete all checkpoints and writes of a thread.
+
+        Args:
+            thread_id: Thread (run) ID
+        """
+        with self._connection() as conn:
+            for table in _TABLES:
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def delete_expired(self, max_age_seconds: float, keep: str | None = None) -> tuple[str, ...]:
+        """
+        Delete threads that have not saved a checkpoint for max_age_seconds.
+
+        Args:
+            max_age_seconds: Age of a thread's newest checkpoint past which it is deleted
+            keep: Thread ID never deleted (e.g. the run about to resume)
+
+        Returns:
+            IDs of the deleted threads
+        """
+        cutoff = time.time() - max_age_seconds
+        with self._connection() as conn:
+            threads = tuple(
+                thread_id
+                for (thread_id,) in conn.execute(
+                    "SELECT thread_id FROM threads WHERE updated_at < ?", (cutoff,)
+                )
+                if thread_id != keep
+            )
+            for thread_id in threads:
+                for table in _TABLES:
+                    conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+        return threads
+
+    def _tuple(
+        self, conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str, row: Sequence[Any]
+    ) -> CheckpointTuple:
+        checkpoint_id, parent_id, checkpoint_type, checkpoint_bytes, metadata_type, metadata = row
+        checkpoint: Checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint_bytes))
+
+        values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            blob = conn.execute(
+                "SELECT value_type, value FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if blob is not None and blob[0] != "empty":
+                values[channel] = self.serde.loads_typed(blob)
+
+        writes = conn.execute(
+            "SELECT task_id, idx, channel, value_type, value, task_path FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        writes.sort(key=lambda w: writes_sort_key(w[5], w[0], w[1]))
+
+        def config_for(checkpoint_id: str) -> RunnableConfig:
+            return {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            }
+
+        return CheckpointTuple(
+            config=config_for(checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=config_for(parent_id) if parent_id else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, _, channel, value_type, value, _ in writes
+            ],
+        )
@@ -1,2 +1,4 @@
 """Deterministic audit checks."""
 
+# Importing the check modules registers their checks
+from . import benford, cross_run, deterministic, fuzzy  # noqa: F401
@@ -0,0 +1,171 @@
+"""Aggregation of per-transaction findings and their R2 evidence files."""
+
+import logging
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import orjson
+
+from ..state import Finding
+from .table import TxnTable
+
+logger = logging.getLogger(__name__)
+
+# Codes emitted once per matching transaction
+AGGREGATED_CODES = frozenset({"ROUND_NUMBER", "WEEKEND_POST", "CROSS_RUN_DUP"})
+
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2}
+
+# Transaction IDs quoted in a summary finding's detail
+_MAX_LISTED_IDS = 10
+
+
+@dataclass
+class Aggregation:
+    """Aggregated findings and the original findings each one stands for."""
+
+    findings: list[Finding]
+    # members[i] are the original findings behind findings[i]
+    members: list[list[Finding]]
+
+
+def aggregate_findings(
+    findings: Sequence[Finding],
+    table: TxnTable,
+    codes: frozenset[str] = AGGREGATED_CODES,
+    min_count: int = 2,
+) -> Aggregation:
+    """
+    Group per-transaction findings by code, vendor and month.
+
+    Single-transaction findings with one of the given codes are grouped by
+    (code, vendor, calendar month of the transaction). A group of at least
+    min_count findings becomes one summary finding with the count, total
+    and date range; smaller groups and all other findings are kept as they
+    are. Output is in order of each group's first finding.
+
+    Args:
+        findings: Findings from the checks
+        table: Transactions the findings refer to
+        codes: Codes to aggregate
+        min_count: Minimum findings for a summary
+
+    Returns:
+        Aggregation
+    """
+    wanted = {
+        f.transaction_ids[0] for f in findings if f.code in codes and len(f.transaction_ids) == 1
+    }
+    row_of = {txn_id: row for row, txn_id in enumerate(table.ids) if txn_id in wanted}
+
+    vendor_labels = [*table.vendor_labels, None]
+    months = np.datetime_as_string(table.date_values.astype("datetime64[M]"))
+    month_labels = [*("undated" if m == "NaT" else m for m in months.tolist()), "undated"]
+
+    slots: list[Finding | tuple[str, str, str]] = []
+    groups: dict[tuple[str, str, str], list[Finding]] = {}
+    for finding in findings:
+        row = row_of.get(finding.transaction_ids[0]) if finding.transaction_ids else None
+        if finding.code not in codes or len(finding.transaction_ids) != 1 or row is None:
+            slots.append(finding)
+            continue
+        key = (
+            finding.code,
+            vendor_labels[table.vendor_codes[row]] or "Unknown",
+            month_labels[table.date_codes[row]],
+        )
+        if key not in groups:
+            groups[key] = []
+            slots.append(key)
+        groups[key].append(finding)
+
+    row_dates = table.dates()
+    aggregated, members = [], []
+    for slot in slots:
+        if isinstance(slot, Finding):
+            aggregated.append(slot)
+            members.append([slot])
+        elif len(groups[slot]) < min_count:
+            for finding in groups[slot]:
+                aggregated.append(finding)
+                members.append([finding])
+        else:
+            aggregated.append(_summary(slot, groups[slot], table, row_dates, row_of))
+            members.append(groups[slot])
+
+    logger.info(f"Aggregated {len(findings)} findings into {len(aggregated)}")
+    return Aggregation(aggregated, members)
+
+
+def _summary(
+    key: tuple[str, str, str],
+    group: list[Finding],
+    table: TxnTable,
+    row_dates: np.ndarray,
+    row_of: dict[str, int],
+) -> Finding:
+    code, vendor, month = key
+    ids = [f.transaction_ids[0] for f in group]
+    rows = np.array([row_of[txn_id] for txn_id in ids])
+    amounts = table.amounts[rows]
+    days = row_dates[rows]
+    dated = days[~np.isnat(days)]
+    return Finding(
+        code,
+        max((f.severity for f in group), key=lambda s: SEVERITY_RANK.get(s, 0)),
+        f"{group[0].title} ({len(group)} transactions)",
+        "{count} transactions from {vendor} in {month}, totalling ${total:,.2f} "
+        "(largest ${largest:,.2f}){dates}. Transaction IDs: {ids}{more}. "
+        "Each transaction is detailed in the finding's evidence file.",
+        ids,
+        count=len(group),
+        vendor=vendor,
+        month=month,
+        total=float(np.abs(amounts).sum()),
+        largest=float(np.abs(amounts).max()),
+        dates=f", dated {dated.min()} to {dated.max()}" if len(dated) else "",
+        ids=ids[:_MAX_LISTED_IDS],
+        more=f" and {len(ids) - _MAX_LISTED_IDS} more" if len(ids) > _MAX_LISTED_IDS else "",
+    )
+
+
+def evidence_key(tenant_id: str, run_id: str, index: int) -> str:
+    """R2 key of the evidence file of a run's index-th (persisted) finding."""
+    return f"evidence/{tenant_id}/{run_id}/finding-{index}.jsonl"
+
+
+def iter_evidence(members: Sequence[Finding], table: TxnTable) -> Iterator[bytes]:
+    """
+    Per-transaction evidence of one aggregated finding, as JSON lines.
+
+    One line per original finding behind it, with its rendered detail and
+    the transactions it names. Lines are generated one at a time, so the
+    file can be compressed and uploaded as it is built.
+
+    Args:
+        members: Original findings behind the aggregated finding
+        table: Transactions the findings refer to
+
+    Returns:
+        Iterator of newline-terminated JSON lines
+    """
+    wanted = {txn_id for f in members for txn_id in f.transaction_ids}
+    row_of = {txn_id: row for row, txn_id in enumerate(table.ids) if txn_id in wanted}
+    ids, amounts, dates, vendors, memos = table.row_values(np.array(list(row_of.values()), int))
+    transactions = {
+        txn_id: {"id": txn_id, "date": date, "vendor": vendor, "amount": amount, "memo": memo}
+        for txn_id, amount, date, vendor, memo in zip(ids, amounts, dates, vendors, memos)
+    }
+
+    for finding in members:
+        record = {
+            "code": finding.code,
+            "severity": finding.severity,
+            "title": finding.title,
+            "detail": finding.detail,
+            "transactions": [
+                transactions.get(txn_id, {"id": txn_id}) for txn_id in finding.transaction_ids
+            ],
+        }
+        yield orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
@@ -0,0 +1,454 @@
+"""Digit-distribution checks: Benford's law first digits and last-digit bias."""
+
+import logging
+import math
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from ..state import Finding
+from .deterministic import _gc_paused
+from .registry import CheckSpec, register_check
+from .table import TxnTable
+
+logger = logging.getLogger(__name__)
+
+_POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+
+# Amounts below $10 have no second digit and are excluded, as is customary
+_MIN_CENTS = 1000
+
+
+def _benford(low: int, high: int) -> np.ndarray:
+    digits = np.arange(low, high + 1)
+    return np.log10(1 + 1 / digits)
+
+
+@dataclass(frozen=True)
+class DigitTest:
+    """A digit distribution test over buckets low, low + 1, ..."""
+
+    name: str
+    code: str
+    title: str
+    low: int
+    expected: np.ndarray
+    # Nigrini's mean-absolute-deviation threshold for nonconformity
+    mad_limit: float
+
+    @property
+    def buckets(self) -> int:
+        return len(self.expected)
+
+
+DIGIT_TESTS = (
+    DigitTest(
+        "first_digit",
+        "BENFORD_FIRST_DIGIT",
+        "First-Digit Distribution Anomaly",
+        1,
+        _benford(1, 9),
+        0.015,
+    ),
+    DigitTest(
+        "first_two_digits",
+        "BENFORD_FIRST_TWO_DIGITS",
+        "First-Two-Digit Distribution Anomaly",
+        10,
+        _benford(10, 99),
+        0.0022,
+    ),
+    DigitTest(
+        "last_digit",
+        "LAST_DIGIT_BIAS",
+        "Last-Digit Distribution Anomaly",
+        0,
+        np.full(10, 0.1),
+        0.015,
+    ),
+)
+
+
+def digit_buckets(cents: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Bucket index of each amount for every digit test.
+
+    Args:
+        cents: Absolute amounts in cents, all at least _MIN_CENTS
+
+    Returns:
+        Test name -> bucket index (digit minus the test's lowest digit)
+    """
+    # Exact integer digit counts; float log10 is off by one near powers of ten
+    exponent = np.searchsorted(_POWERS_OF_TEN, cents, side="right") - 1
+    first_two = cents // _POWERS_OF_TEN[exponent - 1]
+    return {
+        "first_digit": first_two // 10 - 1,
+        "first_two_digits": first_two - 10,
+        # Units digit of the whole-dollar amount
+        "last_digit": (cents // 100) % 10,
+    }
+
+
+def chi_square_sf(statistic: float, df: int) -> float:
+    """
+    Survival function of the chi-square distribution, P(X >= statistic).
+
+    Computed as the regularized upper incomplete gamma function Q(df/2, x/2),
+    by series below the mean and by continued fraction above it.
+    """
+    a, x = df / 2, statistic / 2
+    if x <= 0:
+        return 1.0
+    log_prefactor = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1 / a
+        n = a
+        for _ in range(10_000):
+            n += 1
+            term *= x / n
+            total += term
+            if term < total * 1e-15:
+                break
+        return max(0.0, 1 - total * math.exp(log_prefactor))
+
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10_000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return h * math.exp(log_prefactor)
+
+
+class DigitHistograms:
+    """
+    Per-group digit counts for every test, accumulated chunk by chunk.
+
+    Group 0 is all transactions; groups 1..V are vendors and V+1..V+A accounts.
+    """
+
+    def __init__(self, num_vendors: int, num_accounts: int):
+        self.num_vendors = num_vendors
+        self.num_groups = 1 + num_vendors + num_accounts
+        self.counts = {
+            test.name: np.zeros((self.num_groups, test.buckets), dtype=np.int64)
+            for test in DIGIT_TESTS
+        }
+
+    def group_codes(self, vendor_codes: np.ndarray, account_codes: np.ndarray) -> list[np.ndarray]:
+        """Group of each row per grouping (all, vendor, account); -1 for none."""
+        vendor_groups = vendor_codes.astype(np.int64) + 1
+        account_groups = account_codes.astype(np.int64) + 1 + self.num_vendors
+        return [
+            np.zeros(len(vendor_codes), dtype=np.int64),
+            np.where(vendor_codes >= 0, vendor_groups, -1),
+            np.where(account_codes >= 0, account_groups, -1),
+        ]
+
+    def update(self, buckets: dict[str, np.ndarray], groups: list[np.ndarray]) -> None:
+        """Add one chunk of rows."""
+        for test in DIGIT_TESTS:
+            flat = self.counts[test.name].reshape(-1)
+            for group in groups:
+                member = group >= 0
+                flat += np.bincount(
+                    group[member] * test.buckets + buckets[test.name][member],
+                    minlength=len(flat),
+                )
+
+
+@dataclass
+class DigitProfile:
+    """Conformity of one group's digits to the expected distribution."""
+
+    test: DigitTest
+    group: int
+    count: int
+    mad: float
+    chi_square: float
+    p_value: float
+    # Over-represented buckets (indices) with significant z-statistics
+    outliers: list[int]
+
+
+def _profile(
+    test: DigitTest, group: int, counts: np.ndarray, alpha: float, z_limit: float
+) -> DigitProfile | None:
+    """Profile of one group's counts, or None when it conforms."""
+    n = int(counts.sum())
+    observed = counts / n
+    expected = test.expected
+    mad = float(np.mean(np.abs(observed - expected)))
+    chi_square = float(n * np.sum((observed - expected) ** 2 / expected))
+    p_value = chi_square_sf(chi_square, test.buckets - 1)
+    if mad <= test.mad_limit or p_value >= alpha:
+        return None
+
+    # Nigrini's z-statistic with continuity correction
+    z = (np.abs(observed - expected) - 1 / (2 * n)) / np.sqrt(expected * (1 - expected) / n)
+    outliers = np.flatnonzero((z > z_limit) & (observed > expected)).tolist()
+    return DigitProfile(test, group, n, mad, chi_square, p_value, outliers)
+
+
+def _scan(
+    table: TxnTable, histograms: DigitHistograms, chunk_size: int
+) -> Iterator[tuple[np.ndarray, dict[str, np.ndarray], list[np.ndarray]]]:
+    """Yield (row indices, digit buckets, groups) of eligible rows, chunk by chunk."""
+    for start in range(0, len(table), chunk_size):
+        stop = min(start + chunk_size, len(table))
+        cents = np.abs(table.cents[start:stop])
+        eligible = np.flatnonzero((cents >= _MIN_CENTS) & np.isfinite(table.amounts[start:stop]))
+        rows = eligible + start
+        yield (
+            rows,
+            digit_buckets(cents[eligible]),
+            histograms.group_codes(table.vendor_codes[rows], table.account_codes[rows]),
+        )
+
+
+class DigitStream:
+    """
+    Streaming form of find_digit_anomalies: running per-group histograms.
+
+    Vendors and accounts get codes in order of first appearance across
+    chunks. Findings are produced when the stream ends and do not list
+    transactions, which would need a second pass over the ledger.
+    """
+
+    def __init__(
+        self,
+        spec: CheckSpec,
+        inputs: dict[str, Any],
+        min_count: int = 1000,
+        alpha: float = 0.001,
+        z_limit: float = 1.96,
+    ):
+        self.min_count = min_count
+        self.alpha = alpha
+        self.z_limit = z_limit
+        self.vendors: dict[str, int] = {}
+        self.accounts: dict[str, int] = {}
+        self.totals = {t.name: np.zeros(t.buckets, dtype=np.int64) for t in DIGIT_TESTS}
+        self.by_vendor = {t.name: np.zeros((0, t.buckets), dtype=np.int64) for t in DIGIT_TESTS}
+        self.by_account = {t.name: np.zeros((0, t.buckets), dtype=np.int64) for t in DIGIT_TESTS}
+
+    @staticmethod
+    def _recode(codes: np.ndarray, labels: list[str], mapping: dict[str, int]) -> np.ndarray:
+        """Chunk codes -> stream-wide codes (-1 stays -1)."""
+        lookup = np.array(
+            [mapping.setdefault(label, len(mapping)) for label in labels] + [-1], dtype=np.int64
+        )
+        recoded: np.ndarray = lookup[codes]
+        return recoded
+
+    @staticmethod
+    def _add(counts: np.ndarray, groups: np.ndarray, buckets: np.ndarray, size: int) -> np.ndarray:
+        """Add (group, bucket) pairs to a counts matrix, growing it to size groups."""
+        if len(counts) < size:
+            counts = np.vstack([counts, np.zeros((size - len(counts), counts.shape[1]), np.int64)])
+        member = groups >= 0
+        flat = np.bincount(
+            groups[member] * counts.shape[1] + buckets[member], minlength=counts.size
+        )
+        return counts + flat.reshape(counts.shape)
+
+    def update(self, table: TxnTable) -> list[Finding]:
+        cents = np.abs(table.cents)
+        rows = np.flatnonzero((cents >= _MIN_CENTS) & np.isfinite(table.amounts))
+        buckets = digit_buckets(cents[rows])
+        vendors = self._recode(table.vendor_codes[rows], table.vendor_labels, self.vendors)
+        accounts = self._recode(table.account_codes[rows], table.account_labels, self.accounts)
+        for test in DIGIT_TESTS:
+            bucket = buckets[test.name]
+            self.totals[test.name] += np.bincount(bucket, minlength=test.buckets)
+            self.by_vendor[test.name] = self._add(
+                self.by_vendor[test.name], vendors, bucket, len(self.vendors)
+            )
+            self.by_account[test.name] = self._add(
+                self.by_account[test.name], accounts, bucket, len(self.accounts)
+            )
+        return []
+
+    def finish(self) -> list[Finding]:
+        histograms = DigitHistograms(len(self.vendors), len(self.accounts))
+        for test in DIGIT_TESTS:
+            # Every update grows the matrices to all vendors and accounts seen so far
+            histograms.counts[test.name] = np.vstack(
+                [
+                    self.totals[test.name][None, :],
+                    self.by_vendor[test.name],
+                    self.by_account[test.name],
+                ]
+            )
+        vendor_labels, account_labels = list(self.vendors), list(self.accounts)
+        findings = [
+            _finding(
+                histograms,
+                profile,
+                _group_label(vendor_labels, account_labels, histograms, profile.group),
+                None,
+            )
+            for profile in _profiles(histograms, self.min_count, self.alpha, self.z_limit)
+        ]
+        logger.info(f"Found {len(findings)} digit distribution findings")
+        return findings
+
+
+@register_check("digit_distributions", inputs=("table",), stream=DigitStream)
+def find_digit_anomalies(
+    table: TxnTable,
+    min_count: int = 1000,
+    alpha: float = 0.001,
+    z_limit: float = 1.96,
+    max_ids: int = 100,
+    chunk_size: int = 1_000_000,
+) -> list[Finding]:
+    """
+    Test first-digit, first-two-digit and last-digit distributions.
+
+    Amounts of at least $10 are bucketed by digit and counted per group: all
+    transactions, each vendor and each account. A group with at least
+    min_count amounts is flagged when its mean absolute deviation from the
+    expected distribution (Benford's law for leading digits, uniform for the
+    last digit) exceeds Nigrini's nonconformity threshold and the chi-square
+    test rejects conformity at alpha. Findings name the over-represented
+    buckets and list transactions in them.
+
+    Rows are processed in chunks of chunk_size in two passes (counting, then
+    collecting transactions of outlier buckets), so memory beyond the table
+    itself is bounded by the chunk size and the number of groups.
+
+    Args:
+        table: Transactions
+        min_count: Minimum amounts in a group for it to be tested
+        alpha: Chi-square significance level
+        z_limit: Bucket z-statistic above which a bucket is an outlier
+        max_ids: Maximum transaction IDs listed per finding
+        chunk_size: Rows per chunk
+
+    Returns:
+        List of findings
+    """
+    findings: list[Finding] = []
+    histograms = DigitHistograms(len(table.vendor_labels), len(table.account_labels))
+    for _, buckets, groups in _scan(table, histograms, chunk_size):
+        histograms.update(buckets, groups)
+
+    profiles = _profiles(histograms, min_count, alpha, z_limit)
+    if not profiles:
+        logger.info("Found 0 digit distribution findings")
+        return findings
+
+    # Second pass: collect up to max_ids rows from each flagged group's outlier buckets
+    outlier_masks = {}
+    for test in DIGIT_TESTS:
+        mask = np.zeros((histograms.num_groups, test.buckets), dtype=bool)
+        for profile in profiles:
+            if profile.test is test:
+                mask[profile.group, profile.outliers] = True
+        outlier_masks[test.name] = mask
+
+    collected: dict[tuple[str, int], list[int]] = {
+        (profile.test.name, profile.group): [] for profile in profiles
+    }
+    for rows, buckets, groups in _scan(table, histograms, chunk_size):
+        for test in DIGIT_TESTS:
+            mask = outlier_masks[test.name]
+            if not mask.any():
+                continue
+            bucket = buckets[test.name]
+            for group in groups:
+                hit = np.flatnonzero((group >= 0) & mask[np.maximum(group, 0), bucket])
+                for row, group_id in zip(rows[hit].tolist(), group[hit].tolist()):
+                    found = collected[(test.name, group_id)]
+                    if len(found) < max_ids:
+                        found.append(row)
+
+    with _gc_paused():
+        for profile in profiles:
+            row_ids = sorted(collected[(profile.test.name, profile.group)])
+            label = _group_label(
+                table.vendor_labels, table.account_labels, histograms, profile.group
+            )
+            findings.append(_finding(histograms, profile, label, [table.ids[r] for r in row_ids]))
+
+    logger.info(f"Found {len(findings)} digit distribution findings")
+    return findings
+
+
+def _profiles(
+    histograms: DigitHistograms, min_count: int, alpha: float, z_limit: float
+) -> list[DigitProfile]:
+    """Profiles of every nonconforming group with at least min_count amounts."""
+    profiles = []
+    for test in DIGIT_TESTS:
+        counts = histograms.counts[test.name]
+        for group in np.flatnonzero(counts.sum(axis=1) >= min_count).tolist():
+            profile = _profile(test, group, counts[group], alpha, z_limit)
+            if profile is not None:
+                profiles.append(profile)
+    return profiles
+
+
+def _group_label(
+    vendor_labels: list[str], account_labels: list[str], histograms: DigitHistograms, group: int
+) -> str:
+    if group == 0:
+        return "all transactions"
+    if group <= histograms.num_vendors:
+        return f"vendor {vendor_labels[group - 1]}"
+    return f"account {account_labels[group - 1 - histograms.num_vendors]}"
+
+
+def _finding(
+    histograms: DigitHistograms, profile: DigitProfile, label: str, ids: list[str] | None
+) -> Finding:
+    """Finding for a profile; ids None means transactions were not collected."""
+    test = profile.test
+    counts = histograms.counts[test.name][profile.group]
+    outliers = [
+        f"{test.low + bucket} ({counts[bucket] / profile.count:.1%} vs "
+        f"{test.expected[bucket]:.1%} expected, {counts[bucket]} transactions)"
+        for bucket in profile.outliers
+    ]
+    total_in_outliers = int(counts[profile.outliers].sum())
+    if ids is None:
+        ids, listing = [], " Transactions are not listed in streaming mode."
+    elif total_in_outliers > len(ids):
+        listing = f" Listing {len(ids)} of {total_in_outliers} transactions."
+    else:
+        listing = ""
+    return Finding(
+        test.code,
+        "low",
+        test.title,
+        "{test} distribution of {group} deviates from the expected distribution: "
+        "n={count}, MAD={mad:.4f} (nonconformity above {mad_limit}), "
+        "chi-square={chi_square:.1f} (df={df}, p={p_value:.2g}). "
+        "Over-represented: {outliers}.{listing}",
+        ids,
+        test=test.name.replace("_", " ").capitalize(),
+        group=label,
+        count=profile.count,
+        mad=profile.mad,
+        mad_limit=test.mad_limit,
+        chi_square=profile.chi_square,
+        df=test.buckets - 1,
+        p_value=profile.p_value,
+        outliers=outliers or "none individually significant",
+        listing=listing,
+    )
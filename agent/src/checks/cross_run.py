@@ -0,0 +1,113 @@
+"""Duplicate detection against transactions of earlier runs."""
+
+import logging
+
+import numpy as np
+
+from ..fingerprints import FingerprintStore, fingerprint_transaction
+from ..state import Finding, RunState
+from .deterministic import _gc_paused
+from .fuzzy import normalize_vendor
+from .registry import register_check
+from .streaming import ChunkedCheck
+from .table import TxnTable
+
+logger = logging.getLogger(__name__)
+
+
+def transaction_fingerprints(table: TxnTable) -> tuple[np.ndarray, list[int]]:
+    """
+    Fingerprint the rows that can identify an invoice.
+
+    Rows need a vendor, a date and a nonzero amount, as for the exact
+    duplicate check. Vendors are normalized and parseable dates rendered in
+    ISO form, so the same invoice matches across differently formatted
+    statements.
+
+    Args:
+        table: Transactions
+
+    Returns:
+        (row indices, fingerprint per row)
+    """
+    rows = np.flatnonzero((table.vendor_codes >= 0) & (table.date_codes >= 0) & (table.cents != 0))
+    vendors = [normalize_vendor(label) for label in table.vendor_labels]
+    dates = [
+        label if np.isnat(value) else str(value)
+        for label, value in zip(table.date_labels, table.date_values)
+    ]
+    fingerprints = [
+        fingerprint_transaction(vendors[vendor], dates[date], cents)
+        for vendor, date, cents in zip(
+            table.vendor_codes[rows].tolist(),
+            table.date_codes[rows].tolist(),
+            table.cents[rows].tolist(),
+        )
+    ]
+    return rows, fingerprints
+
+
+@register_check(
+    "cross_run_duplicates",
+    inputs=("table", "state", "fingerprint_store"),
+    stream=ChunkedCheck,
+)
+def find_cross_run_duplicates(
+    table: TxnTable, state: RunState, fingerprint_store: FingerprintStore
+) -> list[Finding]:
+    """
+    Detect transactions already seen in earlier runs of the same tenant,
+    then record this run's transactions for future runs.
+
+    Entries recorded by the current run are ignored, so retries do not flag
+    their own transactions.
+
+    Args:
+        table: Transactions
+        state: Current run state (tenant and run IDs)
+        fingerprint_store: Per-tenant fingerprint index
+
+    Returns:
+        List of findings
+    """
+    findings: list[Finding] = []
+    rows, fingerprints = transaction_fingerprints(table)
+    if not fingerprints:
+        logger.info("Found 0 cross-run duplicate findings")
+        return findings
+
+    prior = fingerprint_store.lookup(state.tenant_id, fingerprints, exclude_run_id=state.run_id)
+
+    matched = [i for i, fp in enumerate(fingerprints) if fp in prior]
+    ids, amounts, dates, vendors, _ = table.row_values(rows[matched])
+    with _gc_paused():
+        for i, txn_id, amount, date, vendor in zip(matched, ids, amounts, dates, vendors):
+            earlier = prior[fingerprints[i]]
+            findings.append(
+                Finding(
+                    "CROSS_RUN_DUP",
+                    "medium",
+                    "Invoice Seen in an Earlier Upload",
+                    "Transaction {txn_id} (Vendor: {vendor}, Date: {date}, Amount: ${amount:.2f}) "
+                    "matches {count} transaction(s) from earlier runs: {matches}{more}. "
+                    "Runs: {runs}",
+                    [txn_id],
+                    txn_id=txn_id,
+                    vendor=vendor,
+                    date=date,
+                    amount=amount,
+                    count=len(earlier),
+                    matches=[f"{p.txn_id} in run {p.run_id}" for p in earlier[:5]],
+                    more=" and more" if len(earlier) > 5 else "",
+                    runs=list(dict.fromkeys(p.run_id for p in earlier)),
+                )
+            )
+
+    fingerprint_store.record(
+        state.tenant_id,
+        state.run_id,
+        zip(fingerprints, (table.ids[row] for row in rows.tolist())),
+    )
+
+    logger.info(f"Found {len(findings)} cross-run duplicate findings")
+    return findings
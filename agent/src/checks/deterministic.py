@@ -1,66 +1,128 @@
 """Deterministic audit checks for common patterns."""
 
-import hashlib
+import gc
 import logging
-from collections import defaultdict
-from datetime import datetime
-from typing import Any
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
 
-from ..state import RunState, Txn
+import numpy as np
+
+from ..fingerprints import FingerprintStore
+from ..state import Finding, RunState, Txn
+from .registry import CheckResult, default_registry, register_check
+from .streaming import ChunkedCheck, stream_checks, windowed
+from .table import TxnTable
 
 logger = logging.getLogger(__name__)
 
+# Odd 64-bit multipliers for mixing duplicate-check key columns
+_HASH_A = np.uint64(0x9E3779B97F4A7C15)
+_HASH_B = np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause cyclic garbage collection while building many (acyclic) findings."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
-def check_duplicate_invoices(state: RunState) -> list[dict[str, Any]]:
+
+@register_check("duplicate_invoices", inputs=("table",), stream=windowed(0))
+def find_duplicate_invoices(table: TxnTable) -> list[Finding]:
     """
     Detect duplicate invoices based on vendor, date, and amount.
 
+    Rows are sorted by (vendor code, date code, exact amount) so equal keys
+    are adjacent; groups are reported in order of their first transaction.
+
     Args:
-        state: Current run state with transactions
+        table: Transactions
 
     Returns:
         List of findings
     """
-    findings = []
-    seen: dict[str, list[Txn]] = defaultdict(list)
-
-    # Group transactions by hash
-    for txn in state.txns:
-        if not txn.vendor or not txn.date or txn.amount == 0:
-            continue
-
-        # Create hash of vendor, date, amount
-        key = hashlib.md5(
-            f"{txn.vendor}|{txn.date}|{txn.amount}".encode()
-        ).hexdigest()
-        seen[key].append(txn)
-
-    # Find duplicates
-    for key, txns in seen.items():
-        if len(txns) > 1:
-            ids = [t.id for t in txns]
+    findings: list[Finding] = []
+
+    valid = np.flatnonzero(
+        (table.vendor_codes >= 0) & (table.date_codes >= 0) & (table.amounts != 0)
+    )
+    if len(valid) < 2:
+        logger.info("Found 0 duplicate invoice findings")
+        return findings
+
+    # Exact float bits, so amounts group exactly as they compare
+    amount_bits = table.amounts[valid].view(np.int64)
+    vendors = table.vendor_codes[valid]
+    dates = table.date_codes[valid]
+
+    # Most rows are unique: hash the key columns and keep only rows whose hash
+    # repeats, then group those exactly (collisions just add candidates)
+    hashed = amount_bits.view(np.uint64) * _HASH_A ^ (
+        (vendors.astype(np.uint64) << np.uint64(32)) | dates.astype(np.uint64)
+    ) * _HASH_B
+    by_hash = np.argsort(hashed)
+    sorted_hashes = hashed[by_hash]
+    repeated = np.zeros(len(valid), dtype=bool)
+    same = sorted_hashes[1:] == sorted_hashes[:-1]
+    repeated[1:] |= same
+    repeated[:-1] |= same
+    candidates = np.sort(by_hash[repeated])
+
+    amount_bits = amount_bits[candidates]
+    vendors = vendors[candidates]
+    dates = dates[candidates]
+
+    # lexsort is stable: rows within a group stay in input order
+    order = np.lexsort((amount_bits, dates, vendors))
+    rows = valid[candidates][order]
+    new_group = np.ones(len(rows), dtype=bool)
+    new_group[1:] = (
+        (np.diff(vendors[order]) != 0)
+        | (np.diff(dates[order]) != 0)
+        | (np.diff(amount_bits[order]) != 0)
+    )
+    starts = np.flatnonzero(new_group)
+    sizes = np.diff(np.append(starts, len(rows)))
+
+    duplicate = sizes > 1
+    groups = sorted(
+        zip(rows[starts[duplicate]], starts[duplicate], sizes[duplicate]),
+        key=lambda group: group[0],
+    )
+
+    with _gc_paused():
+        for first, start, size in groups:
+            ids = [table.ids[row] for row in rows[start : start + size]]
             findings.append(
-                {
-                    "code": "DUP_INVOICE",
-                    "severity": "medium",
-                    "title": f"Duplicate Invoice Detected",
-                    "detail": (
-                        f"Found {len(txns)} transactions with identical vendor, date, and amount. "
-                        f"Vendor: {txns[0].vendor}, Date: {txns[0].date}, "
-                        f"Amount: ${txns[0].amount:.2f}. "
-                        f"Transaction IDs: {', '.join(ids)}"
-                    ),
-                    "transaction_ids": ids,
-                }
+                Finding(
+                    "DUP_INVOICE",
+                    "medium",
+                    "Duplicate Invoice Detected",
+                    "Found {size} transactions with identical vendor, date, and amount. "
+                    "Vendor: {vendor}, Date: {date}, Amount: ${amount:.2f}. "
+                    "Transaction IDs: {ids}",
+                    ids,
+                    size=int(size),
+                    vendor=table.vendor(first),
+                    date=table.date(first),
+                    amount=float(table.amounts[first]),
+                    ids=ids,
+                )
             )
 
     logger.info(f"Found {len(findings)} duplicate invoice findings")
     return findings
 
 
-def check_round_numbers(
-    state: RunState, threshold: float = 100.0, min_amount: float = 1000.0
-) -> list[dict[str, Any]]:
+@register_check("round_numbers", inputs=("table",), stream=ChunkedCheck)
+def find_round_numbers(
+    table: TxnTable, threshold: float = 100.0, min_amount: float = 1000.0
+) -> list[Finding]:
     """
     Detect suspiciously round-number transactions.
 
@@ -70,7 +132,7 @@ def check_round_numbers(
     - Potential fraud (easier to remember/calculate)
 
     Args:
-        state: Current run state with transactions
+        table: Transactions
         threshold: Amount must be divisible by this value
         min_amount: Minimum amount to flag
 
@@ -79,31 +141,37 @@ def check_round_numbers(
     """
     findings = []
 
-    for txn in state.txns:
-        if abs(txn.amount) < min_amount:
-            continue
+    # np.remainder matches Python's float %, so results match the scalar check
+    magnitude = np.abs(table.amounts)
+    with np.errstate(invalid="ignore"):
+        flagged = (magnitude >= min_amount) & (np.remainder(magnitude, threshold) == 0)
 
-        # Check if amount is a round number
-        if abs(txn.amount) % threshold == 0:
+    with _gc_paused():
+        for txn_id, amount, date, vendor, memo in zip(
+            *table.row_values(np.flatnonzero(flagged))
+        ):
             findings.append(
-                {
-                    "code": "ROUND_NUMBER",
-                    "severity": "low",
-                    "title": f"Suspiciously Round Amount",
-                    "detail": (
-                        f"Transaction {txn.id} has a round amount of ${txn.amount:.2f}. "
-                        f"Date: {txn.date}, Vendor: {txn.vendor or 'Unknown'}, "
-                        f"Memo: {txn.memo or 'N/A'}"
-                    ),
-                    "transaction_ids": [txn.id],
-                }
+                Finding(
+                    "ROUND_NUMBER",
+                    "low",
+                    "Suspiciously Round Amount",
+                    "Transaction {txn_id} has a round amount of ${amount:.2f}. "
+                    "Date: {date}, Vendor: {vendor}, Memo: {memo}",
+                    [txn_id],
+                    txn_id=txn_id,
+                    amount=amount,
+                    date=date,
+                    vendor=vendor or "Unknown",
+                    memo=memo or "N/A",
+                )
             )
 
     logger.info(f"Found {len(findings)} round number findings")
     return findings
 
 
-def check_weekend_postings(state: RunState) -> list[dict[str, Any]]:
+@register_check("weekend_postings", inputs=("table",), stream=ChunkedCheck)
+def find_weekend_postings(table: TxnTable) -> list[Finding]:
     """
     Detect transactions posted on weekends.
 
@@ -113,62 +181,169 @@ def check_weekend_postings(state: RunState) -> list[dict[str, Any]]:
     - Automated systems (which may need review)
 
     Args:
-        state: Current run state with transactions
+        table: Transactions
 
     Returns:
         List of findings
     """
     findings = []
-
-    for txn in state.txns:
-        if not txn.date:
-            continue
-
-        try:
-            # Parse date (assumes YYYY-MM-DD or similar format)
-            dt = datetime.fromisoformat(txn.date.split()[0])
-
-            # Check if weekend (Saturday=5, Sunday=6)
-            if dt.weekday() in (5, 6):
-                day_name = "Saturday" if dt.weekday() == 5 else "Sunday"
-                findings.append(
-                    {
-                        "code": "WEEKEND_POST",
-                        "severity": "low",
-                        "title": f"Weekend Posting Detected",
-                        "detail": (
-                            f"Transaction {txn.id} was posted on {day_name}, {txn.date}. "
-                            f"Amount: ${txn.amount:.2f}, Vendor: {txn.vendor or 'Unknown'}, "
-                            f"Memo: {txn.memo or 'N/A'}"
-                        ),
-                        "transaction_ids": [txn.id],
-                    }
+    weekdays = table.weekdays()
+
+    # Saturday=5, Sunday=6
+    rows = np.flatnonzero(weekdays >= 5)
+    day_names = ["Sunday" if day == 6 else "Saturday" for day in weekdays[rows].tolist()]
+    with _gc_paused():
+        for day_name, txn_id, amount, date, vendor, memo in zip(
+            day_names, *table.row_values(rows)
+        ):
+            findings.append(
+                Finding(
+                    "WEEKEND_POST",
+                    "low",
+                    "Weekend Posting Detected",
+                    "Transaction {txn_id} was posted on {day_name}, {date}. "
+                    "Amount: ${amount:.2f}, Vendor: {vendor}, Memo: {memo}",
+                    [txn_id],
+                    txn_id=txn_id,
+                    day_name=day_name,
+                    date=date,
+                    amount=amount,
+                    vendor=vendor or "Unknown",
+                    memo=memo or "N/A",
                 )
-        except (ValueError, IndexError) as e:
-            logger.warning(f"Failed to parse date for transaction {txn.id}: {e}")
-            continue
+            )
 
     logger.info(f"Found {len(findings)} weekend posting findings")
     return findings
 
 
-def run_all_checks(state: RunState) -> list[dict[str, Any]]:
+def check_duplicate_invoices(state: RunState) -> list[Finding]:
+    """
+    Detect duplicate invoices based on vendor, date, and amount.
+
+    Args:
+        state: Current run state with transactions
+
+    Returns:
+        List of findings
+    """
+    return find_duplicate_invoices(TxnTable.from_txns(state.txns))
+
+
+def check_round_numbers(
+    state: RunState, threshold: float = 100.0, min_amount: float = 1000.0
+) -> list[Finding]:
+    """
+    Detect suspiciously round-number transactions.
+
+    Args:
+        state: Current run state with transactions
+        threshold: Amount must be divisible by this value
+        min_amount: Minimum amount to flag
+
+    Returns:
+        List of findings
+    """
+    return find_round_numbers(TxnTable.from_txns(state.txns), threshold, min_amount)
+
+
+def check_weekend_postings(state: RunState) -> list[Finding]:
+    """
+    Detect transactions posted on weekends.
+
+    Args:
+        state: Current run state with transactions
+
+    Returns:
+        List of findings
+    """
+    return find_weekend_postings(TxnTable.from_txns(state.txns))
+
+
+def collect_findings(results: list[CheckResult]) -> list[Finding]:
+    """
+    Concatenate the findings of check results, in result order.
+
+    Args:
+        results: Check results
+
+    Returns:
+        Combined list of all findings
+    """
+    findings = [finding for result in results for finding in result.findings]
+    logger.info(f"Total findings from deterministic checks: {len(findings)}")
+    return findings
+
+
+def run_registered_checks(
+    state: RunState,
+    max_workers: int | None = None,
+    fingerprint_store: FingerprintStore | None = None,
+    table: TxnTable | None = None,
+) -> list[CheckResult]:
+    """
+    Run every registered check concurrently.
+
+    The transactions are converted to a columnar table once and shared by
+    every check. Checks may ask for the inputs "table", "txns", "raw_text",
+    "state" and "fingerprint_store"; checks needing a store that is not
+    configured are skipped.
+
+    Args:
+        state: Current run state
+        max_workers: Check pool size (1 runs the checks sequentially)
+        fingerprint_store: Optional per-tenant fingerprint index for cross-run checks
+        table: Table of state.txns, if the caller already built it
+
+    Returns:
+        One result per check, in registration order
+    """
+    inputs = {
+        "table": table if table is not None else TxnTable.from_txns(state.txns),
+        "txns": state.txns,
+        "raw_text": state.raw_text or "",
+        "state": state,
+        "fingerprint_store": fingerprint_store,
+    }
+    return default_registry.run(inputs, max_workers)
+
+
+def run_all_checks(state: RunState, max_workers: int | None = None) -> list[Finding]:
     """
     Run all deterministic checks on the state.
 
     Args:
         state: Current run state
+        max_workers: Check pool size (1 runs the checks sequentially)
 
     Returns:
         Combined list of all findings
     """
-    findings = []
+    return collect_findings(run_registered_checks(state, max_workers))
 
-    # Run each check
-    findings.extend(check_duplicate_invoices(state))
-    findings.extend(check_round_numbers(state))
-    findings.extend(check_weekend_postings(state))
 
-    logger.info(f"Total findings from deterministic checks: {len(findings)}")
-    return findings
+def stream_all_checks(
+    chunks: Iterable[TxnTable | Sequence[Txn]],
+    state: RunState,
+    fingerprint_store: FingerprintStore | None = None,
+    lateness_days: int = 0,
+) -> Iterator[Finding]:
+    """
+    Run all deterministic checks over transactions arriving in chunks.
 
+    The streaming counterpart of run_all_checks: only the current chunk and
+    each check's incremental state are held in memory, and findings are
+    yielded as soon as they are complete. Checks that need the whole
+    ledger at once (no streaming form) are skipped.
+
+    Args:
+        chunks: Transaction chunks, as tables or as Txn records, roughly in date order
+        state: Current run state (tenant and run IDs)
+        fingerprint_store: Optional per-tenant fingerprint index for cross-run checks
+        lateness_days: How far out of date order rows may arrive
+
+    Returns:
+        Iterator of findings
+    """
+    inputs = {"state": state, "fingerprint_store": fingerprint_store}
+    return stream_checks(chunks, inputs, lateness_days=lateness_days)
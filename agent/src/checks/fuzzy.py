@@ -0,0 +1,255 @@
+"""Near-duplicate invoice detection with sort-based sweeps."""
+
+import logging
+import re
+
+import numpy as np
+
+from ..state import Finding
+from .deterministic import _gc_paused
+from .registry import register_check
+from .streaming import windowed
+from .table import TxnTable, factorize
+
+logger = logging.getLogger(__name__)
+
+# Legal-form and filler words dropped when comparing vendor names
+# fmt: off
+_VENDOR_STOPWORDS = frozenset(
+    {
+        "the", "inc", "incorporated", "llc", "llp", "lp", "ltd", "limited", "co",
+        "corp", "corporation", "company", "plc", "gmbh", "sa", "pty", "and",
+    }
+)
+# fmt: on
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_vendor(name: str) -> str:
+    """
+    Canonical form of a vendor name for matching variants.
+
+    "ACME Corp.", "Acme Corporation" and "The Acme Co" all normalize to "acme".
+
+    Args:
+        name: Vendor name
+
+    Returns:
+        Lowercase alphanumeric words without legal-form suffixes ("" if none remain)
+    """
+    words = _NON_ALNUM.sub(" ", name.lower().replace("&", " and ")).split()
+    kept = [word for word in words if word not in _VENDOR_STOPWORDS]
+    return " ".join(kept or words)
+
+
+def _connected_components(size: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Component label (smallest member) of each node, given undirected edges."""
+    labels = np.arange(size)
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, low)
+        np.minimum.at(updated, right, low)
+        # Pointer jumping: follow labels to their own labels until stable
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _sort_order(*keys: np.ndarray) -> np.ndarray:
+    """
+    Row order sorted by keys (most significant first).
+
+    Keys whose combined range fits in 62 bits are packed into one int64 and
+    argsorted, which is several times faster than a multi-key lexsort.
+    """
+    offsets = [key - key.min() if len(key) else key for key in keys]
+    spans = [int(offset.max()) + 1 if len(offset) else 1 for offset in offsets]
+    if np.prod([float(span) for span in spans]) >= 2**62:
+        return np.lexsort(keys[::-1])
+    packed = np.zeros(len(keys[0]), dtype=np.int64)
+    for offset, span in zip(offsets, spans):
+        packed = packed * span + offset
+    return np.argsort(packed)
+
+
+def _candidate_pairs(
+    block: np.ndarray, bucket: np.ndarray, day: np.ndarray, window_days: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs of rows in the same block, in the same or adjacent amount buckets,
+    at most window_days apart.
+
+    Each row is placed in its own bucket strip ("home") and, as a ghost, in
+    the strip below, so every strip holds the rows of two adjacent buckets.
+    Records are sorted by (block, strip, day) and compared with the records
+    1, 2, ... positions ahead for as long as any such pair is still within the
+    window, so the work is proportional to the number of rows that are close in
+    both amount and date rather than to the square of the block size. A pair
+    is emitted from the one strip where at least one of its rows is at home.
+    """
+    n = len(block)
+    rows = np.concatenate([np.arange(n), np.arange(n)])
+    home = np.concatenate([np.ones(n, dtype=bool), np.zeros(n, dtype=bool)])
+    strip = np.concatenate([bucket, bucket - 1])
+    blocks = np.concatenate([block, block])
+    days = np.concatenate([day, day])
+
+    order = _sort_order(blocks, strip, days)
+    rows, home, strip, blocks, days = (
+        rows[order],
+        home[order],
+        strip[order],
+        blocks[order],
+        days[order],
+    )
+
+    left_parts, right_parts = [], []
+    active = np.arange(len(rows) - 1)
+    offset = 1
+    while len(active):
+        ahead = active + offset
+        alive = ahead < len(rows)
+        active, ahead = active[alive], ahead[alive]
+        alive = (
+            (blocks[ahead] == blocks[active])
+            & (strip[ahead] == strip[active])
+            & (days[ahead] - days[active] <= window_days)
+        )
+        active, ahead = active[alive], ahead[alive]
+        emit = (home[active] | home[ahead]) & (rows[active] != rows[ahead])
+        left_parts.append(rows[active[emit]])
+        right_parts.append(rows[ahead[emit]])
+        offset += 1
+
+    if not left_parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(left_parts), np.concatenate(right_parts)
+
+
+@register_check("near_duplicate_invoices", inputs=("table",), stream=windowed(3))
+def find_near_duplicate_invoices(
+    table: TxnTable, window_days: int = 3, amount_tolerance: float = 0.01
+) -> list[Finding]:
+    """
+    Detect likely duplicate payments that are not exact duplicates.
+
+    Two transactions match when their vendors normalize to the same name,
+    their amounts (same sign) differ by at most amount_tolerance of the larger
+    one, and their dates are at most window_days apart. Matches are clustered
+    transitively. Clusters whose rows are all identical in vendor, date and
+    amount are left to the exact duplicate check.
+
+    Args:
+        table: Transactions
+        window_days: Maximum days between matching transactions
+        amount_tolerance: Maximum relative amount difference (0 = exact cents)
+
+    Returns:
+        List of findings
+    """
+    findings: list[Finding] = []
+
+    dates = table.dates()
+    valid = np.flatnonzero(
+        (table.vendor_codes >= 0)
+        & ~np.isnat(dates)
+        & (table.cents != 0)
+        & np.isfinite(table.amounts)
+    )
+    if len(valid) < 2:
+        logger.info("Found 0 near-duplicate invoice findings")
+        return findings
+
+    # Normalize each distinct vendor label once, then re-code rows by normal form
+    normal_codes, _ = factorize(normalize_vendor(v) for v in table.vendor_labels)
+    vendor = normal_codes[table.vendor_codes[valid]]
+    cents = table.cents[valid]
+    day = dates[valid].astype(np.int64)
+
+    # Exact (vendor, cents, day) repeats collapse onto one representative
+    order = _sort_order(vendor, day, cents)
+    new_key = np.ones(len(order), dtype=bool)
+    new_key[1:] = (
+        (np.diff(vendor[order]) != 0) | (np.diff(cents[order]) != 0) | (np.diff(day[order]) != 0)
+    )
+    key_of_sorted = np.cumsum(new_key) - 1
+    key = np.empty(len(order), dtype=np.int64)
+    key[order] = key_of_sorted
+    firsts = order[new_key]
+    key_vendor, key_cents, key_day = vendor[firsts], cents[firsts], day[firsts]
+
+    # Block on (vendor, sign); bucket amounts so matches fall in adjacent buckets
+    block = key_vendor.astype(np.int64) * 2 + (key_cents < 0)
+    magnitude = np.abs(key_cents)
+    if amount_tolerance >= 1:
+        # Any two same-sign amounts match
+        bucket = np.zeros(len(magnitude), dtype=np.int64)
+    elif amount_tolerance > 0:
+        # A match's amounts differ by a log ratio of at most -log1p(-tolerance),
+        # so with buckets that wide they are at most one bucket apart
+        width = -np.log1p(-amount_tolerance)
+        bucket = np.floor(np.log(magnitude) / width).astype(np.int64)
+    else:
+        bucket = magnitude
+    left, right = _candidate_pairs(block, bucket, key_day, window_days)
+
+    larger = np.maximum(magnitude[left], magnitude[right])
+    close = np.abs(magnitude[left] - magnitude[right]) <= amount_tolerance * larger
+    left, right = left[close], right[close]
+
+    labels = _connected_components(len(firsts), left, right)
+
+    # Report components spanning at least two distinct keys; a component with a
+    # single key is an exact duplicate (or a lone transaction)
+    keys_per_component = np.bincount(labels, minlength=len(firsts))
+    component = labels[key]
+    members = np.flatnonzero(keys_per_component[component] >= 2)
+    if not len(members):
+        logger.info("Found 0 near-duplicate invoice findings")
+        return findings
+
+    # Order groups by their first transaction, rows within a group by position
+    member_components = component[members]
+    first_member = np.full(len(firsts), len(valid), dtype=np.int64)
+    np.minimum.at(first_member, member_components, members)
+    group_first = first_member[member_components]
+    order = _sort_order(group_first, members)
+    rows = valid[members[order]]
+    boundaries = np.flatnonzero(np.diff(group_first[order])) + 1
+    bounds = [0, *boundaries.tolist(), len(rows)]
+
+    # Fetch Python values for all reported rows at once, then slice per group
+    ids, amounts, row_dates, vendors, _ = table.row_values(rows)
+
+    with _gc_paused():
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            group_ids = ids[start:end]
+            findings.append(
+                Finding(
+                    "NEAR_DUP_INVOICE",
+                    "medium",
+                    "Possible Duplicate Invoice",
+                    "Found {size} transactions from the same vendor with amounts "
+                    "within {tolerance:.0%} and dates within {window_days} days. "
+                    "Vendors: {vendors}; Dates: {dates}; Amounts: {amounts}. "
+                    "Transaction IDs: {ids}",
+                    group_ids,
+                    size=end - start,
+                    tolerance=amount_tolerance,
+                    window_days=window_days,
+                    vendors=list(dict.fromkeys(vendors[start:end])),
+                    dates=list(dict.fromkeys(row_dates[start:end])),
+                    amounts=[f"${a:.2f}" for a in dict.fromkeys(amounts[start:end])],
+                    ids=group_ids,
+                )
+            )
+
+    logger.info(f"Found {len(findings)} near-duplicate invoice findings")
+    return findings
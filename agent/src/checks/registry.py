@@ -0,0 +1,222 @@
+"""Registry of deterministic checks and a concurrent check runner."""
+
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from ..state import Finding
+
+logger = logging.getLogger(__name__)
+
+CheckFunc = Callable[..., list[Finding]]
+
+# Builds a check's streaming form (see streaming.py) from its spec and the run's inputs
+StreamFactory = Callable[["CheckSpec", dict[str, Any]], Any]
+
+EXECUTORS = ("thread", "process")
+
+
+@dataclass(frozen=True)
+class CheckSpec:
+    """A registered check and the inputs it takes as keyword arguments."""
+
+    name: str
+    func: CheckFunc
+    inputs: tuple[str, ...]
+    # "thread" for checks that release the GIL (NumPy), "process" for CPU-heavy
+    # pure-Python checks; process checks and their inputs must be picklable
+    executor: str = "thread"
+    # Streaming form of the check; None if it needs the whole ledger at once
+    stream: StreamFactory | None = None
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one check run."""
+
+    name: str
+    findings: list[Finding]
+    seconds: float
+    error: str | None = None
+    # Set when an input the check needs is None (e.g. an optional store not configured)
+    skipped: bool = False
+
+
+def _timed_call(func: CheckFunc, kwargs: dict[str, Any]) -> tuple[list[Finding], float, str | None]:
+    """Run a check, returning (findings, wall seconds, error). Never raises."""
+    start = time.perf_counter()
+    try:
+        findings = func(**kwargs)
+        error = None
+    except Exception as e:
+        logger.exception(f"Check {getattr(func, '__name__', func)} raised")
+        findings, error = [], f"{type(e).__name__}: {e}"
+    return findings, time.perf_counter() - start, error
+
+
+class CheckRegistry:
+    """
+    Ordered collection of checks.
+
+    Checks register with a decorator naming the inputs they need; the runner
+    passes those inputs as keyword arguments, runs the checks concurrently and
+    returns results in registration order regardless of completion order.
+    """
+
+    def __init__(self):
+        self._checks: dict[str, CheckSpec] = {}
+
+    def register(
+        self,
+        name: str | None = None,
+        *,
+        inputs: Iterable[str] = ("table",),
+        executor: str = "thread",
+        stream: StreamFactory | None = None,
+    ) -> Callable[[CheckFunc], CheckFunc]:
+        """
+        Decorator registering a check function.
+
+        Args:
+            name: Check name (defaults to the function name)
+            inputs: Names of the inputs passed to the check as keyword arguments
+            executor: "thread" or "process"
+            stream: Factory of the check's streaming form (see streaming.py)
+
+        Returns:
+            Decorator returning the function unchanged
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, got {executor!r}")
+
+        def decorator(func: CheckFunc) -> CheckFunc:
+            check_name = name or func.__name__
+            if check_name in self._checks:
+                raise ValueError(f"Check {check_name!r} is already registered")
+            self._checks[check_name] = CheckSpec(check_name, func, tuple(inputs), executor, stream)
+            return func
+
+        return decorator
+
+    def checks(self) -> list[CheckSpec]:
+        """Registered checks in registration order."""
+        return list(self._checks.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._checks
+
+    def __len__(self) -> int:
+        return len(self._checks)
+
+    def run(
+        self,
+        inputs: dict[str, Any],
+        max_workers: int | None = None,
+        names: Iterable[str] | None = None,
+    ) -> list[CheckResult]:
+        """
+        Run checks concurrently.
+
+        A check that raises, or whose inputs are missing, yields a result with
+        an error and no findings; the other checks are unaffected. A check
+        with an input set to None is skipped.
+
+        Args:
+            inputs: Available inputs by name (e.g. "table", "txns")
+            max_workers: Pool size; 1 runs the checks sequentially in this thread
+            names: Subset of checks to run (default all)
+
+        Returns:
+            One result per check, in registration order
+        """
+        specs = self.checks()
+        if names is not None:
+            wanted = set(names)
+            unknown = wanted - self._checks.keys()
+            if unknown:
+                raise ValueError(f"Unknown checks: {', '.join(sorted(unknown))}")
+            specs = [spec for spec in specs if spec.name in wanted]
+
+        outcomes: dict[str, tuple[list[Finding], float, str | None]] = {}
+        skipped = set()
+        runnable = []
+        for spec in specs:
+            missing = [key for key in spec.inputs if key not in inputs]
+            if missing:
+                outcomes[spec.name] = ([], 0.0, f"Missing inputs: {', '.join(missing)}")
+            elif any(inputs[key] is None for key in spec.inputs):
+                outcomes[spec.name] = ([], 0.0, None)
+                skipped.add(spec.name)
+            else:
+                runnable.append(spec)
+
+        if max_workers == 1 or len(runnable) <= 1:
+            for spec in runnable:
+                outcomes[spec.name] = _timed_call(spec.func, self._kwargs(spec, inputs))
+        else:
+            outcomes.update(self._run_pooled(runnable, inputs, max_workers))
+
+        results = [
+            CheckResult(spec.name, *outcomes[spec.name], skipped=spec.name in skipped)
+            for spec in specs
+        ]
+        for result in results:
+            if result.skipped:
+                logger.info(f"Check {result.name} skipped: inputs not available")
+            elif result.error:
+                logger.error(f"Check {result.name} failed: {result.error}")
+            else:
+                logger.info(
+                    f"Check {result.name}: {len(result.findings)} findings "
+                    f"in {result.seconds * 1000:.1f} ms"
+                )
+        return results
+
+    @staticmethod
+    def _kwargs(spec: CheckSpec, inputs: dict[str, Any]) -> dict[str, Any]:
+        return {key: inputs[key] for key in spec.inputs}
+
+    def _run_pooled(
+        self, specs: list[CheckSpec], inputs: dict[str, Any], max_workers: int | None
+    ) -> dict[str, tuple[list[Finding], float, str | None]]:
+        """Run specs on thread and (if any need it) process pools."""
+        pools: dict[str, Executor] = {}
+        futures: dict[str, Future] = {}
+        try:
+            for spec in specs:
+                if spec.executor not in pools:
+                    pools[spec.executor] = self._make_pool(spec.executor, max_workers)
+                futures[spec.name] = pools[spec.executor].submit(
+                    _timed_call, spec.func, self._kwargs(spec, inputs)
+                )
+
+            outcomes = {}
+            for name, future in futures.items():
+                try:
+                    outcomes[name] = future.result()
+                except Exception as e:
+                    # Raised outside the check itself, e.g. unpicklable inputs
+                    outcomes[name] = ([], 0.0, f"{type(e).__name__}: {e}")
+            return outcomes
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+
+    @staticmethod
+    def _make_pool(executor: str, max_workers: int | None) -> Executor:
+        if executor == "process":
+            # Checks run from graph worker threads, where forking is unsafe
+            return ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="check")
+
+
+# Checks in this package register here
+default_registry = CheckRegistry()
+
+register_check = default_registry.register
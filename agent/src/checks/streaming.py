@@ -0,0 +1,272 @@
+"""Streaming check runner for ledgers too large to hold in memory."""
+
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import partial
+from itertools import islice
+from typing import Any, Protocol
+
+import numpy as np
+
+from ..state import Finding, Txn
+from .registry import CheckRegistry, CheckSpec, StreamFactory, default_registry
+from .table import TxnTable
+
+logger = logging.getLogger(__name__)
+
+# Day number of rows without a parseable date (NaT as int64)
+_UNDATED = np.iinfo(np.int64).min
+
+
+class StreamingCheck(Protocol):
+    """A check fed one chunk of transactions at a time."""
+
+    def update(self, table: TxnTable) -> list[Finding]:
+        """Process a chunk, returning the findings that are complete."""
+        ...
+
+    def finish(self) -> list[Finding]:
+        """Return the remaining findings once the input is exhausted."""
+        ...
+
+
+def _check_kwargs(spec: CheckSpec, inputs: dict[str, Any]) -> dict[str, Any]:
+    """Inputs of a check other than the table, which is passed per chunk."""
+    return {key: inputs[key] for key in spec.inputs if key != "table"}
+
+
+class ChunkedCheck:
+    """Row-local check, run on each chunk independently."""
+
+    def __init__(self, spec: CheckSpec, inputs: dict[str, Any]):
+        self.func = spec.func
+        self.kwargs = _check_kwargs(spec, inputs)
+
+    def update(self, table: TxnTable) -> list[Finding]:
+        return self.func(table=table, **self.kwargs)
+
+    def finish(self) -> list[Finding]:
+        return []
+
+
+class WindowedCheck:
+    """
+    Check matching transactions at most window_days apart, over a sliding window.
+
+    Each chunk is checked together with the rows carried over from earlier
+    chunks. The watermark is the latest date seen less lateness_days; rows
+    are assumed to arrive no earlier than the watermark. A finding is emitted
+    once its latest transaction is more than window_days before the
+    watermark, since no later transaction can join it. Only rows of open
+    findings and rows within window_days of the watermark are carried, so
+    memory is bounded by the rows in the window, not by the ledger.
+
+    Rows dated before the watermark ("late" rows) are compared with carried
+    rows only and counted; undated rows only with rows of their own chunk.
+    Transaction IDs must be unique within the window.
+    """
+
+    def __init__(self, spec: CheckSpec, inputs: dict[str, Any], window_days: int):
+        self.func = spec.func
+        self.kwargs = _check_kwargs(spec, inputs)
+        self.name = spec.name
+        self.window_days = window_days
+        self.lateness_days = inputs.get("lateness_days", 0)
+        self.carry: TxnTable | None = None
+        self.open: list[Finding] = []
+        self.latest: int | None = None
+        self.late_rows = 0
+
+    def update(self, table: TxnTable) -> list[Finding]:
+        chunk_days = table.dates().astype(np.int64)
+        dated = chunk_days[chunk_days != _UNDATED]
+        if self.latest is not None:
+            self.late_rows += int(np.count_nonzero(dated < self.latest - self.lateness_days))
+        if len(dated):
+            newest = int(dated.max())
+            self.latest = newest if self.latest is None else max(self.latest, newest)
+
+        combined = table if self.carry is None else TxnTable.concat([self.carry, table])
+        findings = self.func(table=combined, **self.kwargs)
+        if self.latest is None:
+            # Nothing dated yet: undated rows cannot be windowed
+            self.carry = None
+            return findings
+
+        days = combined.dates().astype(np.int64)
+        horizon = self.latest - self.lateness_days - self.window_days
+        row_of = {txn_id: row for row, txn_id in enumerate(combined.ids)}
+        closed, self.open, open_rows = [], [], []
+        for finding in findings:
+            rows = [row_of[txn_id] for txn_id in finding.transaction_ids]
+            member_days = days[rows]
+            if (member_days == _UNDATED).any() or member_days.max() < horizon:
+                closed.append(finding)
+            else:
+                self.open.append(finding)
+                open_rows.extend(rows)
+
+        keep = days >= horizon
+        keep[open_rows] = True
+        self.carry = combined.take(np.flatnonzero(keep))
+        return closed
+
+    def finish(self) -> list[Finding]:
+        if self.late_rows:
+            logger.warning(
+                f"Check {self.name}: {self.late_rows} rows arrived more than "
+                f"{self.lateness_days} days out of date order and were only "
+                f"compared with the current window"
+            )
+        findings, self.open, self.carry = self.open, [], None
+        return findings
+
+
+def windowed(window_days: int) -> StreamFactory:
+    """
+    Streaming factory for a check matching transactions within window_days.
+
+    Args:
+        window_days: Maximum days between transactions the check can match
+
+    Returns:
+        Factory building a WindowedCheck
+    """
+    return partial(WindowedCheck, window_days=window_days)
+
+
+class CheckStream:
+    """
+    Run registered checks over transactions arriving in chunks.
+
+    Each check runs in its streaming form (CheckSpec.stream), keeping only
+    the state it needs between chunks: nothing for row-local checks, a
+    window of recent rows for duplicate checks, running histograms for digit
+    tests. Checks without a streaming form, or whose inputs are None, are
+    skipped; a check that raises is reported and dropped from the stream.
+
+    inputs holds the run's inputs other than the table (e.g. "state",
+    "fingerprint_store"); lateness_days is how far out of date order rows may
+    arrive.
+    """
+
+    def __init__(
+        self,
+        inputs: dict[str, Any],
+        registry: CheckRegistry = default_registry,
+        names: Iterable[str] | None = None,
+        lateness_days: int = 0,
+    ):
+        inputs = {**inputs, "lateness_days": lateness_days}
+        wanted = set(names) if names is not None else None
+        self.checks: dict[str, StreamingCheck] = {}
+        self.errors: dict[str, str] = {}
+        self.counts: dict[str, int] = {}
+        self.seconds: dict[str, float] = {}
+        self.rows = 0
+        for spec in registry.checks():
+            if wanted is not None and spec.name not in wanted:
+                continue
+            other = [key for key in spec.inputs if key != "table"]
+            missing = [key for key in other if key not in inputs]
+            if spec.stream is None:
+                logger.info(f"Check {spec.name} skipped: no streaming form")
+            elif missing:
+                self.errors[spec.name] = f"Missing inputs: {', '.join(missing)}"
+                logger.error(f"Check {spec.name} failed: {self.errors[spec.name]}")
+            elif any(inputs[key] is None for key in other):
+                logger.info(f"Check {spec.name} skipped: inputs not available")
+            else:
+                self.checks[spec.name] = spec.stream(spec, inputs)
+                self.counts[spec.name] = 0
+                self.seconds[spec.name] = 0.0
+
+    def update(self, chunk: TxnTable | Sequence[Txn]) -> list[Finding]:
+        """
+        Feed one chunk to every check.
+
+        Args:
+            chunk: Transactions, as a table or as Txn records
+
+        Returns:
+            Findings completed by this chunk, in registration order
+        """
+        table = chunk if isinstance(chunk, TxnTable) else TxnTable.from_txns(chunk)
+        self.rows += len(table)
+        return self._call(lambda check: check.update(table))
+
+    def finish(self) -> list[Finding]:
+        """
+        End the stream.
+
+        Returns:
+            Remaining findings, in registration order
+        """
+        findings = self._call(lambda check: check.finish())
+        for name, count in self.counts.items():
+            if name not in self.errors:
+                logger.info(
+                    f"Check {name}: {count} findings in {self.seconds[name] * 1000:.1f} ms "
+                    f"over {self.rows} rows"
+                )
+        return findings
+
+    def _call(self, method: Callable[[StreamingCheck], list[Finding]]) -> list[Finding]:
+        findings = []
+        for name, check in list(self.checks.items()):
+            start = time.perf_counter()
+            try:
+                found = method(check)
+            except Exception as e:
+                logger.exception(f"Check {name} raised")
+                self.errors[name] = f"{type(e).__name__}: {e}"
+                del self.checks[name]
+                continue
+            finally:
+                self.seconds[name] += time.perf_counter() - start
+            self.counts[name] += len(found)
+            findings.extend(found)
+        return findings
+
+
+def stream_checks(
+    chunks: Iterable[TxnTable | Sequence[Txn]],
+    inputs: dict[str, Any] | None = None,
+    registry: CheckRegistry = default_registry,
+    names: Iterable[str] | None = None,
+    lateness_days: int = 0,
+) -> Iterator[Finding]:
+    """
+    Run checks over chunks of transactions, yielding findings as they are found.
+
+    Args:
+        chunks: Transaction chunks, as tables or as Txn records
+        inputs: Inputs other than the table (e.g. "state", "fingerprint_store")
+        registry: Check registry
+        names: Subset of checks to run (default all)
+        lateness_days: How far out of date order rows may arrive
+
+    Returns:
+        Iterator of findings
+    """
+    stream = CheckStream(inputs or {}, registry, names, lateness_days)
+    for chunk in chunks:
+        yield from stream.update(chunk)
+    yield from stream.finish()
+
+
+def iter_chunks(txns: Iterable[Txn], size: int) -> Iterator[list[Txn]]:
+    """
+    Group transactions into chunks of at most size records.
+
+    Args:
+        txns: Transactions (e.g. iter_transactions over a document)
+        size: Records per chunk
+
+    Returns:
+        Iterator of chunks
+    """
+    iterator = iter(txns)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -0,0 +1,289 @@
+"""Columnar transaction table for vectorized checks."""
+
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..dates import parse_date
+from ..state import Txn
+
+logger = logging.getLogger(__name__)
+
+# 1970-01-01 was a Thursday (weekday 3)
+_EPOCH_WEEKDAY = 3
+
+
+def factorize(values: Iterable[str | None]) -> tuple[np.ndarray, list[str]]:
+    """
+    Encode values as categorical codes in order of first appearance.
+
+    None and empty strings get code -1.
+
+    Args:
+        values: Values to encode
+
+    Returns:
+        (int32 codes, labels) where labels[code] is the original value
+    """
+    mapping: dict[str, int] = {}
+    codes = np.fromiter(
+        (mapping.setdefault(value, len(mapping)) if value else -1 for value in values),
+        dtype=np.int32,
+    )
+    return codes, list(mapping)
+
+
+def _merge_codes(
+    parts: Sequence[tuple[np.ndarray, list[str]]],
+) -> tuple[np.ndarray, list[str], list[np.ndarray]]:
+    """
+    Merge categorical columns with their own label lists.
+
+    Returns:
+        (codes, merged labels, per-part lookup from old code to new code;
+        each lookup has a trailing -1 so code -1 maps to -1)
+    """
+    mapping: dict[str, int] = {}
+    lookups = [
+        np.array(
+            [mapping.setdefault(label, len(mapping)) for label in labels] + [-1], dtype=np.int32
+        )
+        for _, labels in parts
+    ]
+    codes = np.concatenate([lookup[codes] for (codes, _), lookup in zip(parts, lookups)])
+    return codes, list(mapping), lookups
+
+
+def parse_dates(labels: Sequence[str], day_first: bool = False) -> np.ndarray:
+    """
+    Parse distinct date labels in any format parse_date supports.
+
+    Args:
+        labels: Distinct date strings
+        day_first: Read ambiguous numeric dates as DD/MM
+
+    Returns:
+        datetime64[D] array, NaT where a label does not parse
+    """
+    parsed = np.full(len(labels), np.datetime64("NaT"), dtype="datetime64[D]")
+    for i, label in enumerate(labels):
+        value = parse_date(label, day_first)
+        if value is None:
+            logger.warning(f"Failed to parse date {label!r}")
+        else:
+            parsed[i] = np.datetime64(value)
+    return parsed
+
+
+@dataclass
+class TxnTable:
+    """
+    Transactions stored column-wise.
+
+    Dates and vendors are categorical: each row holds an int32 code into a
+    list of distinct labels, so per-label work (date parsing) runs once per
+    distinct value and comparisons are integer comparisons.
+    """
+
+    ids: Sequence[str]
+    # Original float amounts, and the same amounts as int64 cents
+    amounts: np.ndarray
+    cents: np.ndarray
+    date_codes: np.ndarray
+    date_labels: list[str]
+    # datetime64[D] per date label, NaT where unparseable
+    date_values: np.ndarray
+    vendor_codes: np.ndarray
+    vendor_labels: list[str]
+    memos: Sequence[str | None]
+    account_codes: np.ndarray
+    account_labels: list[str]
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    @classmethod
+    def from_columns(
+        cls,
+        ids: Sequence[str],
+        amounts: Sequence[float] | np.ndarray,
+        dates: Sequence[str | None],
+        vendors: Sequence[str | None],
+        memos: Sequence[str | None] | None = None,
+        accounts: Sequence[str | None] | None = None,
+    ) -> "TxnTable":
+        """
+        Build a table from parallel columns.
+
+        Args:
+            ids: Transaction IDs
+            amounts: Amounts in currency units
+            dates: Date strings
+            vendors: Vendor names (None for unknown)
+            memos: Optional memo strings
+            accounts: Optional account names
+
+        Returns:
+            TxnTable
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            # Non-finite amounts have no meaningful cents value
+            cents = np.rint(amounts * 100).astype(np.int64)
+        date_codes, date_labels = factorize(dates)
+        vendor_codes, vendor_labels = factorize(vendors)
+        if accounts is not None:
+            account_codes, account_labels = factorize(accounts)
+        else:
+            account_codes, account_labels = np.full(len(amounts), -1, dtype=np.int32), []
+        return cls(
+            ids=ids,
+            amounts=amounts,
+            cents=cents,
+            date_codes=date_codes,
+            date_labels=date_labels,
+            date_values=parse_dates(date_labels),
+            vendor_codes=vendor_codes,
+            vendor_labels=vendor_labels,
+            memos=memos if memos is not None else [None] * len(amounts),
+            account_codes=account_codes,
+            account_labels=account_labels,
+        )
+
+    @classmethod
+    def from_txns(cls, txns: Sequence[Txn]) -> "TxnTable":
+        """
+        Build a table from transaction models.
+
+        Canonical ISO dates are used where extraction set them, so every
+        check sees the same normalized date.
+
+        Args:
+            txns: Transactions
+
+        Returns:
+            TxnTable
+        """
+        return cls.from_columns(
+            ids=[t.id for t in txns],
+            amounts=np.fromiter((t.amount for t in txns), dtype=np.float64, count=len(txns)),
+            dates=[t.iso_date or t.date for t in txns],
+            vendors=[t.vendor for t in txns],
+            memos=[t.memo for t in txns],
+            accounts=[t.account for t in txns],
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence["TxnTable"]) -> "TxnTable":
+        """
+        Concatenate tables.
+
+        Categorical codes are remapped through merged label lists, so labels
+        are neither decoded per row nor parsed again.
+
+        Args:
+            tables: Tables in row order
+
+        Returns:
+            TxnTable
+        """
+        date_codes, date_labels, lookups = _merge_codes(
+            [(t.date_codes, t.date_labels) for t in tables]
+        )
+        date_values = np.full(len(date_labels), np.datetime64("NaT"), dtype="datetime64[D]")
+        for table, lookup in zip(tables, lookups):
+            date_values[lookup[:-1]] = table.date_values
+        vendor_codes, vendor_labels, _ = _merge_codes(
+            [(t.vendor_codes, t.vendor_labels) for t in tables]
+        )
+        account_codes, account_labels, _ = _merge_codes(
+            [(t.account_codes, t.account_labels) for t in tables]
+        )
+        return cls(
+            ids=[i for table in tables for i in table.ids],
+            amounts=np.concatenate([table.amounts for table in tables]),
+            cents=np.concatenate([table.cents for table in tables]),
+            date_codes=date_codes,
+            date_labels=date_labels,
+            date_values=date_values,
+            vendor_codes=vendor_codes,
+            vendor_labels=vendor_labels,
+            memos=[m for table in tables for m in table.memos],
+            account_codes=account_codes,
+            account_labels=account_labels,
+        )
+
+    def take(self, rows: np.ndarray) -> "TxnTable":
+        """
+        Table of the selected rows; label lists are shared, not copied.
+
+        Args:
+            rows: Row indices
+
+        Returns:
+            TxnTable
+        """
+        row_list = rows.tolist()
+        return TxnTable(
+            ids=[self.ids[row] for row in row_list],
+            amounts=self.amounts[rows],
+            cents=self.cents[rows],
+            date_codes=self.date_codes[rows],
+            date_labels=self.date_labels,
+            date_values=self.date_values,
+            vendor_codes=self.vendor_codes[rows],
+            vendor_labels=self.vendor_labels,
+            memos=[self.memos[row] for row in row_list],
+            account_codes=self.account_codes[rows],
+            account_labels=self.account_labels,
+        )
+
+    def dates(self) -> np.ndarray:
+        """Parsed date per row (datetime64[D], NaT where missing or unparseable)."""
+        values = np.append(self.date_values, np.datetime64("NaT", "D"))
+        # Code -1 (no date) indexes the trailing NaT
+        dates: np.ndarray = values[self.date_codes]
+        return dates
+
+    def weekdays(self) -> np.ndarray:
+        """Weekday per row (Monday=0), -1 where the date is missing or unparseable."""
+        days = self.date_values.astype(np.int64)
+        per_label = np.where(np.isnat(self.date_values), -1, (days + _EPOCH_WEEKDAY) % 7)
+        weekdays: np.ndarray = np.append(per_label, -1)[self.date_codes]
+        return weekdays
+
+    def row_values(
+        self, rows: np.ndarray
+    ) -> tuple[list[str], list[float], list[str], list[str | None], list[str | None]]:
+        """
+        Python values of selected rows, for building findings in bulk.
+
+        Args:
+            rows: Row indices
+
+        Returns:
+            (ids, amounts, dates, vendors, memos); missing dates are "" and
+            missing vendors None
+        """
+        date_labels = [*self.date_labels, ""]
+        vendor_labels = [*self.vendor_labels, None]
+        row_list = rows.tolist()
+        return (
+            [self.ids[row] for row in row_list],
+            self.amounts[rows].tolist(),
+            [date_labels[code] for code in self.date_codes[rows].tolist()],
+            [vendor_labels[code] for code in self.vendor_codes[rows].tolist()],
+            [self.memos[row] for row in row_list],
+        )
+
+    def date(self, row: int) -> str:
+        """Original date string of a row ("" when missing)."""
+        code = self.date_codes[row]
+        return self.date_labels[code] if code >= 0 else ""
+
+    def vendor(self, row: int) -> str | None:
+        """Vendor of a row, or None."""
+        code = self.vendor_codes[row]
+        return self.vendor_labels[code] if code >= 0 else None
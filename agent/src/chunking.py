@@ -0,0 +1,135 @@
+"""Offset-based, token-aware text chunking."""
+
+import re
+from collections import deque
+from collections.abc import Iterator, Sequence
+from typing import overload
+
+# Whitespace-delimited words; punctuation stays attached to its word
+_WORD = re.compile(r"\S+")
+
+_SENTENCE_END = (".", "!", "?", ".)", '."', ".'")
+
+
+def estimate_tokens(word_length: int) -> int:
+    """
+    Approximate subword token count for a word of the given length.
+
+    Roughly four characters per token, as for Gemini's tokenizer on English
+    prose; every word costs at least one token.
+
+    Args:
+        word_length: Word length in characters
+
+    Returns:
+        Estimated token count
+    """
+    return max(1, (word_length + 3) // 4)
+
+
+def iter_chunk_spans(
+    text: str,
+    max_tokens: int = 384,
+    overlap_tokens: int = 48,
+    min_fill: float = 0.7,
+) -> Iterator[tuple[int, int]]:
+    """
+    Lazily yield (start, end) offsets of overlapping chunks of text.
+
+    Chunks hold at most max_tokens estimated tokens and prefer to end at a
+    sentence boundary (terminal punctuation or a line break) once they are at
+    least min_fill full. Consecutive chunks share about overlap_tokens tokens.
+    Spans never begin or end on whitespace.
+
+    The text is scanned once and only the words of the current chunk are kept,
+    so time is linear in len(text) and memory is bounded by max_tokens.
+
+    Args:
+        text: Source text
+        max_tokens: Token budget per chunk
+        overlap_tokens: Tokens repeated at the start of the next chunk
+        min_fill: Minimum fraction of max_tokens before breaking at a boundary
+
+    Yields:
+        (start, end) character offsets into text
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be in [0, max_tokens)")
+
+    fill_target = max_tokens * min_fill
+    # Each entry: [start, end, tokens, ends_sentence]
+    window: deque[list] = deque()
+    total = 0
+
+    for match in _WORD.finditer(text):
+        start, end = match.span()
+
+        if window:
+            previous = window[-1]
+            if not previous[3] and text.find("\n", previous[1], start) != -1:
+                previous[3] = True
+
+        tokens = estimate_tokens(end - start)
+        while window and total + tokens > max_tokens:
+            cut = _cut_index(window, fill_target)
+            yield window[0][0], window[cut][1]
+
+            for _ in range(_overlap_start(window, cut, overlap_tokens)):
+                total -= window.popleft()[2]
+
+        window.append([start, end, tokens, match.group().endswith(_SENTENCE_END)])
+        total += tokens
+
+    if window:
+        yield window[0][0], window[-1][1]
+
+
+def _cut_index(window: deque, fill_target: float) -> int:
+    """Index of the last sentence-ending word past fill_target, else the last word."""
+    cut = len(window) - 1
+    running = 0
+    for i, (_, _, tokens, ends_sentence) in enumerate(window):
+        running += tokens
+        if ends_sentence and running >= fill_target and i < len(window) - 1:
+            cut = i
+    return cut
+
+
+def _overlap_start(window: deque, cut: int, overlap_tokens: int) -> int:
+    """Index of the first word to carry into the next chunk (always >= 1)."""
+    running = 0
+    i = cut + 1
+    while i > 1 and running < overlap_tokens:
+        i -= 1
+        running += window[i][2]
+    return max(i, 1)
+
+
+class ChunkView(Sequence[str]):
+    """Read-only sequence of chunk strings, sliced from the source text on access."""
+
+    __slots__ = ("_text", "_spans")
+
+    def __init__(self, text: str, spans: Sequence[tuple[int, int]]):
+        self._text = text
+        self._spans = spans
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._text[start:end] for start, end in self._spans[index]]
+        start, end = self._spans[index]
+        return self._text[start:end]
+
+    def __repr__(self) -> str:
+        return f"ChunkView({len(self)} chunks)"
@@ -22,11 +22,83 @@ class Config(BaseSettings):
     r2_access_key_id: str = Field(..., alias="R2_ACCESS_KEY_ID")
     r2_secret_access_key: str = Field(..., alias="R2_SECRET_ACCESS_KEY")
     r2_bucket: str = Field(..., alias="R2_BUCKET")
+    # Transfers: ranged GETs and multipart parts of this size, this many at once; downloads
+    # larger than R2_SPOOL_MAX_BYTES go to a memory-mapped temporary file instead of memory
+    r2_part_size: int = Field(default=8 * 1024 * 1024, alias="R2_PART_SIZE")
+    r2_download_workers: int = Field(default=4, alias="R2_DOWNLOAD_WORKERS")
+    r2_upload_workers: int = Field(default=4, alias="R2_UPLOAD_WORKERS")
+    r2_spool_max_bytes: int = Field(default=16 * 1024 * 1024, alias="R2_SPOOL_MAX_BYTES")
+    # Worker-local cache of downloaded objects, revalidated with If-None-Match
+    r2_cache_enabled: bool = Field(default=False, alias="R2_CACHE_ENABLED")
+    r2_cache_dir: str = Field(default=".cache/r2", alias="R2_CACHE_DIR")
+    r2_cache_max_bytes: int = Field(default=1024 * 1024 * 1024, alias="R2_CACHE_MAX_BYTES")
 
     # Gemini Models
     gemini_chat_model: str = Field(default="gemini-2.0-flash", alias="GEMINI_CHAT_MODEL")
     gemini_embed_model: str = Field(default="text-embedding-004", alias="GEMINI_EMBED_MODEL")
 
+    # Chunking (approximate tokens; text-embedding-004 accepts up to 2048 per input)
+    chunk_max_tokens: int = Field(default=384, alias="CHUNK_MAX_TOKENS")
+    chunk_overlap_tokens: int = Field(default=48, alias="CHUNK_OVERLAP_TOKENS")
+
+    # Pipelined embed-and-index: chunks per embedding request, batches allowed in flight
+    embed_batch_size: int = Field(default=64, alias="EMBED_BATCH_SIZE")
+    embed_queue_depth: int = Field(default=2, alias="EMBED_QUEUE_DEPTH")
+
+    # Embedding compression (dimensions must match the Vectorize index)
+    embed_dimensions: int | None = Field(default=None, alias="EMBED_DIMENSIONS")
+    embed_quantize: bool = Field(default=False, alias="EMBED_QUANTIZE")
+
+    # Vector backend: "edge" (Vectorize via the edge proxy) or "local" (in-process NumPy index)
+    vector_backend: str = Field(default="edge", alias="VECTOR_BACKEND")
+    vector_index_path: str = Field(default=".cache/vectors", alias="VECTOR_INDEX_PATH")
+
+    # Near-duplicate chunk elimination (estimated Jaccard similarity of word shingles)
+    dedupe_enabled: bool = Field(default=True, alias="DEDUPE_CHUNKS")
+    dedupe_threshold: float = Field(default=0.9, alias="DEDUPE_THRESHOLD")
+
+    # Deterministic checks run concurrently on a pool of this size (1 = sequential)
+    check_workers: int = Field(default=4, alias="CHECK_WORKERS")
+
+    # Group per-transaction findings by code, vendor and month; details go to an R2 evidence file
+    aggregate_findings: bool = Field(default=True, alias="AGGREGATE_FINDINGS")
+
+    # Locale deciding how ambiguous numeric dates are read (en_US: MM/DD, en_GB: DD/MM)
+    date_locale: str = Field(default="en_US", alias="DATE_LOCALE")
+
+    # Cross-run duplicate detection against a per-tenant fingerprint index
+    fingerprint_index: bool = Field(default=False, alias="FINGERPRINT_INDEX")
+    fingerprint_dir: str = Field(default=".cache/fingerprints", alias="FINGERPRINT_DIR")
+
+    # Incremental re-audit: reuse vectors of unchanged chunks across revisions
+    incremental_reaudit: bool = Field(default=False, alias="INCREMENTAL_REAUDIT")
+
+    # Large intermediate payloads (text, transactions) kept out of the graph state;
+    # payloads above ARTIFACT_SPILL_BYTES are written to ARTIFACT_SPILL_DIR
+    artifact_spill_dir: str = Field(default=".cache/artifacts", alias="ARTIFACT_SPILL_DIR")
+    artifact_spill_bytes: int = Field(default=64 * 1024 * 1024, alias="ARTIFACT_SPILL_BYTES")
+
+    # Per-superstep graph checkpoints, so a retried run resumes after its last good step
+    checkpoint_enabled: bool = Field(default=False, alias="CHECKPOINT_ENABLED")
+    checkpoint_path: str = Field(default=".cache/checkpoints.sqlite", alias="CHECKPOINT_PATH")
+    # Failed runs not retried within this many seconds lose their checkpoints and payloads
+    checkpoint_retention_seconds: int = Field(
+        default=24 * 60 * 60, alias="CHECKPOINT_RETENTION_SECONDS"
+    )
+
+    # Tracing: a span per node and per HTTP, R2 and LLM call, exported per run
+    # as JSON lines to TRACE_DIR ("jsonl") or to an OTLP/HTTP collector ("otlp")
+    trace_exporter: str = Field(default="none", alias="TRACE_EXPORTER")
+    trace_dir: str = Field(default=".cache/traces", alias="TRACE_DIR")
+    otlp_endpoint: str = Field(default="http://localhost:4318", alias="OTLP_ENDPOINT")
+
+    # Response cache for report generation
+    chat_cache_enabled: bool = Field(default=True, alias="CHAT_CACHE_ENABLED")
+    chat_cache_dir: str = Field(default=".cache/chat", alias="CHAT_CACHE_DIR")
+    chat_cache_ttl: int = Field(default=604800, alias="CHAT_CACHE_TTL")
+    chat_cache_max_entries: int = Field(default=512, alias="CHAT_CACHE_MAX_ENTRIES")
+    chat_cache_bypass: bool = Field(default=False, alias="CHAT_CACHE_BYPASS")
+
     # Application
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     health_port: int = Field(default=8080, alias="HEALTH_PORT")
@@ -0,0 +1,130 @@
+"""Date normalization for transaction dates in mixed formats."""
+
+import re
+from datetime import date
+from functools import lru_cache
+
+# Regions that write numeric dates month first (MM/DD/YYYY)
+MONTH_FIRST_REGIONS = frozenset({"US", "CA", "PH", "FM", "MH", "PW", "GU", "PR", "AS", "VI"})
+
+_NUMERIC = re.compile(r"(\d{1,4})[-/.](\d{1,2})[-/.](\d{1,4})(?:[T\s].*)?")
+_MONTH_NAME_FIRST = re.compile(r"([A-Za-z]{3,9})\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})")
+_DAY_FIRST = re.compile(r"(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]{3,9})\.?,?\s+(\d{4})")
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [
+            ("jan", "january"),
+            ("feb", "february"),
+            ("mar", "march"),
+            ("apr", "april"),
+            ("may",),
+            ("jun", "june"),
+            ("jul", "july"),
+            ("aug", "august"),
+            ("sep", "sept", "september"),
+            ("oct", "october"),
+            ("nov", "november"),
+            ("dec", "december"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+
+def day_first_for_locale(locale: str) -> bool:
+    """
+    Whether a locale writes ambiguous numeric dates day first.
+
+    Args:
+        locale: Locale name such as "en_US", "en-GB" or "de_DE"
+
+    Returns:
+        False for month-first regions (US and a few others), True otherwise
+    """
+    # Drop any encoding ("en_US.UTF-8"); the region is the last part of the name
+    name = locale.strip().split(".")[0]
+    region = re.split(r"[-_]", name)[-1].upper() if name else "US"
+    return region not in MONTH_FIRST_REGIONS
+
+
+def _year(text: str) -> int | None:
+    if len(text) == 4:
+        return int(text)
+    if len(text) == 2:
+        # Same pivot as strptime's %y: 69-99 -> 1900s, 00-68 -> 2000s
+        value = int(text)
+        return 1900 + value if value >= 69 else 2000 + value
+    return None
+
+
+def _make(year: int | None, month: int | None, day: int) -> date | None:
+    if year is None or month is None:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=16384)
+def parse_date(text: str, day_first: bool = False) -> date | None:
+    """
+    Parse a date written in any of the common ledger formats.
+
+    Supported: ISO (2024-01-15, optionally with a time), numeric with /, -
+    or . separators and 2- or 4-digit years (01/15/2024, 15.01.24), and
+    month names (Jan 15, 2024; 15 January 2024). Numeric dates whose order is
+    ambiguous (both parts 12 or less) follow day_first; unambiguous ones
+    (15/01/2024) are read the only way they can be. Results are memoized,
+    since ledgers repeat a small set of dates.
+
+    Args:
+        text: Date string
+        day_first: Read ambiguous numeric dates as DD/MM
+
+    Returns:
+        The date, or None if the text is not a valid date
+    """
+    text = text.strip()
+
+    match = _NUMERIC.fullmatch(text)
+    if match:
+        first, second, third = match.groups()
+        if len(first) == 4:
+            return _make(int(first), int(second), int(third))
+        a, b = int(first), int(second)
+        if a > 12 or (day_first and b <= 12):
+            day, month = a, b
+        else:
+            month, day = a, b
+        return _make(_year(third), month, day)
+
+    match = _MONTH_NAME_FIRST.fullmatch(text)
+    if match:
+        name, day_text, year_text = match.groups()
+        return _make(int(year_text), _MONTHS.get(name.lower()), int(day_text))
+
+    match = _DAY_FIRST.fullmatch(text)
+    if match:
+        day_text, name, year_text = match.groups()
+        return _make(int(year_text), _MONTHS.get(name.lower()), int(day_text))
+
+    return None
+
+
+def normalize_date(text: str, day_first: bool = False) -> str | None:
+    """
+    Canonical ISO form (YYYY-MM-DD) of a date string.
+
+    Args:
+        text: Date string in any format parse_date supports
+        day_first: Read ambiguous numeric dates as DD/MM
+
+    Returns:
+        ISO date string, or None if the text does not parse
+    """
+    parsed = parse_date(text, day_first)
+    return parsed.isoformat() if parsed else None
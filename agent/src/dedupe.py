@@ -0,0 +1,126 @@
+"""Near-duplicate chunk detection with MinHash sketches and LSH banding."""
+
+import zlib
+from collections.abc import Sequence
+
+import numpy as np
+
+# Mersenne prime 2^31 - 1; keeps a * x + b within uint64 for 32-bit shingle hashes
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+class MinHashDeduplicator:
+    """
+    Collapses near-identical chunks (page headers, footers, disclaimers) onto
+    a single representative.
+
+    Each chunk is reduced to a MinHash signature over its word shingles. An
+    LSH index splits signatures into bands so only chunks sharing at least one
+    band are compared; a candidate is a duplicate when the estimated Jaccard
+    similarity of the two shingle sets reaches the threshold.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        """Hashes of the distinct word n-grams of text (case-insensitive)."""
+        words = text.lower().split()
+        k = self.shingle_size
+        if len(words) <= k:
+            grams = {" ".join(words)}
+        else:
+            grams = {" ".join(words[i : i + k]) for i in range(len(words) - k + 1)}
+        return np.fromiter(
+            (zlib.crc32(gram.encode("utf-8")) for gram in grams),
+            dtype=np.uint64,
+            count=len(grams),
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        MinHash signature of a text.
+
+        Args:
+            text: Chunk text
+
+        Returns:
+            Array of num_perm minimum hash values
+        """
+        shingles = self._shingles(text)
+        return ((self._a * shingles + self._b) % _PRIME).min(axis=1)
+
+    def representatives(self, texts: Sequence[str]) -> list[int]:
+        """
+        Map every text to the index of its representative.
+
+        Representatives are the first occurrence of each near-duplicate group,
+        so a representative always precedes the texts mapped to it.
+
+        Args:
+            texts: Chunk texts in document order
+
+        Returns:
+            For each text, the index of its representative (itself if unique)
+        """
+        buckets: list[dict[bytes, list[int]]] = [{} for _ in range(self.bands)]
+        signatures: dict[int, np.ndarray] = {}
+        representatives = []
+
+        for i, text in enumerate(texts):
+            sig = self.signature(text)
+            keys = [
+                sig[band * self.rows : (band + 1) * self.rows].tobytes()
+                for band in range(self.bands)
+            ]
+
+            match = self._best_candidate(sig, keys, buckets, signatures)
+            if match is not None:
+                representatives.append(match)
+                continue
+
+            representatives.append(i)
+            signatures[i] = sig
+            for bucket, key in zip(buckets, keys):
+                bucket.setdefault(key, []).append(i)
+
+        return representatives
+
+    def _best_candidate(
+        self,
+        sig: np.ndarray,
+        keys: list[bytes],
+        buckets: list[dict[bytes, list[int]]],
+        signatures: dict[int, np.ndarray],
+    ) -> int | None:
+        """Most similar representative sharing a band with sig, if above threshold."""
+        candidates = set()
+        for bucket, key in zip(buckets, keys):
+            candidates.update(bucket.get(key, ()))
+
+        best, best_score = None, self.threshold
+        for candidate in sorted(candidates):
+            score = float(np.mean(signatures[candidate] == sig))
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = candidate, score
+        return best
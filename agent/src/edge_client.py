@@ -1,6 +1,7 @@
 """Client for the Edge Worker API."""
 
 import logging
+from collections.abc import Sequence
 from typing import Any
 
 import httpx
@@ -8,6 +9,7 @@ import orjson
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from .config import Config
+from .tracing import record_attempt, record_usage, span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +26,16 @@ class EdgeClient:
             "X-Server-Auth": config.edge_api_token,
         }
 
+    @traced("edge.vector_upsert")
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
+        before=record_attempt,
     )
     def vector_upsert(
         self,
         ids: list[str],
-        vectors: list[list[float]],
+        vectors: Sequence[Sequence[float]],
         metadatas: list[dict[str, Any]] | None = None,
     ) -> dict:
         """
@@ -39,32 +43,29 @@ class EdgeClient:
 
         Args:
             ids: Vector IDs
-            vectors: Vector embeddings
+            vectors: Vector embeddings (floats, or int8 codes when quantized)
             metadatas: Optional metadata for each vector
 
         Returns:
             Response data
         """
-        payload = {"ids": ids, "vectors": vectors}
+        payload: dict[str, Any] = {"ids": ids, "vectors": vectors}
         if metadatas:
             payload["metadatas"] = metadatas
 
         logger.debug(f"Upserting {len(ids)} vectors")
 
-        response = self.client.post(
-            f"{self.base_url}/vector/upsert",
-            headers=self.headers,
-            content=orjson.dumps(payload),
-        )
-        response.raise_for_status()
+        response = self._post("/vector/upsert", payload)
 
-        data = response.json()
+        data: dict = response.json()
         logger.info(f"Upserted {len(ids)} vectors successfully")
         return data
 
+    @traced("edge.vector_query")
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
+        before=record_attempt,
     )
     def vector_query(
         self,
@@ -83,25 +84,48 @@ class EdgeClient:
         Returns:
             List of matching vectors with scores
         """
-        payload = {"vector": vector, "topK": top_k}
+        payload: dict[str, Any] = {"vector": vector, "topK": top_k}
         if filter:
             payload["filter"] = filter
 
-        response = self.client.post(
-            f"{self.base_url}/vector/query",
-            headers=self.headers,
-            content=orjson.dumps(payload),
-        )
-        response.raise_for_status()
+        response = self._post("/vector/query", payload)
 
         data = response.json()
-        matches = data.get("matches", [])
+        matches: list[dict] = data.get("matches", [])
         logger.info(f"Found {len(matches)} similar vectors")
         return matches
 
+    @traced("edge.vector_delete")
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
+        before=record_attempt,
+    )
+    def vector_delete(self, ids: list[str]) -> dict:
+        """
+        Delete vectors from Vectorize by ID via edge proxy.
+
+        Args:
+            ids: Vector IDs to delete
+
+        Returns:
+            Response data
+        """
+        payload = {"ids": ids}
+
+        logger.debug(f"Deleting {len(ids)} vectors")
+
+        response = self._post("/vector/delete", payload)
+
+        data: dict = response.json()
+        logger.info(f"Deleted {len(ids)} vectors successfully")
+        return data
+
+    @traced("edge.d1_query")
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        before=record_attempt,
     )
     def d1_query(self, name: str, params: list[Any]) -> dict:
         """
@@ -118,20 +142,17 @@ class EdgeClient:
 
         logger.debug(f"Executing D1 query: {name}")
 
-        response = self.client.post(
-            f"{self.base_url}/d1/query",
-            headers=self.headers,
-            content=orjson.dumps(payload),
-        )
-        response.raise_for_status()
+        response = self._post("/d1/query", payload)
 
-        data = response.json()
+        data: dict = response.json()
         logger.info(f"D1 query '{name}' executed successfully")
         return data
 
+    @traced("edge.emit_event")
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
+        before=record_attempt,
     )
     def emit_event(
         self,
@@ -225,9 +246,11 @@ class EdgeClient:
             logger.error(f"Failed to insert finding: {e}")
             return False
 
+    @traced("edge.llm_gateway")
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=2, min=4, max=30),
+        before=record_attempt,
     )
     def llm_gateway(
         self,
@@ -244,26 +267,24 @@ class EdgeClient:
         Returns:
             Gemini response data
         """
-        payload = {"contents": contents}
+        payload: dict[str, Any] = {"contents": contents}
         if generation_config:
             payload["generationConfig"] = generation_config
 
         logger.debug("Calling Gemini via AI Gateway")
 
-        response = self.client.post(
-            f"{self.base_url}/llm/gateway",
-            headers=self.headers,
-            content=orjson.dumps(payload),
-        )
-        response.raise_for_status()
+        response = self._post("/llm/gateway", payload)
 
-        data = response.json()
+        data: dict = response.json()
+        record_usage(data.get("usageMetadata"))
         logger.info("Gemini gateway call successful")
         return data
 
+    @traced("edge.llm_embed")
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=2, min=4, max=30),
+        before=record_attempt,
     )
     def llm_embed(
         self,
@@ -282,18 +303,23 @@ class EdgeClient:
 
         logger.debug(f"Generating {len(requests)} embeddings via AI Gateway")
 
-        response = self.client.post(
-            f"{self.base_url}/llm/embed",
-            headers=self.headers,
-            content=orjson.dumps(payload),
-        )
-        response.raise_for_status()
+        response = self._post("/llm/embed", payload)
 
-        data = response.json()
+        data: dict = response.json()
         logger.info("Embedding generation successful")
         return data
 
+    def _post(self, path: str, payload: dict[str, Any]) -> httpx.Response:
+        """POST a JSON payload to the edge API in a span, raising on HTTP errors."""
+        body = orjson.dumps(payload)
+        with span(f"POST {path}", request_bytes=len(body)) as http_span:
+            response = self.client.post(
+                f"{self.base_url}{path}", headers=self.headers, content=body
+            )
+            http_span.set(status_code=response.status_code, response_bytes=len(response.content))
+            response.raise_for_status()
+        return response
+
     def close(self):
         """Close the HTTP client."""
         self.client.close()
-
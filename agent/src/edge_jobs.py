@@ -22,6 +22,8 @@ class Job:
     tenant_id: str
     r2_key: str
     attempts: int = 0
+    # Revisions of one document share a lineage (None if not given)
+    lineage_id: str | None = None
 
 
 class EdgeJobClient:
@@ -73,6 +75,7 @@ class EdgeJobClient:
                     tenant_id=job_data["tenantId"],
                     r2_key=job_data["r2Key"],
                     attempts=job_data.get("attempts", 0),
+                    lineage_id=job_data.get("lineageId"),
                 )
                 jobs.append(job)
             except (KeyError, TypeError) as e:
@@ -0,0 +1,135 @@
+"""Embedding compression: dimension reduction and int8 scalar quantization."""
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Full output width of text-embedding-004
+FULL_DIMENSIONS = 768
+
+INT8_MAX = 127
+
+
+def truncate_dimensions(vectors: np.ndarray, dimensions: int) -> np.ndarray:
+    """
+    Keep the leading dimensions of each vector and re-normalize to unit length.
+
+    text-embedding-004 is trained so that its leading dimensions carry most of
+    the signal, which is what the API does when outputDimensionality is set.
+    This is the local equivalent for vectors that arrive at full width.
+
+    Args:
+        vectors: Array of shape (n, d)
+        dimensions: Target dimensionality (<= d)
+
+    Returns:
+        float32 array of shape (n, dimensions)
+    """
+    truncated = np.asarray(vectors, dtype=np.float32)[:, :dimensions]
+    norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return truncated / norms
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-vector int8 scalar quantization.
+
+    Each vector is scaled so that its largest absolute component maps to 127.
+    Cosine similarity is invariant to the per-vector scale, so quantized
+    vectors can be indexed and queried as-is; the scale is only needed to
+    recover the original magnitudes.
+
+    Args:
+        vectors: Array of shape (n, d)
+
+    Returns:
+        Tuple of (int8 codes of shape (n, d), float32 scales of shape (n,))
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / INT8_MAX
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """
+    Reverse quantize_int8.
+
+    Args:
+        codes: int8 array of shape (n, d)
+        scales: float32 array of shape (n,)
+
+    Returns:
+        float32 array of shape (n, d)
+    """
+    return codes.astype(np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
+
+@dataclass
+class CompressedEmbeddings:
+    """Embeddings ready for upsert, with optional per-vector scale factors."""
+
+    values: list[list[float]] | list[list[int]]
+    scales: list[float] | None = None
+
+
+class EmbeddingCompressor:
+    """Configurable compression stage between embedding and indexing."""
+
+    def __init__(self, dimensions: int | None = None, quantize: bool = False):
+        if dimensions is not None and not 0 < dimensions <= FULL_DIMENSIONS:
+            raise ValueError(f"dimensions must be between 1 and {FULL_DIMENSIONS}")
+        self.dimensions = dimensions
+        self.quantize = quantize
+
+    @property
+    def enabled(self) -> bool:
+        """Whether this compressor changes vectors at all."""
+        return self.dimensions is not None or self.quantize
+
+    def compress(self, vectors: list[list[float]]) -> CompressedEmbeddings:
+        """
+        Reduce and optionally quantize a batch of embeddings.
+
+        Vectors already at or below the target width (because the model was
+        asked for reduced output dimensionality) are passed through unchanged
+        apart from quantization.
+
+        Args:
+            vectors: Embeddings from GeminiClient.embed_texts
+
+        Returns:
+            CompressedEmbeddings with JSON-friendly values
+        """
+        if not vectors or not self.enabled:
+            return CompressedEmbeddings(values=vectors)
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if self.dimensions is not None and matrix.shape[1] > self.dimensions:
+            matrix = truncate_dimensions(matrix, self.dimensions)
+
+        if not self.quantize:
+            return CompressedEmbeddings(values=matrix.tolist())
+
+        codes, scales = quantize_int8(matrix)
+        return CompressedEmbeddings(values=codes.tolist(), scales=scales.tolist())
+
+    def bytes_per_vector(self, source_dimensions: int = FULL_DIMENSIONS) -> int:
+        """
+        Storage cost of one compressed vector, including its scale factor.
+
+        Args:
+            source_dimensions: Width of the vectors before compression
+
+        Returns:
+            Bytes per vector at rest
+        """
+        dims = min(self.dimensions or source_dimensions, source_dimensions)
+        if self.quantize:
+            return dims + 4
+        return dims * 4
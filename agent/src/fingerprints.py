@@ -0,0 +1,226 @@
+"""Persistent per-tenant transaction fingerprints for cross-run duplicate detection."""
+
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on host parameters per statement is 999 on older builds
+_QUERY_BATCH = 900
+
+_SPLIT_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def fingerprint_transaction(vendor: str, date: str, cents: int) -> int:
+    """
+    64-bit fingerprint of a transaction's identifying fields.
+
+    Args:
+        vendor: Normalized vendor name
+        date: Canonical date (ISO format where parseable)
+        cents: Amount in cents
+
+    Returns:
+        Signed 64-bit integer (SQLite's INTEGER range)
+    """
+    digest = hashlib.blake2b(f"{vendor}|{date}|{cents}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 64-bit fingerprints.
+
+    Bit positions come from double hashing the two 32-bit halves of each
+    fingerprint, so membership tests are vectorized and cost O(k) per key
+    independent of how many keys were added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1024)
+        self.capacity = capacity
+        self.num_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, fingerprints: np.ndarray) -> np.ndarray:
+        keys = fingerprints.astype(np.int64).view(np.uint64)
+        # Mix so that structured fingerprints still spread over the bit array
+        mixed = keys * _SPLIT_MIX
+        low = mixed & np.uint64(0xFFFFFFFF)
+        high = (mixed >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return ((low[:, None] + steps * high[:, None]) % np.uint64(self.num_bits)).astype(np.int64)
+
+    def add(self, fingerprints: np.ndarray) -> None:
+        """Add fingerprints to the filter."""
+        if not len(fingerprints):
+            return
+        positions = self._positions(fingerprints).ravel()
+        np.bitwise_or.at(self._bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        self.count += len(fingerprints)
+
+    def might_contain(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Test fingerprints for membership.
+
+        Returns:
+            Boolean array; False means definitely absent
+        """
+        if not len(fingerprints):
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(fingerprints)
+        bits = (self._bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1
+        present: np.ndarray = bits.all(axis=1)
+        return present
+
+
+@dataclass
+class PriorTransaction:
+    """A transaction recorded by an earlier run."""
+
+    fingerprint: int
+    run_id: str
+    txn_id: str
+
+
+class FingerprintStore:
+    """
+    SQLite store of transaction fingerprints, one database per tenant.
+
+    Each tenant's database is keyed on the fingerprint, so a lookup is a
+    single index probe regardless of history size. An in-memory Bloom filter
+    per tenant answers the common "never seen" case without touching the
+    table. Every recorded batch gets a sequence number; before each use the
+    filter catches up on batches recorded since it was built, including those
+    written by other worker processes.
+    """
+
+    def __init__(self, directory: str | Path, error_rate: float = 0.001):
+        self.directory = Path(directory)
+        self.error_rate = error_rate
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Per tenant: Bloom filter and the last batch sequence it contains
+        self._filters: dict[str, tuple[BloomFilter, int]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def path(self, tenant_id: str) -> Path:
+        """Database file of a tenant."""
+        digest = hashlib.sha256(tenant_id.encode()).hexdigest()[:16]
+        return self.directory / f"{digest}.sqlite"
+
+    @contextmanager
+    def _connection(self, tenant_id: str) -> Iterator[sqlite3.Connection]:
+        """Connection to a tenant's database; commits on success and always closes."""
+        conn = sqlite3.connect(self.path(tenant_id), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints ("
+                "fp INTEGER NOT NULL, run_id TEXT NOT NULL, txn_id TEXT NOT NULL, "
+                "seq INTEGER NOT NULL, PRIMARY KEY (fp, run_id, txn_id)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS fingerprints_seq ON fingerprints (seq)")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _lock(self, tenant_id: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(tenant_id, threading.Lock())
+
+    def _sync_filter(self, tenant_id: str, conn: sqlite3.Connection) -> BloomFilter:
+        """The tenant's Bloom filter, caught up with the database."""
+        bloom, synced = self._filters.get(tenant_id, (None, 0))
+        (latest,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM fingerprints").fetchone()
+        if bloom is not None and latest == synced:
+            return bloom
+
+        if bloom is not None:
+            (pending,) = conn.execute(
+                "SELECT COUNT(*) FROM fingerprints WHERE seq > ?", (synced,)
+            ).fetchone()
+        if bloom is None or bloom.count + pending > bloom.capacity:
+            # Rebuild with room to grow rather than exceed the target error rate
+            (count,) = conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()
+            bloom, synced = BloomFilter(2 * count, self.error_rate), 0
+            logger.info(f"Building fingerprint filter for tenant {tenant_id} ({count} entries)")
+
+        cursor = conn.execute(
+            "SELECT fp FROM fingerprints WHERE seq > ? AND seq <= ?", (synced, latest)
+        )
+        while rows := cursor.fetchmany(100_000):
+            bloom.add(np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)))
+        self._filters[tenant_id] = (bloom, latest)
+        return bloom
+
+    def lookup(
+        self, tenant_id: str, fingerprints: Sequence[int], exclude_run_id: str | None = None
+    ) -> dict[int, list[PriorTransaction]]:
+        """
+        Find earlier occurrences of fingerprints.
+
+        Args:
+            tenant_id: Tenant identifier
+            fingerprints: Fingerprints to look up
+            exclude_run_id: Ignore entries recorded by this run (e.g. on retries)
+
+        Returns:
+            Prior transactions by fingerprint, only for fingerprints seen before
+        """
+        keys = np.asarray(fingerprints, dtype=np.int64)
+        matches: dict[int, list[PriorTransaction]] = {}
+        with self._lock(tenant_id), self._connection(tenant_id) as conn:
+            candidates = np.unique(keys[self._sync_filter(tenant_id, conn).might_contain(keys)])
+
+            for start in range(0, len(candidates), _QUERY_BATCH):
+                batch = candidates[start : start + _QUERY_BATCH].tolist()
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT fp, run_id, txn_id FROM fingerprints "
+                    f"WHERE fp IN ({placeholders}) AND run_id != ? ORDER BY seq, txn_id",
+                    [*batch, exclude_run_id or ""],
+                )
+                for fp, run_id, txn_id in rows:
+                    matches.setdefault(fp, []).append(PriorTransaction(fp, run_id, txn_id))
+
+        logger.info(
+            f"Fingerprint lookup for tenant {tenant_id}: {len(keys)} keys, "
+            f"{len(candidates)} filter hits, {len(matches)} prior matches"
+        )
+        return matches
+
+    def record(self, tenant_id: str, run_id: str, entries: Iterable[tuple[int, str]]) -> None:
+        """
+        Record a run's transactions as one batch.
+
+        Recording the same transactions of a run again is a no-op.
+
+        Args:
+            tenant_id: Tenant identifier
+            run_id: Run identifier
+            entries: (fingerprint, transaction ID) pairs
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        with self._lock(tenant_id), self._connection(tenant_id) as conn:
+            # Serialize writers across processes while the next sequence is taken
+            conn.execute("BEGIN IMMEDIATE")
+            (seq,) = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM fingerprints").fetchone()
+            conn.executemany(
+                "INSERT OR IGNORE INTO fingerprints (fp, run_id, txn_id, seq) VALUES (?, ?, ?, ?)",
+                [(fp, run_id, txn_id, seq) for fp, txn_id in entries],
+            )
@@ -6,6 +6,7 @@ from typing import Any
 
 from .config import Config
 from .edge_client import EdgeClient
+from .tracing import current_span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,8 @@ class GeminiClient:
         self.config = config
         self.edge_client = edge_client
 
-    def extract_text(self, file_bytes: bytes, mime_type: str) -> str:
+    @traced("gemini.extract_text")
+    def extract_text(self, file_bytes: bytes | memoryview, mime_type: str) -> str:
         """
         Extract text from a document using Gemini's multimodal capabilities.
 
@@ -25,7 +27,7 @@ class GeminiClient:
         avoiding the need for local OCR/parsing libraries.
 
         Args:
-            file_bytes: Document bytes
+            file_bytes: Document bytes, or a view of them
             mime_type: MIME type (e.g., 'application/pdf', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document')
 
         Returns:
@@ -58,6 +60,7 @@ class GeminiClient:
         }
 
         logger.info(f"Extracting text from {len(file_bytes)} bytes ({mime_type})")
+        current_span().set(input_bytes=len(file_bytes), mime_type=mime_type)
 
         # Call Gemini via edge proxy
         data = self.edge_client.llm_gateway(contents, generation_config)
@@ -79,6 +82,7 @@ class GeminiClient:
             # Concatenate all text parts
             text = " ".join(part.get("text", "") for part in parts)
             logger.info(f"Extracted {len(text)} characters of text")
+            current_span().set(output_chars=len(text))
             return text.strip()
 
         except (KeyError, IndexError) as e:
@@ -86,12 +90,16 @@ class GeminiClient:
             logger.debug(f"Response data: {data}")
             return ""
 
-    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+    @traced("gemini.embed_texts")
+    def embed_texts(
+        self, texts: list[str], output_dimensionality: int | None = None
+    ) -> list[list[float]]:
         """
         Generate embeddings for texts using Gemini's embedding model.
 
         Args:
             texts: List of texts to embed
+            output_dimensionality: Optional reduced vector width (model default: 768)
 
         Returns:
             List of embedding vectors
@@ -102,9 +110,16 @@ class GeminiClient:
         # Build requests for each text
         requests = []
         for text in texts:
-            requests.append({"model": "models/text-embedding-004", "content": {"parts": [{"text": text}]}})
+            request: dict[str, Any] = {
+                "model": "models/text-embedding-004",
+                "content": {"parts": [{"text": text}]},
+            }
+            if output_dimensionality:
+                request["outputDimensionality"] = output_dimensionality
+            requests.append(request)
 
         logger.info(f"Embedding {len(texts)} texts")
+        current_span().set(texts=len(texts), input_chars=sum(map(len, texts)))
 
         # Call via edge proxy
         data = self.edge_client.llm_embed(requests)
@@ -119,6 +134,7 @@ class GeminiClient:
         logger.info(f"Generated {len(embeddings)} embeddings")
         return embeddings
 
+    @traced("gemini.chat")
     def chat(
         self,
         prompt: str,
@@ -149,6 +165,7 @@ class GeminiClient:
         }
 
         logger.info(f"Chat request with {len(prompt)} char prompt")
+        current_span().set(prompt_chars=len(prompt))
 
         # Call via edge proxy
         data = self.edge_client.llm_gateway(contents, generation_config)
@@ -164,10 +181,9 @@ class GeminiClient:
 
             text = " ".join(part.get("text", "") for part in parts)
             logger.info(f"Generated {len(text)} characters of text")
+            current_span().set(output_chars=len(text))
             return text.strip()
 
         except (KeyError, IndexError) as e:
             logger.error(f"Failed to parse Gemini response: {e}")
             return ""
-
-
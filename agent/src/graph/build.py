@@ -1,96 +1,437 @@
 """Build and execute the LangGraph audit pipeline."""
 
 import logging
-from typing import Callable
+from typing import Any, Callable
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
+from ..artifacts import ArtifactStore
+from ..cache import BlobCache, ResponseCache
+from ..checkpoints import SqliteCheckpointer
 from ..config import Config
+from ..dates import day_first_for_locale
+from ..dedupe import MinHashDeduplicator
 from ..edge_client import EdgeClient
+from ..embeddings import EmbeddingCompressor
+from ..fingerprints import FingerprintStore
 from ..gemini import GeminiClient
+from ..incremental import ManifestStore
 from ..r2 import R2Client
 from ..state import RunState
+from ..tracing import configure_tracing, span
+from ..vector_index import LocalVectorIndex
 from . import nodes
 
 logger = logging.getLogger(__name__)
 
 
-def build_graph(config: Config) -> Callable[[RunState], RunState]:
+# Large RunState fields kept in the artifact store between graph nodes, with the
+# nodes that read them; each payload is freed once the last of its readers finishes
+OFFLOADED_FIELDS: dict[str, tuple[str, ...]] = {
+    "raw_text": ("chunk", "vectors", "audit"),
+    "embeddings": (),
+    "embedding_scales": (),
+    "txns": ("report",),
+}
+
+
+class NodeFailedError(RuntimeError):
+    """A node of a checkpointed run set an error; the message is the error."""
+
+
+def state_updates(
+    node: Callable[[RunState], RunState],
+    name: str | None = None,
+    artifacts: ArtifactStore | None = None,
+    raise_errors: bool = False,
+) -> Callable[[RunState], dict[str, Any]]:
+    """
+    Adapt a node that mutates and returns the state to return only changed fields.
+
+    Nodes in parallel branches each receive their own copy of the state;
+    returning just the fields a node assigned lets LangGraph merge branches
+    without conflicting writes.
+
+    Each call is traced as a "node.<name>" span, marked failed if the node
+    sets an error.
+
+    With an artifact store, the OFFLOADED_FIELDS the node reads are loaded
+    from the store before it runs and released after. Offloaded fields it
+    assigns are moved into the store (or dropped, if no later node reads
+    them and the store is not durable), so only references travel through
+    the graph state.
+
+    With raise_errors, a node setting an error raises NodeFailedError instead of
+    returning it. LangGraph then saves the writes of the nodes that finished
+    in the same step, and a resumed run does not repeat them.
+
+    Args:
+        node: Node function
+        name: Graph node name, matched against OFFLOADED_FIELDS
+        artifacts: Artifact store for large fields (None keeps them in the state)
+        raise_errors: Raise NodeFailedError rather than return an error update
+
+    Returns:
+        Node function returning a partial state update
+    """
+
+    def run(state: RunState) -> dict[str, Any]:
+        loaded = {}
+        if artifacts is not None:
+            for field, ref in state.artifacts.items():
+                if name in OFFLOADED_FIELDS.get(field, ()):
+                    setattr(state, field, artifacts.get(ref))
+                    loaded[field] = ref
+
+        before = state.model_copy()
+        with span(f"node.{name or getattr(node, '__name__', 'node')}") as node_span:
+            try:
+                after = node(state)
+            finally:
+                if artifacts is not None:
+                    for ref in loaded.values():
+                        artifacts.release(ref)
+            if after.error and after.error != before.error:
+                node_span.error = after.error
+                if raise_errors:
+                    raise NodeFailedError(after.error)
+        updates = {
+            field: getattr(after, field)
+            for field in RunState.model_fields
+            if getattr(after, field) is not getattr(before, field)
+        }
+        if artifacts is not None:
+            updates = offload(updates, after.run_id, artifacts)
+        return updates
+
+    return run
+
+
+def offload(updates: dict[str, Any], run_id: str, artifacts: ArtifactStore) -> dict[str, Any]:
+    """
+    Move offloaded fields of a state update into the artifact store.
+
+    Args:
+        updates: Partial state update
+        run_id: Run the update belongs to
+        artifacts: Artifact store
+
+    Returns:
+        Update with those fields reset to their defaults and their references added
+    """
+    refs = {}
+    for field, readers in OFFLOADED_FIELDS.items():
+        if field not in updates:
+            continue
+        value = updates[field]
+        updates[field] = RunState.model_fields[field].get_default(call_default_factory=True)
+        # A durable store keeps unread payloads too, as part of a resumable step
+        if value and (readers or artifacts.durable):
+            refs[field] = artifacts.put(run_id, field, value, len(readers))
+    if refs:
+        updates["artifacts"] = refs
+    return updates
+
+
+def resume_point(
+    app: CompiledStateGraph, state: RunState
+) -> tuple[RunState | None, RunnableConfig]:
+    """
+    Graph input and config for a run, resuming an earlier attempt if there was one.
+
+    Checkpoints are keyed by run ID. The newest checkpoint without an error
+    is resumed, so only the nodes after it run again; offloaded fields come
+    back as artifact references. Checkpoints holding the downloaded document
+    are skipped, since the blob itself is not saved: ingest runs again and is
+    served from the R2 cache. Nodes of a checkpointed run raise NodeFailedError
+    rather than returning an error, so LangGraph keeps the writes of the
+    nodes that finished in the failed step and resuming the latest
+    checkpoint skips them too: a failed audit branch does not repeat the
+    vector branch.
+
+    Args:
+        app: Compiled graph
+        state: Initial run state
+
+    Returns:
+        Input (None to resume) and config for app.invoke
+    """
+    config: RunnableConfig = {"configurable": {"thread_id": state.run_id}}
+    if app.checkpointer is None:
+        return state, config
+
+    for index, snapshot in enumerate(app.get_state_history(config)):
+        if snapshot.values.get("error") or snapshot.values.get("file_blob") is not None:
+            continue
+        logger.info(
+            f"[{state.run_id}] Resuming from checkpoint before "
+            f"{', '.join(snapshot.next) or 'the end'}"
+        )
+        # Only the latest checkpoint is resumed with the writes saved against it
+        return None, config if index == 0 else snapshot.config
+    return state, config
+
+
+def chain(**steps: Callable[[RunState], RunState]) -> Callable[[RunState], RunState]:
+    """
+    Compose nodes into one node that runs them in order.
+
+    Like the graph's own edges, the chain stops at the first error.
+
+    Args:
+        steps: Node functions by name, each traced as a "step.<name>" span
+
+    Returns:
+        Node function that stops after the first step setting an error
+    """
+
+    def run(state: RunState) -> RunState:
+        for name, step in steps.items():
+            with span(f"step.{name}"):
+                state = step(state)
+            if state.error:
+                break
+        return state
+
+    return run
+
+
+def route_errors(
+    *next_nodes: str,
+) -> Callable[[RunState], str | list[str]]:
+    """
+    Conditional edge to the given nodes, or to "fail" once the state has an error.
+
+    Args:
+        next_nodes: Nodes to run next if there is no error
+
+    Returns:
+        Routing function for add_conditional_edges
+    """
+
+    def route(state: RunState) -> str | list[str]:
+        if state.error:
+            return "fail"
+        return next_nodes[0] if len(next_nodes) == 1 else list(next_nodes)
+
+    return route
+
+
+def build_graph(config: Config) -> Callable[[RunState], dict[str, Any]]:
     """
     Build the LangGraph audit pipeline.
 
+    Both failure paths end in nodes.fail. A node that sets an error routes
+    the run to the "fail" node, skipping the remaining nodes. With
+    checkpointing the node raises NodeFailedError instead, and the pipeline
+    calls nodes.fail after the graph stops: LangGraph only keeps the writes
+    of a failed step's other tasks when the step raises, and a retry needs
+    them to skip the branch that finished.
+
     Args:
         config: Application configuration
 
     Returns:
-        Callable that executes the graph
+        Callable that executes the graph and returns the final state values
     """
+    configure_tracing(config)
+
     # Initialize clients
-    r2_client = R2Client(config)
+    blob_cache = (
+        BlobCache(config.r2_cache_dir, config.r2_cache_max_bytes)
+        if config.r2_cache_enabled
+        else None
+    )
+    r2_client = R2Client(config, blob_cache)
     edge_client = EdgeClient(config)
     gemini_client = GeminiClient(config, edge_client)
+    compressor = EmbeddingCompressor(config.embed_dimensions, config.embed_quantize)
+    response_cache = (
+        ResponseCache(
+            config.chat_cache_dir,
+            ttl_seconds=config.chat_cache_ttl,
+            max_entries=config.chat_cache_max_entries,
+            bypass=config.chat_cache_bypass,
+        )
+        if config.chat_cache_enabled
+        else None
+    )
+
+    deduplicator = (
+        MinHashDeduplicator(config.dedupe_threshold) if config.dedupe_enabled else None
+    )
+    manifest_store = ManifestStore(r2_client) if config.incremental_reaudit else None
+    vector_store = (
+        LocalVectorIndex.open(config.vector_index_path)
+        if config.vector_backend == "local"
+        else None
+    )
+    fingerprint_store = (
+        FingerprintStore(config.fingerprint_dir) if config.fingerprint_index else None
+    )
+    day_first = day_first_for_locale(config.date_locale)
+    checkpointer = (
+        SqliteCheckpointer(config.checkpoint_path) if config.checkpoint_enabled else None
+    )
+    # Checkpointed runs keep their payloads on disk so a retry can read them
+    artifacts = ArtifactStore(
+        config.artifact_spill_dir, config.artifact_spill_bytes, durable=checkpointer is not None
+    )
 
     # Create the graph
     workflow = StateGraph(RunState)
 
+    def add_node(name: str, node: Callable[[RunState], RunState]) -> None:
+        workflow.add_node(
+            name, state_updates(node, name, artifacts, raise_errors=checkpointer is not None)
+        )
+
     # Add nodes with dependencies injected
-    workflow.add_node("ingest", lambda state: nodes.ingest(state, r2_client, edge_client))
-    workflow.add_node(
+    add_node("ingest", lambda state: nodes.ingest(state, r2_client, edge_client))
+    add_node(
         "extract",
         lambda state: nodes.extract_text_with_gemini(state, gemini_client, edge_client),
     )
-    workflow.add_node("chunk", lambda state: nodes.chunk(state, edge_client))
-    workflow.add_node("embed", lambda state: nodes.embed(state, gemini_client, edge_client))
-    workflow.add_node("index", lambda state: nodes.index(state, edge_client))
-    workflow.add_node("checks", lambda state: nodes.checks(state, edge_client))
-    workflow.add_node(
-        "analyze", lambda state: nodes.analyze(state, gemini_client, edge_client)
+    add_node(
+        "chunk",
+        lambda state: nodes.chunk(
+            state, edge_client, config.chunk_max_tokens, config.chunk_overlap_tokens
+        ),
+    )
+    add_node(
+        "vectors",
+        chain(
+            dedupe=lambda state: nodes.dedupe(state, deduplicator, edge_client),
+            diff=lambda state: nodes.diff(state, manifest_store, edge_client),
+            embed_index=lambda state: nodes.embed_index(
+                state,
+                gemini_client,
+                edge_client,
+                compressor,
+                manifest_store,
+                vector_store,
+                config.embed_batch_size,
+                config.embed_queue_depth,
+            ),
+        ),
     )
-    workflow.add_node("report", lambda state: nodes.report(state, r2_client, edge_client))
-    workflow.add_node("persist", lambda state: nodes.persist(state, edge_client))
+    add_node(
+        "audit",
+        chain(
+            checks=lambda state: nodes.checks(
+                state,
+                edge_client,
+                config.check_workers,
+                fingerprint_store,
+                day_first,
+                r2_client,
+                config.aggregate_findings,
+            ),
+            analyze=lambda state: nodes.analyze(
+                state,
+                gemini_client,
+                edge_client,
+                response_cache,
+            ),
+        ),
+    )
+    add_node("report", lambda state: nodes.report(state, r2_client, edge_client))
+    add_node("persist", lambda state: nodes.persist(state, edge_client))
+    add_node("fail", lambda state: nodes.fail(state, edge_client))
+    # Waits for both branches so their errors are checked together
+    add_node("join", lambda state: state)
 
-    # Define edges (linear pipeline)
+    # Define edges: once the text is chunked the vector branch (dedupe -> diff
+    # -> embed_index) and the audit branch (checks -> analyze) run concurrently;
+    # chunking comes first because both branches use the chunk spans.
+    # Each branch is a single node so both occupy the same LangGraph superstep;
+    # the report follows the join (it lists chunk and vector counts). As soon
+    # as a node sets an error the run goes straight to "fail", skipping the rest
+    # (a checkpointed run's node raises NodeFailedError instead, handled below).
     workflow.set_entry_point("ingest")
-    workflow.add_edge("ingest", "extract")
-    workflow.add_edge("extract", "chunk")
-    workflow.add_edge("chunk", "embed")
-    workflow.add_edge("embed", "index")
-    workflow.add_edge("index", "checks")
-    workflow.add_edge("checks", "analyze")
-    workflow.add_edge("analyze", "report")
-    workflow.add_edge("report", "persist")
+    workflow.add_conditional_edges("ingest", route_errors("extract"), ["extract", "fail"])
+    workflow.add_conditional_edges("extract", route_errors("chunk"), ["chunk", "fail"])
+    workflow.add_conditional_edges(
+        "chunk", route_errors("vectors", "audit"), ["vectors", "audit", "fail"]
+    )
+    workflow.add_edge(["vectors", "audit"], "join")
+    workflow.add_conditional_edges("join", route_errors("report"), ["report", "fail"])
+    workflow.add_conditional_edges("report", route_errors("persist"), ["persist", "fail"])
     workflow.add_edge("persist", END)
+    workflow.add_edge("fail", END)
 
     # Compile the graph
-    app = workflow.compile()
+    app = workflow.compile(checkpointer=checkpointer)
 
-    def run_pipeline(state: RunState) -> RunState:
+    def run_pipeline(state: RunState) -> dict[str, Any]:
         """
-        Execute the pipeline for a given state.
+        Execute the pipeline for a given state, traced as a "run" span.
 
         Args:
             state: Initial run state
 
         Returns:
-            Final run state after all nodes
+            Final state values, with "error" set if the run failed
         """
-        logger.info(f"Starting pipeline for run {state.run_id}")
+        with span(
+            "run", run_id=state.run_id, tenant_id=state.tenant_id, r2_key=state.r2_key
+        ) as run_span:
+            logger.info(f"Starting pipeline for run {state.run_id}")
+            failed = True
 
-        try:
-            # Run the graph
-            final_state = app.invoke(state)
-            logger.info(f"Pipeline completed for run {state.run_id}")
-            return final_state
+            if checkpointer is not None:
+                # Failed runs that were not retried in time are dropped for good
+                try:
+                    expired = checkpointer.delete_expired(
+                        config.checkpoint_retention_seconds, keep=state.run_id
+                    )
+                    for run_id in expired:
+                        artifacts.drop_run(run_id)
+                    if expired:
+                        logger.info(f"Dropped checkpoints of {len(expired)} expired runs")
+                except Exception as e:
+                    logger.warning(f"Failed to prune expired checkpoints: {e}")
 
-        except Exception as e:
-            logger.error(f"Pipeline failed for run {state.run_id}: {e}", exc_info=True)
-            state.error = str(e)
-            # Attempt to persist error state
             try:
-                nodes.persist(state, edge_client)
-            except Exception as persist_error:
-                logger.error(f"Failed to persist error state: {persist_error}")
-            return state
+                # Run the graph, resuming a checkpointed earlier attempt
+                final_state: dict[str, Any] = app.invoke(*resume_point(app, state))
+                failed = bool(final_state.get("error"))
+                run_span.error = final_state.get("error")
+                logger.info(f"Pipeline completed for run {state.run_id}")
+
+            except Exception as e:
+                logger.error(
+                    f"Pipeline failed for run {state.run_id}: {e}",
+                    exc_info=not isinstance(e, NodeFailedError),
+                )
+                state.error = str(e)
+                run_span.error = state.error
+                # Attempt to record the failure, as the "fail" node does for routed errors
+                try:
+                    nodes.fail(state, edge_client)
+                except Exception as persist_error:
+                    logger.error(f"Failed to persist error state: {persist_error}")
+                # Same shape as the graph's result
+                return dict(state)
+            finally:
+                # A failed run's checkpoints and payloads are kept for its retry
+                artifacts.drop_run(state.run_id, keep_files=failed)
+                if checkpointer is not None and not failed:
+                    checkpointer.delete_thread(state.run_id)
+                logger.info(
+                    f"Freed artifacts of run {state.run_id} "
+                    f"(worker peak {artifacts.peak_nbytes} bytes in memory)"
+                )
+
+            if vector_store is not None:
+                try:
+                    vector_store.save(config.vector_index_path)
+                except Exception as e:
+                    logger.error(f"Failed to save local vector index: {e}")
+
+            return final_state
 
     return run_pipeline
 
@@ -102,7 +443,9 @@ class PipelineRunner:
         self.config = config
         self.pipeline = build_graph(config)
 
-    def run(self, run_id: str, tenant_id: str, r2_key: str) -> RunState:
+    def run(
+        self, run_id: str, tenant_id: str, r2_key: str, lineage_id: str | None = None
+    ) -> dict[str, Any]:
         """
         Run the pipeline for a given job.
 
@@ -110,15 +453,17 @@ class PipelineRunner:
             run_id: Unique run identifier
             tenant_id: Tenant identifier
             r2_key: R2 object key
+            lineage_id: Document lineage, for incremental re-audits
 
         Returns:
-            Final run state
+            Final state values
         """
         # Create initial state
         state = RunState(
             run_id=run_id,
             tenant_id=tenant_id,
             r2_key=r2_key,
+            lineage_id=lineage_id,
         )
 
         # Execute pipeline
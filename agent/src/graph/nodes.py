@@ -1,22 +1,46 @@
 """LangGraph node implementations for the audit pipeline."""
 
 import logging
+import queue
 import random
-import re
+import threading
 import time
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 import orjson
 
-from ..checks.deterministic import run_all_checks
+from ..cache import ResponseCache, make_cache_key
+from ..checks.aggregate import Aggregation, aggregate_findings, evidence_key, iter_evidence
+from ..checks.deterministic import collect_findings, run_registered_checks
+from ..checks.table import TxnTable
+from ..chunking import iter_chunk_spans
 from ..config import Config
+from ..dedupe import MinHashDeduplicator
 from ..edge_client import EdgeClient
+from ..embeddings import EmbeddingCompressor
+from ..fingerprints import FingerprintStore
 from ..gemini import GeminiClient
+from ..incremental import (
+    ChunkManifest,
+    ManifestStore,
+    fingerprint_chunk,
+    plan_incremental,
+)
 from ..r2 import R2Client
 from ..state import RunState, Txn
+from ..tracing import in_context
+from ..transactions import iter_transactions
+from ..vector_index import VectorStore
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the analysis prompt or its inputs change to invalidate cached reports
+ANALYZE_PROMPT_VERSION = "audit-report-v1"
+
+# Matches the edge /vector/delete request limit
+VECTOR_DELETE_BATCH = 1000
+
 
 def ingest(state: RunState, r2_client: R2Client, edge_client: EdgeClient) -> RunState:
     """
@@ -34,12 +58,9 @@ def ingest(state: RunState, r2_client: R2Client, edge_client: EdgeClient) -> Run
     edge_client.emit_event(state.run_id, "info", "Downloading file from R2")
 
     try:
-        # Download file
-        file_bytes = r2_client.get_object(state.r2_key)
-
-        # Get metadata to detect MIME type
-        metadata = r2_client.get_object_metadata(state.r2_key)
-        mime_type = metadata.get("content_type")
+        # One ranged GET returns the content type with the first part
+        blob = r2_client.download(state.r2_key)
+        mime_type = blob.content_type
 
         # Fallback: detect from filename extension
         if not mime_type:
@@ -53,13 +74,13 @@ def ingest(state: RunState, r2_client: R2Client, edge_client: EdgeClient) -> Run
                 mime_type = "application/octet-stream"
 
         state.mime_type = mime_type
-        state.file_bytes = file_bytes
-        logger.info(f"[{state.run_id}] Downloaded {len(file_bytes)} bytes ({mime_type})")
+        state.file_blob = blob
+        logger.info(f"[{state.run_id}] Downloaded {len(blob)} bytes ({mime_type})")
 
         edge_client.emit_event(
             state.run_id,
             "info",
-            f"File downloaded: {len(file_bytes)} bytes",
+            f"File downloaded: {len(blob)} bytes",
             {"mime_type": mime_type},
         )
 
@@ -92,11 +113,17 @@ def extract_text_with_gemini(
         return state
 
     try:
-        if not state.file_bytes:
-            raise ValueError("No file bytes available")
+        blob = state.file_blob
+        if blob is None:
+            raise ValueError("No file available")
 
-        # Extract text using Gemini
-        raw_text = gemini_client.extract_text(state.file_bytes, state.mime_type or "application/pdf")
+        # Extract text from a view of the blob; no copy of the document is made
+        try:
+            raw_text = gemini_client.extract_text(blob.view(), state.mime_type or "application/pdf")
+        finally:
+            # Release the buffer (and any temp file) as soon as the text is out
+            blob.close()
+            state.file_blob = None
         state.raw_text = raw_text
 
         logger.info(f"[{state.run_id}] Extracted {len(raw_text)} characters")
@@ -106,9 +133,6 @@ def extract_text_with_gemini(
             f"Text extracted: {len(raw_text)} characters",
         )
 
-        # Clean up file bytes to save memory
-        state.file_bytes = None
-
     except Exception as e:
         logger.error(f"[{state.run_id}] Text extraction failed: {e}")
         state.error = f"Text extraction failed: {str(e)}"
@@ -117,16 +141,26 @@ def extract_text_with_gemini(
     return state
 
 
-def chunk(state: RunState, edge_client: EdgeClient) -> RunState:
+def chunk(
+    state: RunState,
+    edge_client: EdgeClient,
+    max_tokens: int = 384,
+    overlap_tokens: int = 48,
+) -> RunState:
     """
-    Split text into chunks for embedding.
+    Split text into overlapping, token-sized chunk spans for embedding.
+
+    Only (start, end) offsets into raw_text are stored; chunk strings are
+    sliced on demand through state.chunks.
 
     Args:
         state: Current run state
         edge_client: Edge client for event emission
+        max_tokens: Approximate token budget per chunk
+        overlap_tokens: Approximate tokens shared by consecutive chunks
 
     Returns:
-        Updated state with chunks
+        Updated state with chunk spans
     """
     logger.info(f"[{state.run_id}] Starting chunking")
     edge_client.emit_event(state.run_id, "info", "Chunking text")
@@ -135,142 +169,342 @@ def chunk(state: RunState, edge_client: EdgeClient) -> RunState:
         return state
 
     try:
-        # Simple chunking by length (roughly 1000-2000 chars per chunk)
-        text = state.raw_text
-        chunk_size = 1500
-        overlap = 200
+        state.chunk_spans = list(iter_chunk_spans(state.raw_text, max_tokens, overlap_tokens))
+        logger.info(f"[{state.run_id}] Created {len(state.chunk_spans)} chunks")
+        edge_client.emit_event(
+            state.run_id, "info", f"Created {len(state.chunk_spans)} text chunks"
+        )
+
+    except Exception as e:
+        logger.error(f"[{state.run_id}] Chunking failed: {e}")
+        state.error = f"Chunking failed: {str(e)}"
+        edge_client.emit_event(state.run_id, "error", f"Chunking failed: {e}")
+
+    return state
 
-        chunks = []
-        start = 0
 
-        while start < len(text):
-            end = start + chunk_size
-            chunk_text = text[start:end]
+def dedupe(
+    state: RunState, deduplicator: MinHashDeduplicator | None, edge_client: EdgeClient
+) -> RunState:
+    """
+    Collapse near-duplicate chunks before embedding.
 
-            # Try to break at sentence boundary
-            if end < len(text):
-                last_period = chunk_text.rfind(".")
-                last_newline = chunk_text.rfind("\n")
-                break_point = max(last_period, last_newline)
+    Repeated boilerplate (page headers, footers, disclaimers) is embedded
+    once; every other copy resolves to its representative's vector.
 
-                if break_point > chunk_size * 0.7:  # At least 70% of chunk
-                    chunk_text = text[start : start + break_point + 1]
-                    end = start + break_point + 1
+    Args:
+        state: Current run state
+        deduplicator: Near-duplicate detector, or None when disabled
+        edge_client: Edge client for event emission
 
-            chunks.append(chunk_text.strip())
-            start = end - overlap if end < len(text) else end
+    Returns:
+        Updated state with chunk representatives and pending chunks
+    """
+    if state.error or deduplicator is None or not state.chunk_spans:
+        return state
 
-        state.chunks = chunks
-        logger.info(f"[{state.run_id}] Created {len(chunks)} chunks")
-        edge_client.emit_event(state.run_id, "info", f"Created {len(chunks)} text chunks")
+    try:
+        representatives = deduplicator.representatives(state.chunks)
+        unique = [i for i, rep in enumerate(representatives) if i == rep]
+
+        state.chunk_representatives = representatives
+        state.pending_chunks = unique
+
+        collapsed = len(representatives) - len(unique)
+        logger.info(f"[{state.run_id}] Collapsed {collapsed} near-duplicate chunks")
+        if collapsed:
+            edge_client.emit_event(
+                state.run_id,
+                "info",
+                f"Skipping {collapsed} near-duplicate chunks",
+            )
 
     except Exception as e:
-        logger.error(f"[{state.run_id}] Chunking failed: {e}")
-        state.error = f"Chunking failed: {str(e)}"
-        edge_client.emit_event(state.run_id, "error", f"Chunking failed: {e}")
+        logger.error(f"[{state.run_id}] Deduplication failed: {e}")
+        state.error = f"Deduplication failed: {str(e)}"
+        edge_client.emit_event(state.run_id, "error", f"Deduplication failed: {e}")
 
     return state
 
 
-def embed(state: RunState, gemini_client: GeminiClient, edge_client: EdgeClient) -> RunState:
+def diff(
+    state: RunState, manifest_store: ManifestStore | None, edge_client: EdgeClient
+) -> RunState:
     """
-    Generate embeddings for chunks using Gemini.
+    Plan an incremental re-audit against the previous run of the same document.
+
+    Chunks are fingerprinted by content hash. Chunks already indexed for the
+    document lineage keep their vectors; only new or changed chunks are left
+    pending for embedding, and vectors for chunks that disappeared are
+    marked stale.
+
+    The lineage must come from the job: deriving it from the upload (e.g. its
+    filename) would let unrelated documents delete each other's vectors, so
+    a run without one indexes every chunk.
 
     Args:
         state: Current run state
-        gemini_client: Gemini client instance
+        manifest_store: Manifest store, or None when incremental mode is off
         edge_client: Edge client for event emission
 
     Returns:
-        Updated state with embeddings
+        Updated state with vector IDs, pending chunks and stale vectors
     """
-    logger.info(f"[{state.run_id}] Starting embedding")
-    edge_client.emit_event(state.run_id, "info", "Generating embeddings")
+    if state.error or manifest_store is None or not state.chunk_spans:
+        return state
 
-    if state.error or not state.chunks:
+    if not state.lineage_id:
+        logger.info(f"[{state.run_id}] No document lineage, skipping incremental re-audit")
         return state
 
+    hashes = [fingerprint_chunk(text) for text in state.chunks]
+    # Near-duplicates share their representative's fingerprint, and so its vector
+    if state.chunk_representatives:
+        hashes = [hashes[rep] for rep in state.chunk_representatives]
+    state.chunk_hashes = hashes
+
     try:
-        # Generate embeddings
-        embeddings = gemini_client.embed_texts(state.chunks)
-        state.embeddings = embeddings
+        previous = manifest_store.load(state.tenant_id, state.lineage_id)
+    except Exception as e:
+        # Without the previous manifest we can still index, just not reuse vectors
+        logger.warning(f"[{state.run_id}] Failed to load chunk manifest, doing a full run: {e}")
+        previous = None
+
+    plan = plan_incremental(state.chunk_hashes, state.tenant_id, state.lineage_id, previous)
+    state.vector_ids = plan.vector_ids
+    state.pending_chunks = plan.pending
+    state.stale_vector_ids = plan.stale_vector_ids
+
+    message = (
+        f"Incremental re-audit: {plan.reused} chunks reused, "
+        f"{len(plan.pending)} to embed, {len(plan.stale_vector_ids)} stale"
+    )
+    logger.info(f"[{state.run_id}] {message}")
+    edge_client.emit_event(state.run_id, "info", message)
 
-        # Generate vector IDs
-        state.vector_ids = [f"run:{state.run_id}:ch:{i}" for i in range(len(state.chunks))]
+    return state
 
-        logger.info(f"[{state.run_id}] Generated {len(embeddings)} embeddings")
-        edge_client.emit_event(
-            state.run_id,
-            "info",
-            f"Generated {len(embeddings)} embeddings",
-        )
 
-    except Exception as e:
-        logger.error(f"[{state.run_id}] Embedding failed: {e}")
-        state.error = f"Embedding failed: {str(e)}"
-        edge_client.emit_event(state.run_id, "error", f"Embedding failed: {e}")
+def _pending_chunks(state: RunState) -> Sequence[int]:
+    """Indices of chunks that need embedding and upserting."""
+    if state.pending_chunks is not None:
+        return state.pending_chunks
+    return range(len(state.chunk_spans))
+
+
+def _assign_vector_ids(state: RunState) -> None:
+    """Give every chunk a run-scoped vector ID unless a plan already assigned them."""
+    if not state.vector_ids:
+        owners = state.chunk_representatives or range(len(state.chunk_spans))
+        state.vector_ids = [f"run:{state.run_id}:ch:{i}" for i in owners]
+
+
+def _chunk_metadata(
+    state: RunState, indices: Sequence[int], scales: Sequence[float] | None = None
+) -> list[dict[str, Any]]:
+    """Vector metadata for the given chunks."""
+    metadatas = []
+    for n, i in enumerate(indices):
+        start, end = state.chunk_spans[i]
+        metadata = {
+            "run_id": state.run_id,
+            "tenant_id": state.tenant_id,
+            "chunk_index": i,
+            "text_preview": (state.raw_text or "")[start : min(end, start + 100)],
+        }
+        if state.chunk_hashes:
+            metadata["lineage"] = state.lineage_id
+            metadata["fingerprint"] = state.chunk_hashes[i]
+        # Quantized vectors carry their scale so the originals can be recovered
+        if scales:
+            metadata["scale"] = scales[n]
+        metadatas.append(metadata)
+    return metadatas
+
+
+def _finish_index(
+    state: RunState, store: VectorStore, manifest_store: ManifestStore | None
+) -> int:
+    """Delete stale vectors and record the chunk manifest; returns vectors removed."""
+    stale = state.stale_vector_ids
+    for batch_start in range(0, len(stale), VECTOR_DELETE_BATCH):
+        store.vector_delete(stale[batch_start : batch_start + VECTOR_DELETE_BATCH])
+
+    if manifest_store and state.chunk_hashes and state.lineage_id:
+        manifest_store.save(
+            ChunkManifest(
+                tenant_id=state.tenant_id,
+                lineage=state.lineage_id,
+                run_id=state.run_id,
+                vectors=dict(zip(state.chunk_hashes, state.vector_ids)),
+            )
+        )
 
-    return state
+    return len(stale)
 
 
-def index(state: RunState, edge_client: EdgeClient) -> RunState:
+def _put_until_stopped(handoff: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Block on a bounded queue until there is room, unless the consumer gave up."""
+    while not stop.is_set():
+        try:
+            handoff.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def embed_index(
+    state: RunState,
+    gemini_client: GeminiClient,
+    edge_client: EdgeClient,
+    compressor: EmbeddingCompressor | None = None,
+    manifest_store: ManifestStore | None = None,
+    vector_store: VectorStore | None = None,
+    batch_size: int = 64,
+    queue_depth: int = 2,
+) -> RunState:
     """
-    Index embeddings in Vectorize via edge proxy.
+    Embed, compress and index pending chunks as one pipelined stage.
+
+    A background thread embeds sub-batches and hands them to this thread
+    over a bounded queue; batch k is upserted while batch k+1 is being
+    embedded, so the stage takes about as long as the slower of the two
+    instead of their sum. The queue depth caps how far embedding can run
+    ahead of indexing.
 
     Args:
         state: Current run state
-        edge_client: Edge client instance
+        gemini_client: Gemini client instance
+        edge_client: Edge client for event emission and vector upserts
+        compressor: Optional embedding compressor, applied per batch
+        manifest_store: Optional manifest store for incremental re-audits
+        vector_store: Vector backend to use instead of the edge proxy
+        batch_size: Chunks per embedding request
+        queue_depth: Embedded batches allowed to wait for indexing
 
     Returns:
-        Updated state
+        Updated state with embeddings, vector IDs and scale factors
     """
-    logger.info(f"[{state.run_id}] Starting indexing")
-    edge_client.emit_event(state.run_id, "info", "Indexing vectors")
+    logger.info(f"[{state.run_id}] Starting embedding and indexing")
+    edge_client.emit_event(state.run_id, "info", "Embedding and indexing chunks")
 
-    if state.error or not state.embeddings:
+    if state.error or not state.chunk_spans:
         return state
 
+    store = vector_store if vector_store is not None else edge_client
+    chunks = state.chunks
+    pending = list(_pending_chunks(state))
+    batches = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+    handoff: queue.Queue = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for indices in batches:
+                texts = [chunks[i] for i in indices]
+                vectors: list[list[float]] | list[list[int]]
+                if compressor and compressor.dimensions:
+                    vectors = gemini_client.embed_texts(
+                        texts, output_dimensionality=compressor.dimensions
+                    )
+                else:
+                    vectors = gemini_client.embed_texts(texts)
+                if len(vectors) != len(indices):
+                    raise ValueError(f"Expected {len(indices)} embeddings, got {len(vectors)}")
+
+                scales = None
+                if compressor and compressor.enabled:
+                    compressed = compressor.compress(vectors)
+                    vectors, scales = compressed.values, compressed.scales
+
+                if not _put_until_stopped(handoff, (indices, vectors, scales), stop):
+                    return
+        except Exception as e:
+            _put_until_stopped(handoff, e, stop)
+
+    producer = threading.Thread(
+        target=in_context(produce), name=f"embed-{state.run_id}", daemon=True
+    )
+    stage = "Indexing"
+    embeddings: list[list[float] | list[int]] = []
+    embedding_scales: list[float] = []
+
     try:
-        # Prepare metadata
-        metadatas = [
-            {
-                "run_id": state.run_id,
-                "tenant_id": state.tenant_id,
-                "chunk_index": i,
-                "text_preview": chunk[:100],
-            }
-            for i, chunk in enumerate(state.chunks)
-        ]
-
-        # Upsert to Vectorize
-        edge_client.vector_upsert(
-            ids=state.vector_ids,
-            vectors=state.embeddings,
-            metadatas=metadatas,
-        )
+        _assign_vector_ids(state)
+        producer.start()
+
+        indexed = 0
+        for batch_number in range(1, len(batches) + 1):
+            item = handoff.get()
+            if isinstance(item, Exception):
+                stage = "Embedding"
+                raise item
+
+            indices, vectors, scales = item
+            store.vector_upsert(
+                ids=[state.vector_ids[i] for i in indices],
+                vectors=vectors,
+                metadatas=_chunk_metadata(state, indices, scales),
+            )
+            embeddings.extend(vectors)
+            embedding_scales.extend(scales or [])
+
+            indexed += len(indices)
+            edge_client.emit_event(
+                state.run_id,
+                "info",
+                f"Indexed batch {batch_number}/{len(batches)} ({indexed}/{len(pending)} chunks)",
+            )
 
-        logger.info(f"[{state.run_id}] Indexed {len(state.vector_ids)} vectors")
-        edge_client.emit_event(
-            state.run_id,
-            "info",
-            f"Indexed {len(state.vector_ids)} vectors",
+        removed = _finish_index(state, store, manifest_store)
+        state.embeddings = embeddings
+        state.embedding_scales = embedding_scales
+
+        logger.info(
+            f"[{state.run_id}] Embedded and indexed {indexed} vectors in "
+            f"{len(batches)} batches, removed {removed} stale"
         )
 
     except Exception as e:
-        logger.error(f"[{state.run_id}] Indexing failed: {e}")
-        state.error = f"Indexing failed: {str(e)}"
-        edge_client.emit_event(state.run_id, "error", f"Indexing failed: {e}")
+        logger.error(f"[{state.run_id}] {stage} failed: {e}")
+        state.error = f"{stage} failed: {str(e)}"
+        edge_client.emit_event(state.run_id, "error", f"{stage} failed: {e}")
+
+    finally:
+        stop.set()
+        producer.join()
 
     return state
 
 
-def checks(state: RunState, edge_client: EdgeClient) -> RunState:
+def checks(
+    state: RunState,
+    edge_client: EdgeClient,
+    max_workers: int | None = None,
+    fingerprint_store: FingerprintStore | None = None,
+    day_first: bool = False,
+    r2_client: R2Client | None = None,
+    aggregate: bool = True,
+) -> RunState:
     """
     Run deterministic audit checks.
 
+    Registered checks run concurrently. A failing check is reported and
+    skipped; findings of the other checks are kept in registration order.
+    Per-transaction findings are then aggregated by code, vendor and month,
+    and the evidence behind each summary finding is uploaded to R2 as its
+    own file. A failed evidence upload is reported and leaves that finding
+    without an evidence file; the findings are kept.
+
     Args:
         state: Current run state
         edge_client: Edge client for event emission
+        max_workers: Check pool size (1 runs the checks sequentially)
+        fingerprint_store: Optional per-tenant fingerprint index for cross-run duplicates
+        day_first: Read ambiguous numeric dates as DD/MM
+        r2_client: R2 client for the evidence files (None skips the upload)
+        aggregate: Aggregate per-transaction findings
 
     Returns:
         Updated state with findings
@@ -282,20 +516,44 @@ def checks(state: RunState, edge_client: EdgeClient) -> RunState:
         return state
 
     try:
-        # Extract transactions from text (simple regex-based extraction)
-        # In production, this would be more sophisticated
-        transactions = extract_transactions_from_text(state.raw_text or "")
+        transactions = extract_transactions_from_text(state.raw_text or "", day_first)
         state.txns = transactions
 
-        # Run all checks
-        findings = run_all_checks(state)
-        state.findings = findings
+        table = TxnTable.from_txns(transactions)
+        results = run_registered_checks(state, max_workers, fingerprint_store, table)
+        findings = collect_findings(results)
+
+        aggregation = (
+            aggregate_findings(findings, table)
+            if aggregate
+            else Aggregation(findings, [[f] for f in findings])
+        )
+        state.findings = aggregation.findings
+        if r2_client is not None:
+            state.evidence_r2_keys = _upload_evidence(
+                state, aggregation, table, r2_client, edge_client
+            )
 
-        logger.info(f"[{state.run_id}] Found {len(findings)} issues")
+        for result in results:
+            if result.error:
+                edge_client.emit_event(
+                    state.run_id, "info", f"Check {result.name} failed: {result.error}"
+                )
+        timings = ", ".join(
+            f"{result.name} {result.seconds * 1000:.0f} ms ({len(result.findings)})"
+            for result in results
+        )
+
+        logger.info(f"[{state.run_id}] Found {len(findings)} issues ({timings})")
         edge_client.emit_event(
             state.run_id,
             "info",
-            f"Audit checks complete: {len(findings)} findings",
+            f"Audit checks complete: {len(findings)} findings"
+            + (
+                f" (reported as {len(state.findings)})"
+                if len(state.findings) != len(findings)
+                else ""
+            ),
         )
 
     except Exception as e:
@@ -306,8 +564,48 @@ def checks(state: RunState, edge_client: EdgeClient) -> RunState:
     return state
 
 
+def _upload_evidence(
+    state: RunState,
+    aggregation: Aggregation,
+    table: TxnTable,
+    r2_client: R2Client,
+    edge_client: EdgeClient,
+) -> dict[int, str]:
+    """
+    Upload the evidence of each summary finding to R2.
+
+    Findings standing for a single original finding name their transactions
+    themselves and get no file. A failed upload is logged and reported, and
+    the finding is kept without an evidence file.
+
+    Returns:
+        Evidence file key of each uploaded finding, by position in the findings
+    """
+    keys: dict[int, str] = {}
+    for index, members in enumerate(aggregation.members):
+        if len(members) < 2:
+            continue
+        key = evidence_key(state.tenant_id, state.run_id, index)
+        try:
+            r2_client.upload(
+                key,
+                iter_evidence(members, table),
+                content_type="application/x-ndjson",
+                compression="gzip",
+            )
+        except Exception as e:
+            logger.warning(f"[{state.run_id}] Evidence upload to {key} failed: {e}")
+            edge_client.emit_event(state.run_id, "info", f"Evidence upload failed: {e}")
+            continue
+        keys[index] = key
+    return keys
+
+
 def analyze(
-    state: RunState, gemini_client: GeminiClient, edge_client: EdgeClient
+    state: RunState,
+    gemini_client: GeminiClient,
+    edge_client: EdgeClient,
+    cache: ResponseCache | None = None,
 ) -> RunState:
     """
     Use Gemini to analyze findings and generate summary.
@@ -316,6 +614,7 @@ def analyze(
         state: Current run state
         gemini_client: Gemini client instance
         edge_client: Edge client for event emission
+        cache: Optional response cache keyed on the prompt inputs
 
     Returns:
         Updated state with summary
@@ -327,81 +626,32 @@ def analyze(
         return state
 
     try:
-        # Build audit context for professional report generation
+        # Normalize findings so equivalent runs share a prompt (and a cache key)
+        findings = normalize_findings(state.findings)
         findings_text = "\n".join(
-            [
-                f"- {f['severity'].upper()}: {f['title']} - {f['detail']}"
-                for f in state.findings
-            ]
+            [f"- {f['severity'].upper()}: {f['title']} - {f['detail']}" for f in findings]
         )
+        audit_context = build_audit_context(findings)
+        section_count = len(state.chunk_spans)
+        txn_count = len(state.txns)
 
-        # Determine audit parameters from document analysis
-        audit_context = {
-            "company_name": "Document Entity",  # Could be extracted from document
-            "jurisdiction": "United States",  # Default, could be inferred
-            "entity_type": "Private",  # Default for document audit
-            "listing_status": "Non-issuer",
-            "industry": "General Business",
-            "financial_reporting_framework": "U.S. GAAP",
-            "engagement_type": "External financial statement audit",
-            "period_end": "2024-12-31",  # Could be extracted from document
-            "scope_limitations": len(state.findings) > 0 and any(f.get('severity') == 'high' for f in state.findings),
-            "identified_misstatements": "none" if len(state.findings) == 0 else "material_not_pervasive" if len(state.findings) < 3 else "material_pervasive",
-            "going_concern_uncertainty": any('going concern' in f.get('title', '').lower() for f in state.findings),
-            "key_audit_matters_input": [
-                {"title": f["title"], "why_significant": f["detail"], "how_addressed": "Document review and analysis procedures"}
-                for f in state.findings if f.get('severity') == 'high'
-            ],
-            "other_information_present": False,
-            "legal_regulatory_requirements": [],
-            "auditor_firm_name": "Auditor Agent",
-            "auditor_city_state": "San Francisco, CA",
-            "auditor_partner_name": "AI Auditor",
-            "report_date": "2024-12-31"
-        }
-
-        prompt = f"""SYSTEM:
-You are an expert independent auditor. Your job is to (A) determine the proper auditing STANDARD and OPINION TYPE from the inputs, then (B) return ONE JSON object that fully represents a professional audit report.
-
-Follow these rules:
-1) Determine FIRST:
-   • If the entity is a U.S. public company (issuer) → use PCAOB standards.
-   • If the entity is a U.S. private company (non-issuer) → use U.S. GAAS (AICPA AU-C).
-   • If the engagement is international (non-U.S.) → use ISA (IAASB).
-   • If government audit criteria are explicitly requested in the U.S. → consider GAGAS/Yellow Book in addition to GAAS.
-
-2) Determine OPINION TYPE:
-   • Unmodified/Clean: sufficient appropriate evidence; no material misstatement; no pervasive departure from the framework.
-   • Qualified: material but not pervasive misstatement OR scope limitation.
-   • Adverse: pervasive material misstatement.
-   • Disclaimer: pervasive scope limitation / insufficient evidence to opine.
-
-3) Output ONLY valid JSON (UTF-8). No extra text. No markdown. No commentary.
-
-4) JSON MUST include:
-   • determination (what standard/opinion you chose and why)
-   • report (full report body)
-   • machine_readable_summary_for_automation (flags)
-
-5) Use the following section structure in the report:
-   Title & Addressee, Opinion, Basis for Opinion, (optional) Key Audit Matters, Responsibilities of Management & Governance, Auditor's Responsibilities, (conditional) Emphasis of Matter, (conditional) Other Matter, (conditional) Other Information, (conditional) Legal & Regulatory, Signature/Sign-off.
-
-6) If KAMs are required (e.g., ISA listed entities), populate them. Otherwise mark not applicable.
-
-7) Keep wording professional and compliant with GAAS / PCAOB / ISA conventions. Use the reporting framework (e.g., U.S. GAAP, IFRS) exactly as provided.
-
-USER INPUT (JSON):
-{orjson.dumps(audit_context, option=orjson.OPT_INDENT_2).decode()}
-
-AUDIT FINDINGS FROM DOCUMENT ANALYSIS:
-{findings_text if findings_text else "No significant findings detected."}
+        cache_key = make_cache_key(
+            ANALYZE_PROMPT_VERSION, audit_context, findings, section_count, txn_count
+        )
+        audit_report_json = None
+        if cache and not state.regenerate:
+            audit_report_json = cache.get(cache_key)
 
-Document analyzed: {len(state.chunks)} sections, {len(state.txns)} transactions reviewed.
+        if audit_report_json is None:
+            prompt = build_analyze_prompt(audit_context, findings_text, section_count, txn_count)
 
-OUTPUT ONLY THIS JSON SCHEMA (fill all applicable fields; omit arrays if empty):"""
+            # Call Gemini for professional audit report generation
+            audit_report_json = gemini_client.chat(prompt)
+            if cache and audit_report_json:
+                cache.set(cache_key, audit_report_json)
+        else:
+            logger.info(f"[{state.run_id}] Reusing cached analysis")
 
-        # Call Gemini for professional audit report generation
-        audit_report_json = gemini_client.chat(prompt)
         state.summary = audit_report_json
 
         logger.info(f"[{state.run_id}] Generated analysis summary")
@@ -478,7 +728,7 @@ def persist(state: RunState, edge_client: EdgeClient) -> RunState:
                 severity=finding["severity"],
                 title=finding["title"],
                 detail=finding["detail"],
-                evidence_r2_key=None,
+                evidence_r2_key=state.evidence_r2_keys.get(i),
             )
 
         # Update run status
@@ -507,40 +757,140 @@ def persist(state: RunState, edge_client: EdgeClient) -> RunState:
     return state
 
 
-# Helper functions
+def fail(state: RunState, edge_client: EdgeClient) -> RunState:
+    """
+    Record a failed run: the graph routes here as soon as a node sets an error.
 
+    Only the run status and a final event are written; the nodes after the
+    failure are skipped, so the worker is released right away.
 
-def extract_transactions_from_text(text: str) -> list[Txn]:
-    """
-    Simple transaction extraction from text using regex patterns.
-    In production, this would use more sophisticated parsing.
+    Args:
+        state: Current run state, with error set
+        edge_client: Edge client instance
+
+    Returns:
+        Final state
     """
-    transactions = []
+    logger.info(f"[{state.run_id}] Recording failure: {state.error}")
+    edge_client.update_run_status(state.run_id, "error")
+    edge_client.emit_event(state.run_id, "error", "Audit failed", {"error": state.error})
+    return state
 
-    # Look for dollar amounts with dates
-    # Pattern: date (various formats) ... amount
-    pattern = r"(\d{1,2}[-/]\d{1,2}[-/]\d{2,4}).*?\$?([\d,]+\.\d{2})"
 
-    matches = re.findall(pattern, text)
+# Helper functions
 
-    for i, (date, amount) in enumerate(matches[:100]):  # Limit to 100
-        try:
-            clean_amount = float(amount.replace(",", ""))
-            txn = Txn(
-                id=f"txn_{i}",
-                amount=clean_amount,
-                date=date,
-                memo=None,
-                vendor=None,
-            )
-            transactions.append(txn)
-        except ValueError:
-            continue
 
+def extract_transactions_from_text(text: str, day_first: bool = False) -> list[Txn]:
+    """
+    Extract every date/amount pair in the text as a transaction.
+
+    Args:
+        text: Document text
+        day_first: Read ambiguous numeric dates as DD/MM
+
+    Returns:
+        Transactions in document order
+    """
+    transactions = list(iter_transactions(text, day_first))
     logger.info(f"Extracted {len(transactions)} transactions from text")
     return transactions
 
 
+def normalize_findings(findings: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Reduce findings to the fields used in the analysis prompt, in a canonical order.
+
+    Args:
+        findings: Findings from the deterministic checks
+
+    Returns:
+        Findings with whitespace-trimmed code, severity, title and detail, sorted
+    """
+    normalized = [
+        {
+            "code": str(f.get("code", "")).strip(),
+            "severity": str(f.get("severity", "")).strip().lower(),
+            "title": str(f.get("title", "")).strip(),
+            "detail": str(f.get("detail", "")).strip(),
+        }
+        for f in findings
+    ]
+    normalized.sort(key=lambda f: (f["code"], f["severity"], f["title"], f["detail"]))
+    return normalized
+
+
+def build_audit_context(findings: list[dict[str, Any]]) -> dict[str, Any]:
+    """Determine audit parameters from document analysis."""
+    return {
+        "company_name": "Document Entity",  # Could be extracted from document
+        "jurisdiction": "United States",  # Default, could be inferred
+        "entity_type": "Private",  # Default for document audit
+        "listing_status": "Non-issuer",
+        "industry": "General Business",
+        "financial_reporting_framework": "U.S. GAAP",
+        "engagement_type": "External financial statement audit",
+        "period_end": "2024-12-31",  # Could be extracted from document
+        "scope_limitations": len(findings) > 0 and any(f.get('severity') == 'high' for f in findings),
+        "identified_misstatements": "none" if len(findings) == 0 else "material_not_pervasive" if len(findings) < 3 else "material_pervasive",
+        "going_concern_uncertainty": any('going concern' in f.get('title', '').lower() for f in findings),
+        "key_audit_matters_input": [
+            {"title": f["title"], "why_significant": f["detail"], "how_addressed": "Document review and analysis procedures"}
+            for f in findings if f.get('severity') == 'high'
+        ],
+        "other_information_present": False,
+        "legal_regulatory_requirements": [],
+        "auditor_firm_name": "Auditor Agent",
+        "auditor_city_state": "San Francisco, CA",
+        "auditor_partner_name": "AI Auditor",
+        "report_date": "2024-12-31"
+    }
+
+
+def build_analyze_prompt(
+    audit_context: dict[str, Any], findings_text: str, section_count: int, txn_count: int
+) -> str:
+    """Render the audit report prompt (see ANALYZE_PROMPT_VERSION)."""
+    return f"""SYSTEM:
+You are an expert independent auditor. Your job is to (A) determine the proper auditing STANDARD and OPINION TYPE from the inputs, then (B) return ONE JSON object that fully represents a professional audit report.
+
+Follow these rules:
+1) Determine FIRST:
+   • If the entity is a U.S. public company (issuer) → use PCAOB standards.
+   • If the entity is a U.S. private company (non-issuer) → use U.S. GAAS (AICPA AU-C).
+   • If the engagement is international (non-U.S.) → use ISA (IAASB).
+   • If government audit criteria are explicitly requested in the U.S. → consider GAGAS/Yellow Book in addition to GAAS.
+
+2) Determine OPINION TYPE:
+   • Unmodified/Clean: sufficient appropriate evidence; no material misstatement; no pervasive departure from the framework.
+   • Qualified: material but not pervasive misstatement OR scope limitation.
+   • Adverse: pervasive material misstatement.
+   • Disclaimer: pervasive scope limitation / insufficient evidence to opine.
+
+3) Output ONLY valid JSON (UTF-8). No extra text. No markdown. No commentary.
+
+4) JSON MUST include:
+   • determination (what standard/opinion you chose and why)
+   • report (full report body)
+   • machine_readable_summary_for_automation (flags)
+
+5) Use the following section structure in the report:
+   Title & Addressee, Opinion, Basis for Opinion, (optional) Key Audit Matters, Responsibilities of Management & Governance, Auditor's Responsibilities, (conditional) Emphasis of Matter, (conditional) Other Matter, (conditional) Other Information, (conditional) Legal & Regulatory, Signature/Sign-off.
+
+6) If KAMs are required (e.g., ISA listed entities), populate them. Otherwise mark not applicable.
+
+7) Keep wording professional and compliant with GAAS / PCAOB / ISA conventions. Use the reporting framework (e.g., U.S. GAAP, IFRS) exactly as provided.
+
+USER INPUT (JSON):
+{orjson.dumps(audit_context, option=orjson.OPT_INDENT_2).decode()}
+
+AUDIT FINDINGS FROM DOCUMENT ANALYSIS:
+{findings_text if findings_text else "No significant findings detected."}
+
+Document analyzed: {section_count} sections, {txn_count} transactions reviewed.
+
+OUTPUT ONLY THIS JSON SCHEMA (fill all applicable fields; omit arrays if empty):"""
+
+
 def generate_markdown_report(state: RunState) -> str:
     """Generate a Markdown audit report from JSON audit report."""
     try:
@@ -0,0 +1,165 @@
+"""Incremental re-audit: chunk fingerprints and per-lineage vector manifests."""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass, field
+
+import orjson
+from botocore.exceptions import ClientError
+
+from .r2 import R2Client
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_chunk(text: str) -> str:
+    """
+    Content hash of a chunk, insensitive to whitespace differences.
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        Hex-encoded SHA-256 digest (32 chars)
+    """
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def vector_id_for(tenant_id: str, lineage: str, fingerprint: str) -> str:
+    """
+    Content-addressed vector ID for a chunk within a tenant's document lineage.
+
+    Hashed to stay within Vectorize's 64-byte ID limit regardless of tenant
+    and filename length.
+    """
+    digest = hashlib.sha256(f"{tenant_id}|{lineage}|{fingerprint}".encode()).hexdigest()
+    return f"ch:{digest[:32]}"
+
+
+@dataclass
+class ChunkManifest:
+    """Vectors indexed for the latest run of a document lineage."""
+
+    tenant_id: str
+    lineage: str
+    run_id: str
+    # fingerprint -> vector ID
+    vectors: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class IncrementalPlan:
+    """Which chunks need embedding, and which vectors are no longer referenced."""
+
+    vector_ids: list[str]
+    pending: list[int]
+    stale_vector_ids: list[str]
+    reused: int
+
+
+def plan_incremental(
+    fingerprints: list[str],
+    tenant_id: str,
+    lineage: str,
+    previous: ChunkManifest | None,
+) -> IncrementalPlan:
+    """
+    Compare chunk fingerprints with the previous run of the same lineage.
+
+    Chunks whose fingerprint was indexed before keep their vector; the first
+    occurrence of every other fingerprint is queued for embedding. Previously
+    indexed vectors whose fingerprint no longer occurs are stale.
+
+    Args:
+        fingerprints: Fingerprint of each chunk, in chunk order
+        tenant_id: Tenant identifier
+        lineage: Document lineage id
+        previous: Manifest of the previous run, if any
+
+    Returns:
+        IncrementalPlan with a vector ID per chunk
+    """
+    known = previous.vectors if previous else {}
+    vector_ids = []
+    pending = []
+    queued = set()
+    reused = set()
+
+    for i, fp in enumerate(fingerprints):
+        if fp in known:
+            vector_ids.append(known[fp])
+            reused.add(fp)
+            continue
+
+        vector_ids.append(vector_id_for(tenant_id, lineage, fp))
+        if fp not in queued:
+            queued.add(fp)
+            pending.append(i)
+
+    current = set(fingerprints)
+    stale = [vid for fp, vid in known.items() if fp not in current]
+    return IncrementalPlan(vector_ids, pending, stale, reused=len(reused))
+
+
+class ManifestStore:
+    """Stores chunk manifests in R2, one object per tenant and lineage."""
+
+    def __init__(self, r2_client: R2Client):
+        self.r2_client = r2_client
+
+    @staticmethod
+    def key(tenant_id: str, lineage: str) -> str:
+        """R2 key of the manifest for a lineage."""
+        lineage_hash = hashlib.sha256(lineage.encode()).hexdigest()[:16]
+        return f"manifests/{tenant_id}/{lineage_hash}.json"
+
+    def load(self, tenant_id: str, lineage: str) -> ChunkManifest | None:
+        """
+        Load the manifest of the previous run, if one exists.
+
+        Args:
+            tenant_id: Tenant identifier
+            lineage: Document lineage id
+
+        Returns:
+            ChunkManifest, or None for a first run
+        """
+        try:
+            data = orjson.loads(self.r2_client.get_object(self.key(tenant_id, lineage)))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+
+        return ChunkManifest(
+            tenant_id=data["tenant_id"],
+            lineage=data["lineage"],
+            run_id=data["run_id"],
+            vectors=data.get("vectors", {}),
+        )
+
+    def save(self, manifest: ChunkManifest) -> str:
+        """
+        Persist a manifest, replacing the previous run's.
+
+        Args:
+            manifest: Manifest for the current run
+
+        Returns:
+            R2 key of the manifest
+        """
+        payload = {
+            "tenant_id": manifest.tenant_id,
+            "lineage": manifest.lineage,
+            "run_id": manifest.run_id,
+            "vectors": manifest.vectors,
+        }
+        return self.r2_client.put_object(
+            self.key(manifest.tenant_id, manifest.lineage),
+            orjson.dumps(payload),
+            content_type="application/json",
+        )
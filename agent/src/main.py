@@ -76,6 +76,7 @@ def build_state_from_job(job) -> RunState:
         run_id=job.run_id,
         tenant_id=job.tenant_id,
         r2_key=job.r2_key,
+        lineage_id=job.lineage_id,
     )
 
 
@@ -1,22 +1,95 @@
 """R2 storage client using boto3 S3 API."""
 
 import logging
-from typing import BinaryIO
+import re
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, BinaryIO
 
 import boto3
 from botocore.exceptions import ClientError
 
+from .blob import Blob
+from .cache import BlobCache
 from .config import Config
+from .tracing import current_span, in_context, span, traced
 
 logger = logging.getLogger(__name__)
 
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+# Error codes botocore reports for a 304 answer to If-None-Match
+_NOT_MODIFIED = frozenset({"304", "NotModified"})
+
+# Bytes read per call from file objects passed to upload()
+_READ_SIZE = 1024 * 1024
+
+UploadData = bytes | str | BinaryIO | Iterable[bytes | str]
+
+
+def _iter_bytes(data: UploadData) -> Iterator[bytes]:
+    """Upload data as a stream of byte chunks."""
+    if isinstance(data, str):
+        yield data.encode("utf-8")
+    elif isinstance(data, bytes | bytearray | memoryview):
+        yield bytes(data)
+    elif hasattr(data, "read"):
+        while chunk := data.read(_READ_SIZE):
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+    else:
+        for chunk in data:
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+def _compressor(encoding: str) -> Any:
+    """Streaming compressor (compress/flush) for a Content-Encoding."""
+    if encoding == "gzip":
+        # wbits 31: deflate with a gzip header and trailer
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if encoding == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd uploads require the zstandard package (poetry install -E zstd)"
+            ) from e
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def _compress(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    compressor = _compressor(encoding)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def _split(chunks: Iterable[bytes], part_size: int) -> Iterator[bytes]:
+    """Regroup chunks into parts of exactly part_size bytes (the last may be shorter)."""
+    buffer = bytearray()
+    emitted = False
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+            emitted = True
+    if buffer or not emitted:
+        yield bytes(buffer)
+
 
 class R2Client:
     """Client for Cloudflare R2 storage."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, cache: BlobCache | None = None):
         self.config = config
         self.bucket = config.r2_bucket
+        # Worker-local copies of downloaded objects, revalidated by ETag
+        self.cache = cache
 
         # Initialize S3 client configured for R2
         self.s3 = boto3.client(
@@ -27,6 +100,17 @@ class R2Client:
             region_name="auto",  # R2 uses 'auto' region
         )
 
+    def _call(self, operation: str, **params: Any) -> dict:
+        """Call an S3 operation on the bucket in a span with its bytes and attempts."""
+        with span(f"r2.{operation}", key=params.get("Key"), range=params.get("Range")) as call:
+            response = getattr(self.s3, operation)(Bucket=self.bucket, **params)
+            retries = response.get("ResponseMetadata", {}).get("RetryAttempts")
+            call.set(
+                bytes=len(params["Body"]) if "Body" in params else response.get("ContentLength"),
+                attempts=retries + 1 if retries is not None else None,
+            )
+        return response
+
     def get_object(self, key: str) -> bytes:
         """
         Download an object from R2.
@@ -42,7 +126,7 @@ class R2Client:
         """
         try:
             logger.info(f"Downloading object: {key}")
-            response = self.s3.get_object(Bucket=self.bucket, Key=key)
+            response = self._call("get_object", Key=key)
             data = response["Body"].read()
             logger.info(f"Downloaded {len(data)} bytes from {key}")
             return data
@@ -50,6 +134,128 @@ class R2Client:
             logger.error(f"Failed to download {key}: {e}")
             raise
 
+    @traced("r2.download")
+    def download(
+        self,
+        key: str,
+        part_size: int | None = None,
+        max_workers: int | None = None,
+        spool_max_bytes: int | None = None,
+    ) -> Blob:
+        """
+        Download an object into a Blob, in parallel ranges for large objects.
+
+        The first request is a ranged GET for the first part; its response
+        carries the total size, content type, ETag and user metadata, so no
+        separate HEAD is needed. Remaining parts are fetched concurrently,
+        conditional on the same ETag, and written in place.
+
+        With a cache, the first GET carries the cached ETag as If-None-Match:
+        a 304 answer is served from disk, and a fresh download is cached.
+
+        Args:
+            key: Object key in the bucket
+            part_size: Bytes per ranged GET (default R2_PART_SIZE)
+            max_workers: Concurrent ranged GETs (default R2_DOWNLOAD_WORKERS)
+            spool_max_bytes: Largest object held in memory rather than a
+                memory-mapped temporary file (default R2_SPOOL_MAX_BYTES)
+
+        Returns:
+            Blob with the contents and metadata; close it when done
+
+        Raises:
+            ClientError: If a request fails (including the object changing mid-download)
+        """
+        part_size = part_size or self.config.r2_part_size
+        max_workers = max_workers or self.config.r2_download_workers
+        if spool_max_bytes is None:
+            spool_max_bytes = self.config.r2_spool_max_bytes
+
+        logger.info(f"Downloading object: {key}")
+        entry = self.cache.lookup(key) if self.cache is not None else None
+        try:
+            try:
+                first = self._get_first(key, part_size, entry["etag"] if entry else None)
+            except ClientError as e:
+                if (
+                    self.cache is None
+                    or entry is None
+                    or e.response.get("Error", {}).get("Code") not in _NOT_MODIFIED
+                ):
+                    raise
+                blob = self.cache.open(key, entry, spool_max_bytes)
+                if blob is not None:
+                    logger.info(f"{key} not modified; {len(blob)} bytes served from cache")
+                    current_span().set(key=key, bytes=len(blob), cache="hit")
+                    return blob
+                # Evicted since the lookup
+                first = self._get_first(key, part_size, None)
+        except ClientError as e:
+            logger.error(f"Failed to download {key}: {e}")
+            raise
+
+        match = _CONTENT_RANGE.fullmatch(first.get("ContentRange") or "")
+        size = int(match.group(3)) if match else int(first["ContentLength"])
+        etag = first.get("ETag")
+        blob = Blob(
+            size,
+            content_type=first.get("ContentType"),
+            etag=etag,
+            metadata=first.get("Metadata", {}),
+            spool_max_bytes=spool_max_bytes,
+        )
+        try:
+            blob.fill(0, first["Body"], int(first["ContentLength"]))
+            ranges = [
+                (start, min(start + part_size, size) - 1)
+                for start in range(int(first["ContentLength"]), size, part_size)
+            ]
+            if ranges:
+                with ThreadPoolExecutor(
+                    max_workers=min(max_workers, len(ranges)), thread_name_prefix="r2-get"
+                ) as pool:
+                    for future in [
+                        pool.submit(in_context(self._fetch_range), key, start, end, etag, blob)
+                        for start, end in ranges
+                    ]:
+                        future.result()
+        except Exception as e:
+            blob.close()
+            logger.error(f"Failed to download {key}: {e}")
+            raise
+
+        logger.info(
+            f"Downloaded {size} bytes from {key} in {len(ranges) + 1} request(s)"
+            f"{' to a spooled file' if blob.spooled else ''}"
+        )
+        current_span().set(
+            key=key,
+            bytes=size,
+            requests=len(ranges) + 1,
+            spooled=blob.spooled,
+            cache="miss" if self.cache is not None else None,
+        )
+        if self.cache is not None:
+            self.cache.store(key, blob)
+        return blob
+
+    def _get_first(self, key: str, part_size: int, if_none_match: str | None) -> dict:
+        """GET the first part of an object, or all of it if it is empty."""
+        extra_args = {"IfNoneMatch": if_none_match} if if_none_match else {}
+        try:
+            return self._call("get_object", Key=key, Range=f"bytes=0-{part_size - 1}", **extra_args)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "InvalidRange":
+                raise
+            # Empty objects cannot satisfy any range
+            return self._call("get_object", Key=key, **extra_args)
+
+    def _fetch_range(self, key: str, start: int, end: int, etag: str | None, blob: Blob) -> None:
+        """GET bytes start..end (inclusive) into the blob."""
+        extra_args = {"IfMatch": etag} if etag else {}
+        response = self._call("get_object", Key=key, Range=f"bytes={start}-{end}", **extra_args)
+        blob.fill(start, response["Body"], end - start + 1)
+
     def get_object_metadata(self, key: str) -> dict:
         """
         Get object metadata without downloading content.
@@ -61,7 +267,7 @@ class R2Client:
             Metadata dictionary
         """
         try:
-            response = self.s3.head_object(Bucket=self.bucket, Key=key)
+            response = self._call("head_object", Key=key)
             return {
                 "content_type": response.get("ContentType"),
                 "content_length": response.get("ContentLength"),
@@ -94,7 +300,7 @@ class R2Client:
         try:
             logger.info(f"Uploading object: {key}")
 
-            extra_args = {}
+            extra_args: dict[str, Any] = {}
             if content_type:
                 extra_args["ContentType"] = content_type
             if metadata:
@@ -103,7 +309,7 @@ class R2Client:
             if isinstance(data, str):
                 data = data.encode("utf-8")
 
-            self.s3.put_object(Bucket=self.bucket, Key=key, Body=data, **extra_args)
+            self._call("put_object", Key=key, Body=data, **extra_args)
 
             logger.info(f"Uploaded object: {key}")
             return key
@@ -111,6 +317,114 @@ class R2Client:
             logger.error(f"Failed to upload {key}: {e}")
             raise
 
+    @traced("r2.upload")
+    def upload(
+        self,
+        key: str,
+        data: UploadData,
+        content_type: str | None = None,
+        metadata: dict | None = None,
+        compression: str | None = None,
+        part_size: int | None = None,
+        max_workers: int | None = None,
+    ) -> str:
+        """
+        Upload an object from a stream, compressing it on the fly.
+
+        data may be bytes, a str, a binary file object or an iterable of
+        bytes/str chunks (e.g. a generator), and is consumed incrementally.
+        An object that fits in one part is sent with a single PUT; larger ones
+        as a multipart upload of equal-sized parts, with up to max_workers
+        parts in flight, so memory is bounded by the parts in flight rather
+        than the object. Failed multipart uploads are aborted.
+
+        Args:
+            key: Object key (destination path)
+            data: Data to upload
+            content_type: MIME type of the uncompressed data
+            metadata: Additional metadata
+            compression: "gzip" or "zstd" to compress and set Content-Encoding
+            part_size: Bytes per part (default R2_PART_SIZE; R2 requires at least 5 MiB)
+            max_workers: Parts uploaded concurrently (default R2_UPLOAD_WORKERS)
+
+        Returns:
+            Object key
+
+        Raises:
+            ClientError: If the upload fails
+            ValueError: If the compression is not supported
+        """
+        part_size = part_size or self.config.r2_part_size
+        max_workers = max_workers or self.config.r2_upload_workers
+
+        extra_args: dict[str, Any] = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        if metadata:
+            extra_args["Metadata"] = metadata
+        chunks = _iter_bytes(data)
+        if compression:
+            extra_args["ContentEncoding"] = compression
+            chunks = _compress(chunks, compression)
+
+        logger.info(f"Uploading object: {key}")
+        parts = _split(chunks, part_size)
+        first = next(parts)
+        second = next(parts, None)
+        if second is None:
+            try:
+                self._call("put_object", Key=key, Body=first, **extra_args)
+            except ClientError as e:
+                logger.error(f"Failed to upload {key}: {e}")
+                raise
+            logger.info(f"Uploaded object: {key} ({len(first)} bytes)")
+            current_span().set(key=key, bytes=len(first), parts=1, compression=compression)
+            return key
+
+        upload_id = self._call("create_multipart_upload", Key=key, **extra_args)["UploadId"]
+        try:
+            etags, size = [], 0
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="r2-put") as pool:
+                in_flight: deque = deque()
+                for number, body in enumerate(chain([first, second], parts), start=1):
+                    if len(in_flight) >= max_workers:
+                        etags.append(in_flight.popleft().result())
+                    in_flight.append(
+                        pool.submit(in_context(self._upload_part), key, upload_id, number, body)
+                    )
+                    size += len(body)
+                etags.extend(future.result() for future in in_flight)
+            self._call(
+                "complete_multipart_upload",
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": number, "ETag": etag}
+                        for number, etag in enumerate(etags, start=1)
+                    ]
+                },
+            )
+        except Exception as e:
+            logger.error(f"Failed to upload {key}: {e}")
+            try:
+                self._call("abort_multipart_upload", Key=key, UploadId=upload_id)
+            except ClientError as abort_error:
+                logger.warning(f"Failed to abort upload of {key}: {abort_error}")
+            raise
+
+        logger.info(f"Uploaded object: {key} ({size} bytes in {len(etags)} parts)")
+        current_span().set(key=key, bytes=size, parts=len(etags), compression=compression)
+        return key
+
+    def _upload_part(self, key: str, upload_id: str, number: int, body: bytes) -> str:
+        """Upload one part, returning its ETag."""
+        response = self._call(
+            "upload_part", Key=key, UploadId=upload_id, PartNumber=number, Body=body
+        )
+        etag: str = response["ETag"]
+        return etag
+
     def delete_object(self, key: str) -> bool:
         """
         Delete an object from R2.
@@ -123,7 +437,7 @@ class R2Client:
         """
         try:
             logger.info(f"Deleting object: {key}")
-            self.s3.delete_object(Bucket=self.bucket, Key=key)
+            self._call("delete_object", Key=key)
             return True
         except ClientError as e:
             logger.error(f"Failed to delete {key}: {e}")
@@ -140,8 +454,7 @@ class R2Client:
             True if exists, False otherwise
         """
         try:
-            self.s3.head_object(Bucket=self.bucket, Key=key)
+            self._call("head_object", Key=key)
             return True
         except ClientError:
             return False
-
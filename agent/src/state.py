@@ -1,21 +1,167 @@
 """State model for the audit pipeline."""
 
-from typing import Any
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Annotated, Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, GetCoreSchemaHandler, TypeAdapter
+from pydantic_core import core_schema
 
+from .artifacts import ArtifactRef
+from .blob import Blob
+from .chunking import ChunkView
 
-class Txn(BaseModel):
-    """Transaction model."""
+
+@dataclass(slots=True)
+class Txn:
+    """
+    Transaction record.
+
+    A slotted dataclass rather than a model: extraction creates one per
+    statement line, and construction skips validation. Records from
+    untrusted sources are validated in bulk with validate_txns, and
+    RunState accepts existing records without re-validating them.
+    """
 
     id: str
     amount: float
     date: str
+    # Canonical ISO (YYYY-MM-DD) form of date, set at extraction; None if unparseable
+    iso_date: str | None = None
     memo: str | None = None
     vendor: str | None = None
     account: str | None = None
 
 
+_TXN_LIST = TypeAdapter(list[Txn])
+
+
+def validate_txns(records: Iterable[Txn | Mapping[str, Any]]) -> list[Txn]:
+    """
+    Validate and coerce transaction records in one pass.
+
+    Args:
+        records: Txn records or mappings with Txn fields
+
+    Returns:
+        Transactions
+
+    Raises:
+        pydantic.ValidationError: If any record is invalid
+    """
+    return _TXN_LIST.validate_python(list(records))
+
+
+class Finding(Mapping[str, Any]):
+    """
+    Audit finding with a lazily rendered detail.
+
+    Checks may emit many findings, most of which are only counted, so the
+    human-readable detail is kept as a str.format template plus its values
+    and rendered (once) on first access. List values are joined with ", ".
+    Without values the detail is used verbatim.
+
+    Findings are read-only mappings with the keys code, severity, title,
+    detail and transaction_ids, so code written for finding dicts works
+    unchanged, and RunState accepts either form.
+    """
+
+    __slots__ = ("code", "severity", "title", "transaction_ids", "_template", "_values", "_detail")
+
+    KEYS = ("code", "severity", "title", "detail", "transaction_ids")
+
+    def __init__(
+        self,
+        code: str,
+        severity: str,
+        title: str,
+        detail: str = "",
+        transaction_ids: list[str] | None = None,
+        **values: Any,
+    ):
+        self.code = code
+        self.severity = severity
+        self.title = title
+        self.transaction_ids = transaction_ids if transaction_ids is not None else []
+        self._template = detail
+        self._values = values
+        self._detail = None if values else detail
+
+    @property
+    def detail(self) -> str:
+        """Human-readable detail, rendered on first access."""
+        if self._detail is None:
+            self._detail = self._template.format_map(
+                {
+                    name: ", ".join(map(str, value)) if isinstance(value, list) else value
+                    for name, value in self._values.items()
+                }
+            )
+        return self._detail
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "Finding":
+        """Finding from a finding dict (missing fields default to empty)."""
+        return cls(
+            code=str(data.get("code", "")),
+            severity=str(data.get("severity", "")),
+            title=str(data.get("title", "")),
+            detail=str(data.get("detail", "")),
+            transaction_ids=list(data.get("transaction_ids") or []),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dict with the detail rendered."""
+        return {key: self[key] for key in self.KEYS}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"Finding(code={self.code!r}, severity={self.severity!r}, title={self.title!r})"
+
+    @classmethod
+    def _validate(cls, value: Any) -> "Finding":
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, Mapping):
+            return cls.from_mapping(value)
+        raise ValueError(f"Expected a Finding or a mapping, got {type(value).__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(cls.to_dict),
+        )
+
+
+def merge_errors(left: str | None, right: str | None) -> str | None:
+    """Combine errors reported by parallel graph branches."""
+    if left is None or left == right:
+        return right
+    if right is None:
+        return left
+    return f"{left}; {right}"
+
+
+def merge_artifacts(
+    left: dict[str, ArtifactRef], right: dict[str, ArtifactRef]
+) -> dict[str, ArtifactRef]:
+    """Combine artifact references added by parallel graph branches."""
+    return {**left, **right}
+
+
 class RunState(BaseModel):
     """State for a single audit run."""
 
@@ -23,14 +169,36 @@ class RunState(BaseModel):
     tenant_id: str
     r2_key: str
     mime_type: str | None = None
-    file_bytes: bytes | None = None
+    # Downloaded document, held by reference until text extraction closes it
+    file_blob: Blob | None = None
     raw_text: str | None = None
-    chunks: list[str] = Field(default_factory=list)
-    embeddings: list[list[float]] = Field(default_factory=list)
+    # Groups revisions of one document, from the job; incremental re-audits need it
+    lineage_id: str | None = None
+    chunk_spans: list[tuple[int, int]] = Field(default_factory=list)
+    # Index of each chunk's near-duplicate representative; empty means no dedupe
+    chunk_representatives: list[int] = Field(default_factory=list)
+    chunk_hashes: list[str] = Field(default_factory=list)
+    # Chunk indices to embed and upsert; None means every chunk
+    pending_chunks: list[int] | None = None
+    # One entry per pending chunk
+    embeddings: list[list[float] | list[int]] = Field(default_factory=list)
+    embedding_scales: list[float] = Field(default_factory=list)
+    # One entry per chunk; chunks with identical content share an ID
     vector_ids: list[str] = Field(default_factory=list)
+    stale_vector_ids: list[str] = Field(default_factory=list)
     txns: list[Txn] = Field(default_factory=list)
-    findings: list[dict[str, Any]] = Field(default_factory=list)
+    findings: list[Finding] = Field(default_factory=list)
     summary: str | None = None
     report_r2_key: str | None = None
-    error: str | None = None
+    # Evidence file of each summary finding, by position in findings (JSON Lines)
+    evidence_r2_keys: dict[int, str] = Field(default_factory=dict)
+    regenerate: bool = False
+    # Parallel branches may both fail; their errors are combined at the join
+    error: Annotated[str | None, merge_errors] = None
+    # Large fields held in the run's artifact store between graph nodes, by field name
+    artifacts: Annotated[dict[str, ArtifactRef], merge_artifacts] = Field(default_factory=dict)
 
+    @property
+    def chunks(self) -> ChunkView:
+        """Chunk texts, sliced lazily from raw_text by chunk_spans."""
+        return ChunkView(self.raw_text or "", self.chunk_spans)
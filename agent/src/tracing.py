@@ -0,0 +1,355 @@
+"""Per-run tracing spans, exported as JSON lines or to an OTLP/HTTP collector."""
+
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Protocol, TypeVar
+
+import httpx
+import orjson
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Gemini usageMetadata fields recorded on LLM spans, by span attribute
+_USAGE_FIELDS = {
+    "prompt_tokens": "promptTokenCount",
+    "output_tokens": "candidatesTokenCount",
+    "thoughts_tokens": "thoughtsTokenCount",
+    "cached_tokens": "cachedContentTokenCount",
+    "total_tokens": "totalTokenCount",
+}
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed operation within a run, with its attributes."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    # Run the span belongs to, inherited from its parent
+    run_id: str | None
+    start_ns: int
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration in milliseconds (up to now, if the span is still open)."""
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set(self, **attributes: Any) -> None:
+        """Set attributes, skipping None values."""
+        self.attributes.update(
+            (key, value) for key, value in attributes.items() if value is not None
+        )
+
+    def add(self, key: str, amount: int | float) -> None:
+        """Add to a numeric attribute (e.g. bytes over several calls)."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form, as written by JsonlExporter."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "run_id": self.run_id,
+            "start": datetime.fromtimestamp(self.start_ns / 1e9, UTC).isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class SpanExporter(Protocol):
+    """Destination for finished spans."""
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Export the spans of one trace."""
+        ...
+
+
+class JsonlExporter:
+    """Appends spans as JSON lines to one file per UTC day in a directory."""
+
+    def __init__(self, trace_dir: str | Path):
+        self.trace_dir = Path(trace_dir)
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """
+        Append spans to today's file.
+
+        Args:
+            spans: Finished spans
+        """
+        day = datetime.now(UTC).strftime("%Y-%m-%d")
+        lines = b"".join(
+            orjson.dumps(span.to_dict(), option=orjson.OPT_APPEND_NEWLINE, default=str)
+            for span in spans
+        )
+        with self._lock, open(self.trace_dir / f"spans-{day}.jsonl", "ab") as f:
+            f.write(lines)
+
+
+class OtlpExporter:
+    """Posts spans to an OpenTelemetry collector using OTLP/HTTP with JSON encoding."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "auditor-agent",
+        client: httpx.Client | None = None,
+    ):
+        self.url = f"{endpoint.rstrip('/')}/v1/traces"
+        self.service_name = service_name
+        self.client = client or httpx.Client(timeout=5.0)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """
+        Send spans to the collector; failures are logged, never raised.
+
+        Args:
+            spans: Finished spans
+        """
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": self.service_name})
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": __name__}, "spans": [_otlp_span(s) for s in spans]}
+                    ],
+                }
+            ]
+        }
+        try:
+            response = self.client.post(
+                self.url,
+                headers={"Content-Type": "application/json"},
+                content=orjson.dumps(payload),
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to export {len(spans)} spans: {e}")
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, list | tuple):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Mapping[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _otlp_span(span: Span) -> dict[str, Any]:
+    attributes = dict(span.attributes)
+    if span.run_id is not None:
+        attributes["run_id"] = span.run_id
+    otlp = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        # SPAN_KIND_INTERNAL
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _otlp_attributes(attributes),
+        # STATUS_CODE_ERROR / STATUS_CODE_OK
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id is not None:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+class Tracer:
+    """
+    Creates spans and exports each trace once its root span ends.
+
+    The active span is tracked in a context variable, so spans opened while
+    another is active become its children. Threads do not inherit it:
+    work handed to a thread is wrapped with in_context. Without an
+    exporter spans are still timed but not kept.
+    """
+
+    def __init__(self, exporter: SpanExporter | None = None):
+        self.exporter = exporter
+        self._pending: dict[str, list[Span]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, run_id: str | None = None, **attributes: Any) -> Iterator[Span]:
+        """
+        Time a block as a child of the active span (or as a new trace).
+
+        An exception leaving the block is recorded as the span's error and
+        re-raised.
+
+        Args:
+            name: Span name
+            run_id: Run the span belongs to (default: the parent's)
+            attributes: Initial attributes
+
+        Yields:
+            The span, for adding attributes
+        """
+        parent = _current.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            run_id=run_id if run_id is not None or parent is None else parent.run_id,
+            start_ns=time.time_ns(),
+        )
+        span.set(**attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current.reset(token)
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        if self.exporter is None:
+            return
+        with self._lock:
+            spans = self._pending.setdefault(span.trace_id, [])
+            spans.append(span)
+            if span.parent_id is not None:
+                return
+            del self._pending[span.trace_id]
+        try:
+            self.exporter.export(spans)
+        except Exception as e:
+            logger.warning(f"Failed to export trace {span.trace_id}: {e}")
+
+
+_current: contextvars.ContextVar[Span | None] = contextvars.ContextVar("span", default=None)
+_tracer = Tracer()
+
+
+def configure_tracing(config: Config) -> Tracer:
+    """
+    Set the process-wide tracer from the configuration.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        The tracer
+    """
+    global _tracer
+    if config.trace_exporter == "jsonl":
+        exporter: SpanExporter | None = JsonlExporter(config.trace_dir)
+    elif config.trace_exporter == "otlp":
+        exporter = OtlpExporter(config.otlp_endpoint)
+    elif config.trace_exporter == "none":
+        exporter = None
+    else:
+        raise ValueError(f"Unsupported trace exporter: {config.trace_exporter}")
+    _tracer = Tracer(exporter)
+    return _tracer
+
+
+def span(name: str, run_id: str | None = None, **attributes: Any) -> Any:
+    """Open a span on the process-wide tracer (see Tracer.span)."""
+    return _tracer.span(name, run_id, **attributes)
+
+
+def current_span() -> Span:
+    """
+    The active span.
+
+    Outside any span a detached span is returned, so callers can set
+    attributes unconditionally.
+    """
+    return _current.get() or Span("detached", "", "", None, None, 0)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """
+    Decorator running a function inside a span.
+
+    Args:
+        name: Span name
+
+    Returns:
+        Decorator
+    """
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def in_context(func: F) -> F:
+    """
+    Bind a function to the current context, for running it in another thread.
+
+    Spans it opens become children of the span active here. Each returned
+    function may only be running once at a time.
+
+    Args:
+        func: Function to bind
+
+    Returns:
+        Function running func in a copy of the current context
+    """
+    return functools.partial(contextvars.copy_context().run, func)  # type: ignore[return-value]
+
+
+def record_attempt(retry_state: Any) -> None:
+    """Tenacity before-hook recording the attempt number on the active span."""
+    current_span().set(attempts=retry_state.attempt_number)
+
+
+def record_usage(usage: Mapping[str, Any] | None) -> None:
+    """
+    Record Gemini token counts (a response's usageMetadata) on the active span.
+
+    Args:
+        usage: usageMetadata of a Gemini response
+    """
+    for attribute, key in _USAGE_FIELDS.items():
+        if usage and key in usage:
+            current_span().add(attribute, usage[key])
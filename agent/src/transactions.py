@@ -0,0 +1,91 @@
+"""Streaming extraction of transactions from document text."""
+
+import re
+from collections.abc import Iterator
+
+from .dates import normalize_date
+from .state import Txn
+
+# MM/DD/YYYY-style dates (the historical format) and ISO YYYY-MM-DD
+DATE_PATTERN = r"(?<!\d)(?:\d{4}-\d{1,2}-\d{1,2}|\d{1,2}[-/]\d{1,2}[-/]\d{2,4})(?!\d)"
+
+# Amount with cents and an optional $ sign. It is negative with a "-" directly before
+# the digits or "$" (a spaced dash is a separator, as in "Acme Corp - $10.00"), or
+# when enclosed in parentheses; an unmatched "(" is ignored.
+AMOUNT_PATTERN = (
+    r"(?:(?P<sign>-)|(?P<paren>\())?\$?(?<![\d,.])(?P<value>\d[\d,]*\.\d{2})(?(paren)\))(?!\d)"
+)
+
+# Characters allowed between a date and its amount
+MAX_GAP = 200
+
+# A date, then the first amount after it on the same line within MAX_GAP characters.
+# The bounded, newline-free gap keeps each match attempt O(MAX_GAP), so a
+# scan over the whole text is linear even on long lines without amounts.
+TRANSACTION_PATTERN = re.compile(
+    rf"(?P<date>{DATE_PATTERN})(?P<description>[^\n]{{0,{MAX_GAP}}}?){AMOUNT_PATTERN}"
+)
+
+# "Payment to Acme Corp", "Refund from Beta Inc", "Charge at Cafe Luna"
+_COUNTERPARTY = re.compile(
+    r"\b(?:to|from|at|by)\s+(?P<name>[A-Z0-9][\w&.'-]*(?:\s+[A-Z0-9&][\w&.'-]*)*)"
+)
+
+# Table columns separated by tabs, pipes or runs of spaces
+_COLUMN_SPLIT = re.compile(r"\s*(?:\t|\||\s{2,})\s*")
+
+_STRIP = " \t-–—|:;,."
+
+MAX_VENDOR_LENGTH = 60
+
+
+def _describe(description: str) -> tuple[str | None, str | None]:
+    """Split the text between a date and its amount into (vendor, memo)."""
+    description = description.strip(_STRIP)
+    if not description:
+        return None, None
+
+    columns = [c for c in _COLUMN_SPLIT.split(description) if c.strip(_STRIP)]
+    if len(columns) > 1:
+        vendor = columns[0].strip(_STRIP)
+        memo = " ".join(c.strip(_STRIP) for c in columns[1:])
+        return vendor[:MAX_VENDOR_LENGTH] or None, memo or None
+
+    match = _COUNTERPARTY.search(description)
+    if match:
+        return match.group("name").strip(_STRIP)[:MAX_VENDOR_LENGTH] or None, description
+
+    return None, description
+
+
+def iter_transactions(text: str, day_first: bool = False) -> Iterator[Txn]:
+    """
+    Lazily extract transactions from text, one date/amount pair at a time.
+
+    Each date is paired with the first amount after it on the same line. The
+    text in between supplies the vendor and memo: for tabular rows the first
+    column is the vendor and the rest the memo; in prose the name after "to",
+    "from", "at" or "by" is the vendor and the whole description the memo.
+    Dates are normalized to ISO form once here (iso_date) for every check.
+
+    Args:
+        text: Document text
+        day_first: Read ambiguous numeric dates as DD/MM
+
+    Yields:
+        Transactions with sequential IDs txn_0, txn_1, ...
+    """
+    for i, match in enumerate(TRANSACTION_PATTERN.finditer(text)):
+        amount = float(match.group("value").replace(",", ""))
+        if match.group("sign") or match.group("paren"):
+            amount = -amount
+        vendor, memo = _describe(match.group("description"))
+        raw_date = match.group("date")
+        yield Txn(
+            id=f"txn_{i}",
+            amount=amount,
+            date=raw_date,
+            iso_date=normalize_date(raw_date, day_first),
+            memo=memo,
+            vendor=vendor,
+        )
@@ -0,0 +1,543 @@
+"""In-process vector index with the same interface as the Vectorize proxy."""
+
+import logging
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Literal, Protocol
+
+import numpy as np
+import orjson
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("cosine", "dot-product", "euclidean")
+
+_RANGE_OPS = {
+    "$lt": lambda value, bound: value < bound,
+    "$lte": lambda value, bound: value <= bound,
+    "$gt": lambda value, bound: value > bound,
+    "$gte": lambda value, bound: value >= bound,
+}
+
+
+class VectorStore(Protocol):
+    """Vector operations used by the pipeline (EdgeClient or LocalVectorIndex)."""
+
+    def vector_upsert(
+        self,
+        ids: list[str],
+        vectors: Sequence[Sequence[float]],
+        metadatas: list[dict[str, Any]] | None = None,
+    ) -> dict: ...
+
+    def vector_query(
+        self,
+        vector: list[float],
+        top_k: int = 10,
+        filter: dict[str, Any] | None = None,
+    ) -> list[dict]: ...
+
+    def vector_delete(self, ids: list[str]) -> dict: ...
+
+
+def matches_filter(metadata: dict[str, Any] | None, filter: dict[str, Any]) -> bool:
+    """
+    Evaluate a Vectorize-style metadata filter.
+
+    A bare value means equality; operator objects support $eq, $ne, $in,
+    $nin, $lt, $lte, $gt and $gte. All fields must match.
+
+    Args:
+        metadata: Vector metadata
+        filter: Filter expression
+
+    Returns:
+        True if the metadata satisfies the filter
+    """
+    metadata = metadata or {}
+    for field, condition in filter.items():
+        value = metadata.get(field)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for op, operand in condition.items():
+            if op == "$eq":
+                ok = value == operand
+            elif op == "$ne":
+                ok = value != operand
+            elif op == "$in":
+                ok = value in operand
+            elif op == "$nin":
+                ok = value not in operand
+            elif op in _RANGE_OPS:
+                try:
+                    ok = value is not None and _RANGE_OPS[op](value, operand)
+                except TypeError:
+                    ok = False
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            if not ok:
+                return False
+    return True
+
+
+class LocalVectorIndex:
+    """
+    NumPy vector index usable in place of EdgeClient's vector methods.
+
+    Search is exact by default: queries are scored against the stored matrix
+    in row blocks with a running top-k, so memory stays bounded for large
+    indexes. After build_ivf(), queries only scan the rows assigned to the
+    nprobe closest k-means centroids (an IVF index), trading a little recall
+    for speed. Vectors can be saved to disk and reopened memory-mapped.
+    """
+
+    def __init__(
+        self,
+        metric: str = "cosine",
+        nprobe: int = 8,
+        block_size: int = 16384,
+    ):
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}")
+
+        self.metric = metric
+        self.nprobe = nprobe
+        self.block_size = block_size
+
+        self._vectors: np.ndarray | None = None
+        self._size = 0
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._metadata: list[dict[str, Any] | None] = []
+        self._centroids: np.ndarray | None = None
+        self._assign: np.ndarray = np.empty(0, dtype=np.int32)
+        # Rows grouped by inverted list, with list start offsets; rebuilt lazily
+        self._lists: tuple[np.ndarray, np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dimensions(self) -> int | None:
+        """Vector width, fixed by the first upsert."""
+        return None if self._vectors is None else self._vectors.shape[1]
+
+    @property
+    def _matrix(self) -> np.ndarray:
+        """Backing matrix, which exists once a vector has been stored."""
+        if self._vectors is None:
+            raise RuntimeError("The index has no vectors")
+        return self._vectors
+
+    @property
+    def _ivf_centroids(self) -> np.ndarray:
+        """IVF centroids, which exist between build_ivf() and drop_ivf()."""
+        if self._centroids is None:
+            raise RuntimeError("The index has no IVF centroids")
+        return self._centroids
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Stored vectors (normalized for the cosine metric), one row per ID."""
+        if self._vectors is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._vectors[: self._size]
+
+    def _prepare(self, vectors: Any) -> np.ndarray:
+        """Convert to float32 rows, normalized when the metric is cosine."""
+        array: np.ndarray = np.asarray(vectors, dtype=np.float32)
+        if array.ndim == 1:
+            array = array[None, :]
+        if self.dimensions is not None and array.shape[1] != self.dimensions:
+            raise ValueError(
+                f"Expected {self.dimensions}-dimensional vectors, got {array.shape[1]}"
+            )
+        if self.metric == "cosine":
+            norms = np.linalg.norm(array, axis=1, keepdims=True)
+            array = array / np.where(norms == 0, 1, norms)
+        return array
+
+    def _reserve(self, rows: int, dimensions: int) -> None:
+        """Grow the backing matrix (copying any read-only memory map) to fit rows."""
+        if self._vectors is None:
+            self._vectors = np.empty((max(rows, 16), dimensions), dtype=np.float32)
+            return
+
+        capacity = self._vectors.shape[0]
+        if rows <= capacity and self._vectors.flags.writeable:
+            return
+
+        grown = np.empty((max(rows, capacity * 2), dimensions), dtype=np.float32)
+        grown[: self._size] = self._vectors[: self._size]
+        self._vectors = grown
+
+    def vector_upsert(
+        self,
+        ids: list[str],
+        vectors: Sequence[Sequence[float]],
+        metadatas: list[dict[str, Any]] | None = None,
+    ) -> dict:
+        """
+        Insert or replace vectors.
+
+        Args:
+            ids: Vector IDs
+            vectors: Vector values
+            metadatas: Optional metadata for each vector
+
+        Returns:
+            Response data, as returned by the edge proxy
+        """
+        if len(vectors) != len(ids):
+            raise ValueError("Number of vectors must match number of IDs")
+        if metadatas and len(metadatas) != len(ids):
+            raise ValueError("Number of metadata objects must match number of IDs")
+        if not ids:
+            return {"success": True, "count": 0}
+
+        array = self._prepare(vectors)
+        new_ids = [vid for vid in dict.fromkeys(ids) if vid not in self._rows]
+        self._reserve(self._size + len(new_ids), array.shape[1])
+
+        for vid in new_ids:
+            self._rows[vid] = self._size
+            self._ids.append(vid)
+            self._metadata.append(None)
+            self._size += 1
+
+        rows = np.fromiter((self._rows[vid] for vid in ids), dtype=np.int64, count=len(ids))
+        self._matrix[rows] = array
+        for i, row in enumerate(rows):
+            self._metadata[row] = metadatas[i] if metadatas else None
+
+        if self._centroids is not None:
+            self._assign = np.resize(self._assign, self._size)
+            self._assign[rows] = self._nearest_centroids(array)
+            self._lists = None
+
+        return {"success": True, "count": len(ids)}
+
+    def vector_delete(self, ids: list[str]) -> dict:
+        """
+        Remove vectors by ID; unknown IDs are ignored.
+
+        Args:
+            ids: Vector IDs to delete
+
+        Returns:
+            Response data, as returned by the edge proxy
+        """
+        deleted = 0
+        for vid in ids:
+            row = self._rows.pop(vid, None)
+            if row is None:
+                continue
+
+            # Move the last row into the hole to keep storage contiguous
+            last = self._size - 1
+            if row != last:
+                self._reserve(self._size, self._matrix.shape[1])
+                self._matrix[row] = self._matrix[last]
+                moved = self._ids[last]
+                self._ids[row] = moved
+                self._metadata[row] = self._metadata[last]
+                self._rows[moved] = row
+                if self._centroids is not None:
+                    self._assign[row] = self._assign[last]
+
+            self._ids.pop()
+            self._metadata.pop()
+            self._size -= 1
+            deleted += 1
+
+        if self._centroids is not None:
+            self._assign = self._assign[: self._size]
+            self._lists = None
+        return {"success": True, "count": deleted}
+
+    def get(self, vid: str) -> dict[str, Any] | None:
+        """Stored values and metadata of a vector, or None if absent."""
+        row = self._rows.get(vid)
+        if row is None:
+            return None
+        return {"id": vid, "values": self._matrix[row].tolist(), "metadata": self._metadata[row]}
+
+    def vector_query(
+        self,
+        vector: list[float],
+        top_k: int = 10,
+        filter: dict[str, Any] | None = None,
+    ) -> list[dict]:
+        """
+        Find the vectors most similar to a query vector.
+
+        Args:
+            vector: Query vector
+            top_k: Number of results to return
+            filter: Optional metadata filter
+
+        Returns:
+            Matches with id, score and metadata, best first
+        """
+        return self.vector_query_batch([vector], top_k, filter)[0]
+
+    def vector_query_batch(
+        self,
+        vectors: Any,
+        top_k: int = 10,
+        filter: dict[str, Any] | None = None,
+    ) -> list[list[dict]]:
+        """
+        Answer several queries with one matrix multiplication per block.
+
+        Args:
+            vectors: Query vectors, one per row
+            top_k: Number of results per query
+            filter: Optional metadata filter applied to every query
+
+        Returns:
+            Matches for each query, best first
+        """
+        if self._size == 0:
+            return [[] for _ in range(len(vectors))]
+
+        queries = self._prepare(vectors)
+        allowed = None
+        if filter:
+            allowed = np.fromiter(
+                (matches_filter(self._metadata[row], filter) for row in range(self._size)),
+                dtype=bool,
+                count=self._size,
+            )
+
+        if self._centroids is None:
+            rows, scores = self._search_exact(queries, top_k, allowed)
+        else:
+            rows, scores = self._search_ivf(queries, top_k, allowed)
+
+        return [
+            [
+                {"id": self._ids[row], "score": float(score), "metadata": self._metadata[row]}
+                for row, score in zip(query_rows, query_scores)
+                if row >= 0
+            ]
+            for query_rows, query_scores in zip(rows, scores)
+        ]
+
+    def _scores(self, queries: np.ndarray, block: np.ndarray) -> np.ndarray:
+        """Similarity scores, higher is better (negated distance for euclidean)."""
+        scores: np.ndarray = queries @ block.T
+        if self.metric == "euclidean":
+            scores = (
+                2 * scores
+                - (block * block).sum(axis=1)
+                - (queries * queries).sum(axis=1, keepdims=True)
+            )
+        return scores
+
+    def _search_exact(
+        self, queries: np.ndarray, top_k: int, allowed: np.ndarray | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Blocked brute-force search over all rows."""
+        best_rows = np.full((len(queries), 0), -1, dtype=np.int64)
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+
+        for start in range(0, self._size, self.block_size):
+            stop = min(start + self.block_size, self._size)
+            scores = self._scores(queries, self._matrix[start:stop])
+            if allowed is not None:
+                scores[:, ~allowed[start:stop]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, stop), scores.shape)
+
+            best_rows, best_scores = _merge_top_k(
+                np.concatenate([best_rows, rows], axis=1),
+                np.concatenate([best_scores, scores], axis=1),
+                top_k,
+            )
+
+        return self._finish(best_rows, best_scores)
+
+    def _search_ivf(
+        self, queries: np.ndarray, top_k: int, allowed: np.ndarray | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Search only the rows of the nprobe closest inverted lists per query."""
+        centroids = self._ivf_centroids
+        nprobe = min(self.nprobe, len(centroids))
+        probe = np.argpartition(-self._scores(queries, centroids), nprobe - 1, axis=1)
+        probe = probe[:, :nprobe]
+
+        all_rows, all_scores = [], []
+        order, offsets = self._inverted_lists()
+        for query, lists in zip(queries, probe):
+            rows = np.concatenate([order[offsets[i] : offsets[i + 1]] for i in lists])
+            if allowed is not None:
+                rows = rows[allowed[rows]]
+            scores = self._scores(query[None, :], self._matrix[rows])
+            top_rows, top_scores = _merge_top_k(rows[None, :], scores, top_k)
+            all_rows.append(_pad(top_rows[0], top_k, -1))
+            all_scores.append(_pad(top_scores[0], top_k, -np.inf))
+
+        return self._finish(np.array(all_rows), np.array(all_scores))
+
+    def _inverted_lists(self) -> tuple[np.ndarray, np.ndarray]:
+        """Row indices sorted by inverted list, and the offset where each list starts."""
+        if self._lists is None:
+            order = np.argsort(self._assign, kind="stable")
+            counts = np.bincount(self._assign, minlength=len(self._ivf_centroids))
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            self._lists = (order, offsets)
+        return self._lists
+
+    def _finish(self, rows: np.ndarray, scores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Drop filtered-out slots and convert scores back to the metric's scale."""
+        rows = np.where(np.isfinite(scores), rows, -1)
+        if self.metric == "euclidean":
+            scores = np.sqrt(np.maximum(-scores, 0))
+        return rows, scores
+
+    def build_ivf(self, nlist: int | None = None, iterations: int = 10, seed: int = 0) -> None:
+        """
+        Cluster stored vectors with k-means and switch to approximate search.
+
+        Vectors upserted afterwards are assigned to their nearest centroid.
+
+        Args:
+            nlist: Number of inverted lists (default: about sqrt(len))
+            iterations: k-means iterations
+            seed: Random seed for centroid initialization
+        """
+        if self._size == 0:
+            raise ValueError("Cannot build an IVF index over an empty index")
+
+        data = self.vectors
+        nlist = min(nlist or max(1, int(np.sqrt(self._size))), self._size)
+        rng = np.random.default_rng(seed)
+        self._centroids = data[rng.choice(self._size, size=nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assign = self._nearest_centroids(data)
+            sums = np.zeros_like(self._centroids)
+            np.add.at(sums, assign, data)
+            counts = np.bincount(assign, minlength=nlist)[:, None]
+            nonempty = counts[:, 0] > 0
+            self._centroids[nonempty] = sums[nonempty] / counts[nonempty]
+            if self.metric == "cosine":
+                norms = np.linalg.norm(self._centroids, axis=1, keepdims=True)
+                self._centroids /= np.where(norms == 0, 1, norms)
+
+        self._assign = self._nearest_centroids(data)
+        self._lists = None
+        logger.info(f"Built IVF index with {nlist} lists over {self._size} vectors")
+
+    def drop_ivf(self) -> None:
+        """Return to exact search."""
+        self._centroids = None
+        self._assign = np.empty(0, dtype=np.int32)
+        self._lists = None
+
+    def _nearest_centroids(self, data: np.ndarray) -> np.ndarray:
+        """Index of the best-scoring centroid for each row, in row blocks."""
+        centroids = self._ivf_centroids
+        assign = np.empty(len(data), dtype=np.int32)
+        for start in range(0, len(data), self.block_size):
+            block = data[start : start + self.block_size]
+            assign[start : start + len(block)] = self._scores(block, centroids).argmax(axis=1)
+        return assign
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Persist the index to a directory.
+
+        Vectors are written as .npy files so load() can memory-map them;
+        IDs and metadata go to a JSON sidecar.
+
+        Args:
+            path: Target directory (created if needed)
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        _save_array(directory / "vectors.npy", self.vectors)
+        if self._centroids is not None:
+            _save_array(directory / "centroids.npy", self._centroids)
+            _save_array(directory / "assign.npy", self._assign[: self._size])
+        else:
+            for name in ("centroids.npy", "assign.npy"):
+                (directory / name).unlink(missing_ok=True)
+
+        manifest = {
+            "metric": self.metric,
+            "nprobe": self.nprobe,
+            "ids": self._ids,
+            "metadata": self._metadata,
+        }
+        tmp = directory / "index.json.tmp"
+        tmp.write_bytes(orjson.dumps(manifest))
+        os.replace(tmp, directory / "index.json")
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, mmap: bool = True) -> "LocalVectorIndex":
+        """
+        Open an index written by save().
+
+        With mmap, vectors stay on disk and are paged in on demand; the first
+        mutation copies them into memory.
+
+        Args:
+            path: Index directory
+            mmap: Memory-map vectors instead of reading them
+
+        Returns:
+            LocalVectorIndex
+        """
+        directory = Path(path)
+        manifest = orjson.loads((directory / "index.json").read_bytes())
+        mode: Literal["r"] | None = "r" if mmap else None
+
+        index = cls(metric=manifest["metric"], nprobe=manifest["nprobe"])
+        vectors = np.load(directory / "vectors.npy", mmap_mode=mode)
+        if len(vectors):
+            index._vectors = vectors
+        index._size = len(vectors)
+        index._ids = manifest["ids"]
+        index._rows = {vid: row for row, vid in enumerate(index._ids)}
+        index._metadata = manifest["metadata"]
+
+        if (directory / "centroids.npy").exists():
+            index._centroids = np.load(directory / "centroids.npy")
+            index._assign = np.load(directory / "assign.npy")
+
+        return index
+
+    @classmethod
+    def open(cls, path: str | os.PathLike, metric: str = "cosine") -> "LocalVectorIndex":
+        """Load the index at path if it exists, otherwise start an empty one."""
+        if (Path(path) / "index.json").exists():
+            return cls.load(path)
+        return cls(metric=metric)
+
+
+def _merge_top_k(rows: np.ndarray, scores: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Keep the top_k highest scores per row, sorted best first."""
+    if scores.shape[1] > top_k:
+        part = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        rows = np.take_along_axis(rows, part, axis=1)
+        scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(rows, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def _pad(values: np.ndarray, length: int, fill: float) -> np.ndarray:
+    """Right-pad a 1-D array to length."""
+    if len(values) >= length:
+        return values
+    return np.concatenate([values, np.full(length - len(values), fill, dtype=values.dtype)])
+
+
+def _save_array(path: Path, array: np.ndarray) -> None:
+    """Write an .npy file atomically."""
+    tmp = path.with_suffix(".tmp.npy")
+    np.save(tmp, np.ascontiguousarray(array))
+    os.replace(tmp, path)
@@ -0,0 +1,66 @@
+"""Tests for the per-run artifact store."""
+
+import pytest
+
+from src.artifacts import ArtifactStore
+from src.state import Txn
+
+
+def test_artifact_freed_after_last_consumer():
+    """A payload stays readable until every consumer has released it."""
+    store = ArtifactStore()
+    ref = store.put("run-1", "raw_text", "x" * 1000, consumers=2)
+
+    assert store.get(ref) == "x" * 1000
+    assert store.nbytes == 1000
+    store.release(ref)
+    assert store.get(ref) == "x" * 1000
+    store.release(ref)
+
+    assert store.nbytes == 0 and store.peak_nbytes == 1000
+    with pytest.raises(KeyError):
+        store.get(ref)
+
+
+def test_large_artifacts_spill_to_disk(tmp_path):
+    """Payloads over the threshold are written to disk and read back on access."""
+    store = ArtifactStore(tmp_path, spill_threshold_bytes=100)
+    txns = [Txn(id=f"t{i}", amount=float(i), date="2024-01-15") for i in range(50)]
+
+    text_ref = store.put("run-1", "raw_text", "y" * 500, consumers=1)
+    txns_ref = store.put("run-1", "txns", txns, consumers=1)
+
+    assert store.nbytes == 0
+    assert store.get(text_ref) == "y" * 500
+    assert store.get(txns_ref) == txns
+    store.release(text_ref)
+    assert len(list((tmp_path / "run-1").iterdir())) == 1
+    store.drop_run("run-1")
+    assert not (tmp_path / "run-1").exists()
+    with pytest.raises(KeyError):
+        store.get(txns_ref)
+
+
+def test_durable_artifacts_outlive_the_store(tmp_path):
+    """A durable store keeps payload files for a retry until the run is dropped."""
+    store = ArtifactStore(tmp_path, durable=True)
+    ref = store.put("run-1", "raw_text", "ledger text", consumers=1)
+    store.release(ref)
+    store.drop_run("run-1", keep_files=True)
+
+    assert ArtifactStore(tmp_path, durable=True).get(ref) == "ledger text"
+    store.drop_run("run-1")
+    assert not (tmp_path / "run-1").exists()
+
+
+def test_stores_sharing_a_spill_dir_do_not_clash(tmp_path):
+    """Workers spilling the same run and field into one directory keep separate files."""
+    first = ArtifactStore(tmp_path, durable=True)
+    second = ArtifactStore(tmp_path, durable=True)
+
+    first_ref = first.put("run-1", "raw_text", "first attempt", consumers=1)
+    second_ref = second.put("run-1", "raw_text", "second attempt", consumers=1)
+
+    assert first_ref.path != second_ref.path
+    assert first.get(first_ref) == "first attempt"
+    assert second.get(second_ref) == "second attempt"
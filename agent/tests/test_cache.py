@@ -0,0 +1,58 @@
+"""Tests for the analysis response cache."""
+
+import os
+import time
+
+from src.cache import ResponseCache, make_cache_key
+
+
+def test_make_cache_key_is_order_insensitive_for_dicts():
+    """Test that dict key order does not change the digest."""
+    assert make_cache_key("v1", {"a": 1, "b": 2}) == make_cache_key("v1", {"b": 2, "a": 1})
+    assert make_cache_key("v1", {"a": 1}) != make_cache_key("v2", {"a": 1})
+
+
+def test_cache_round_trip(tmp_path):
+    """Test storing and retrieving a response."""
+    cache = ResponseCache(tmp_path)
+    key = make_cache_key("v1", "prompt")
+
+    assert cache.get(key) is None
+    cache.set(key, "report")
+    assert cache.get(key) == "report"
+
+
+def test_cache_ttl_expiry(tmp_path):
+    """Test that expired entries are treated as misses and removed."""
+    cache = ResponseCache(tmp_path, ttl_seconds=0)
+    cache.set("k", "report")
+    time.sleep(0.01)
+
+    assert cache.get("k") is None
+    assert not (tmp_path / "k.json").exists()
+
+
+def test_cache_lru_eviction(tmp_path):
+    """Test that the least recently used entry is evicted first."""
+    cache = ResponseCache(tmp_path, max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    os.utime(tmp_path / "a.json", (1, 1))
+    os.utime(tmp_path / "b.json", (2, 2))
+
+    assert cache.get("a") == "1"  # refreshes "a"
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+
+def test_cache_bypass_still_writes(tmp_path):
+    """Test that bypass skips lookups but refreshes stored entries."""
+    ResponseCache(tmp_path).set("k", "old")
+    bypassing = ResponseCache(tmp_path, bypass=True)
+
+    assert bypassing.get("k") is None
+    bypassing.set("k", "new")
+    assert ResponseCache(tmp_path).get("k") == "new"
@@ -1,13 +1,26 @@
 """Tests for deterministic audit checks."""
 
+import numpy as np
 import pytest
 
+from src.checks.aggregate import aggregate_findings, iter_evidence
+from src.checks.benford import chi_square_sf, digit_buckets, find_digit_anomalies
+from src.checks.cross_run import find_cross_run_duplicates
 from src.checks.deterministic import (
     check_duplicate_invoices,
     check_round_numbers,
     check_weekend_postings,
+    find_round_numbers,
+    run_all_checks,
+    run_registered_checks,
+    stream_all_checks,
 )
-from src.state import RunState, Txn
+from src.checks.fuzzy import find_near_duplicate_invoices, normalize_vendor
+from src.checks.registry import CheckRegistry
+from src.checks.streaming import CheckStream, iter_chunks
+from src.checks.table import TxnTable
+from src.fingerprints import BloomFilter, FingerprintStore
+from src.state import Finding, RunState, Txn, validate_txns
 
 
 def test_check_duplicate_invoices():
@@ -133,3 +146,387 @@ def test_check_weekend_postings_invalid_date():
     findings = check_weekend_postings(state)
     assert len(findings) == 1  # Only the valid weekend date
 
+
+
+def test_duplicate_groups_keep_first_occurrence_order():
+    """Duplicate groups are reported in order of their first transaction."""
+    state = RunState(
+        run_id="test-8",
+        tenant_id="tenant-1",
+        r2_key="test.pdf",
+        txns=[
+            Txn(id="b1", amount=50.00, date="2024-01-16", vendor="Beta Inc"),
+            Txn(id="a1", amount=100.00, date="2024-01-15", vendor="Acme Corp"),
+            Txn(id="b2", amount=50.00, date="2024-01-16", vendor="Beta Inc"),
+            Txn(id="a2", amount=100.00, date="2024-01-15", vendor="Acme Corp"),
+            Txn(id="b3", amount=50.00, date="2024-01-16", vendor="Beta Inc"),
+            Txn(id="n1", amount=100.00, date="2024-01-15", vendor=None),
+            Txn(id="n2", amount=100.00, date="2024-01-15", vendor=None),
+        ],
+    )
+
+    findings = check_duplicate_invoices(state)
+
+    assert [f["transaction_ids"] for f in findings] == [["b1", "b2", "b3"], ["a1", "a2"]]
+    assert "Vendor: Beta Inc, Date: 2024-01-16, Amount: $50.00." in findings[0]["detail"]
+
+
+def test_txn_table_columns():
+    """The columnar table encodes cents, categorical vendors and weekdays."""
+    table = TxnTable.from_columns(
+        ids=["t1", "t2", "t3"],
+        amounts=[1234.56, -10.0, 0.1],
+        dates=["2024-01-13", "not a date", None],
+        vendors=["Acme", None, "Acme"],
+    )
+
+    assert table.cents.tolist() == [123456, -1000, 10]
+    assert table.vendor_codes.tolist() == [0, -1, 0]
+    assert table.weekdays().tolist() == [5, -1, -1]
+    assert table.date(2) == ""
+
+
+def test_registry_runs_checks_in_registration_order():
+    """Results keep registration order and a failing check is isolated."""
+    import threading
+
+    registry = CheckRegistry()
+    release_first = threading.Event()
+
+    @registry.register("slow", inputs=("table",))
+    def slow(table):
+        # Finishes only after the last check has run
+        assert release_first.wait(5)
+        return [{"code": "SLOW"}]
+
+    @registry.register("broken", inputs=("table",))
+    def broken(table):
+        raise RuntimeError("boom")
+
+    @registry.register("needs_text", inputs=("raw_text",))
+    def needs_text(raw_text):
+        return []
+
+    @registry.register("fast", inputs=("table", "txns"))
+    def fast(table, txns):
+        release_first.set()
+        return [{"code": "FAST", "count": len(txns)}]
+
+    results = registry.run({"table": object(), "txns": [1, 2]}, max_workers=4)
+
+    assert [r.name for r in results] == ["slow", "broken", "needs_text", "fast"]
+    assert results[0].findings == [{"code": "SLOW"}]
+    assert results[1].error == "RuntimeError: boom"
+    assert results[2].error == "Missing inputs: raw_text"
+    assert results[3].findings == [{"code": "FAST", "count": 2}]
+    assert all(r.seconds >= 0 for r in results)
+
+    with pytest.raises(ValueError):
+        registry.register("fast")(fast)
+
+
+def test_registry_process_executor():
+    """Process checks receive pickled inputs and match the in-thread result."""
+    registry = CheckRegistry()
+    registry.register("round_numbers", executor="process")(find_round_numbers)
+    registry.register("round_numbers_thread")(find_round_numbers)
+    table = TxnTable.from_columns(
+        ids=["t1", "t2"], amounts=[5000.0, 1234.56], dates=["2024-01-15"] * 2, vendors=["A", "B"]
+    )
+
+    results = registry.run({"table": table}, max_workers=2)
+
+    assert results[0].error is None
+    assert results[0].findings == results[1].findings
+    assert results[0].findings[0]["transaction_ids"] == ["t1"]
+
+
+def test_run_registered_checks_sequential_matches_pooled():
+    """Built-in checks give the same findings with and without the pool."""
+    state = RunState(
+        run_id="test-9",
+        tenant_id="tenant-1",
+        r2_key="test.pdf",
+        txns=[
+            Txn(id="txn1", amount=5000.00, date="2024-01-13", vendor="Acme Corp"),
+            Txn(id="txn2", amount=5000.00, date="2024-01-13", vendor="Acme Corp"),
+        ],
+    )
+
+    sequential = run_registered_checks(state, max_workers=1)
+    pooled = run_registered_checks(state, max_workers=4)
+
+    assert [r.name for r in pooled] == [
+        "duplicate_invoices",
+        "round_numbers",
+        "weekend_postings",
+        "digit_distributions",
+        "near_duplicate_invoices",
+        "cross_run_duplicates",
+    ]
+    assert pooled[-1].skipped
+    assert [r.findings for r in sequential] == [r.findings for r in pooled]
+
+
+def test_normalize_vendor():
+    """Vendor variants normalize to the same name."""
+    assert normalize_vendor("ACME Corp.") == "acme"
+    assert normalize_vendor("The Acme Co") == "acme"
+    assert normalize_vendor("Acme, Inc") == "acme"
+    assert normalize_vendor("Acme Travel LLC") == "acme travel"
+
+
+def test_find_near_duplicate_invoices():
+    """Close amounts within the date window cluster across vendor variants."""
+    table = TxnTable.from_columns(
+        ids=["a1", "b1", "a2", "a3", "c1", "c2", "d1", "d2"],
+        amounts=[1000.00, 75.00, 1004.50, 1000.00, 500.00, 500.00, -50.00, -50.20],
+        dates=[
+            "2024-01-15",
+            "2024-01-15",
+            "2024-01-17",
+            "2024-02-20",
+            "2024-03-01",
+            "2024-03-01",
+            "2024-04-01",
+            "2024-04-03",
+        ],
+        vendors=[
+            "Acme Corp",
+            "Beta Inc",
+            "ACME Corporation",
+            "Acme",
+            "Gamma",
+            "Gamma",
+            "Delta LLC",
+            "delta",
+        ],
+    )
+
+    findings = find_near_duplicate_invoices(table, window_days=3, amount_tolerance=0.01)
+
+    # a3 is outside the window; c1/c2 are exact duplicates left to DUP_INVOICE
+    assert [f["transaction_ids"] for f in findings] == [["a1", "a2"], ["d1", "d2"]]
+    assert findings[0]["code"] == "NEAR_DUP_INVOICE"
+    assert "Vendors: Acme Corp, ACME Corporation" in findings[0]["detail"]
+
+    exact = find_near_duplicate_invoices(table, window_days=3, amount_tolerance=0)
+    assert exact == []
+
+
+def test_find_near_duplicate_invoices_at_tolerance_limit():
+    """Amounts just within the tolerance match even when their log ratio exceeds log1p(t)."""
+    table = TxnTable.from_columns(
+        ids=["a1", "a2", "b1", "b2"],
+        # 1009.51 is 0.999% below 1019.70; 1000.00 is 1.010% below 1010.20
+        amounts=[1019.70, 1009.51, 1010.20, 1000.00],
+        dates=["2024-01-15", "2024-01-15", "2024-02-15", "2024-02-15"],
+        vendors=["Acme", "Acme", "Beta", "Beta"],
+    )
+
+    findings = find_near_duplicate_invoices(table, window_days=3, amount_tolerance=0.01)
+
+    assert [f["transaction_ids"] for f in findings] == [["a1", "a2"]]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Added keys are always reported; most absent keys are not."""
+    keys = np.arange(0, 20_000, dtype=np.int64) * 7919
+    bloom = BloomFilter(capacity=20_000, error_rate=0.01)
+    bloom.add(keys)
+
+    assert bloom.might_contain(keys).all()
+    assert bloom.might_contain(keys + 1).mean() < 0.05
+
+
+def test_find_cross_run_duplicates(tmp_path):
+    """Transactions recorded by earlier runs are flagged; the same run is not."""
+    store = FingerprintStore(tmp_path)
+
+    def run(run_id, txns, tenant_id="tenant-1"):
+        state = RunState(run_id=run_id, tenant_id=tenant_id, r2_key="x.pdf", txns=txns)
+        return find_cross_run_duplicates(TxnTable.from_txns(txns), state, store)
+
+    january = [
+        Txn(id="txn_0", amount=1200.00, date="2024-01-15", vendor="Acme Corp"),
+        Txn(id="txn_1", amount=80.00, date="2024-01-20", vendor="Beta Inc"),
+    ]
+    february = [
+        Txn(id="txn_0", amount=1200.00, date="2024-01-15", vendor="ACME Corporation"),
+        Txn(id="txn_1", amount=95.00, date="2024-02-02", vendor="Beta Inc"),
+    ]
+
+    assert run("run-jan", january) == []
+    # Retrying a run does not match its own records
+    assert run("run-jan", january) == []
+
+    findings = run("run-feb", february)
+    assert [f["transaction_ids"] for f in findings] == [["txn_0"]]
+    assert findings[0]["code"] == "CROSS_RUN_DUP"
+    assert "txn_0 in run run-jan" in findings[0]["detail"]
+
+    # Tenants are isolated
+    assert run("run-other", february, tenant_id="tenant-2") == []
+
+
+def test_digit_buckets_and_chi_square():
+    """Digits are exact at powers of ten; the chi-square tail matches tables."""
+    buckets = digit_buckets(np.array([1000, 9999, 100000, 123456789], dtype=np.int64))
+
+    assert (buckets["first_digit"] + 1).tolist() == [1, 9, 1, 1]
+    assert (buckets["first_two_digits"] + 10).tolist() == [10, 99, 10, 12]
+    assert buckets["last_digit"].tolist() == [0, 9, 0, 7]
+    assert chi_square_sf(15.507, 8) == pytest.approx(0.05, abs=1e-4)
+    assert chi_square_sf(16.919, 9) == pytest.approx(0.05, abs=1e-4)
+
+
+def test_find_digit_anomalies_flags_fabricated_vendor():
+    """A vendor with uniformly invented amounts fails Benford; natural data passes."""
+    rng = np.random.default_rng(7)
+    natural = np.round(10 ** rng.uniform(1, 6, 4000), 2)
+    # Invented amounts: leading digits 5-9 far more often than Benford predicts
+    invented = np.round(rng.uniform(500, 999, 2000), 2)
+    amounts = np.concatenate([natural, invented])
+    vendors = ["Acme Corp"] * len(natural) + ["Shady LLC"] * len(invented)
+    table = TxnTable.from_columns(
+        ids=[f"txn_{i}" for i in range(len(amounts))],
+        amounts=amounts,
+        dates=["2024-01-15"] * len(amounts),
+        vendors=vendors,
+        accounts=["6000"] * len(amounts),
+    )
+
+    findings = find_digit_anomalies(table, min_count=1000, max_ids=20, chunk_size=1500)
+    first_digit = {
+        f["detail"].split(" deviates")[0]: f for f in findings if f["code"] == "BENFORD_FIRST_DIGIT"
+    }
+
+    assert "First digit distribution of vendor Shady LLC" in first_digit
+    assert "First digit distribution of vendor Acme Corp" not in first_digit
+    assert "First digit distribution of account 6000" in first_digit
+    shady = first_digit["First digit distribution of vendor Shady LLC"]
+    assert len(shady["transaction_ids"]) == 20
+    assert all(int(i.split("_")[1]) >= len(natural) for i in shady["transaction_ids"])
+
+
+def test_weekend_postings_with_us_dates():
+    """US-formatted and canonical dates are both understood by the checks."""
+    state = RunState(
+        run_id="test-10",
+        tenant_id="tenant-1",
+        r2_key="test.pdf",
+        txns=[
+            Txn(id="txn1", amount=10.00, date="01/13/2024"),
+            Txn(id="txn2", amount=10.00, date="13/01/2024", iso_date="2024-01-13"),
+            Txn(id="txn3", amount=10.00, date="01/15/2024"),
+        ],
+    )
+
+    findings = check_weekend_postings(state)
+
+    assert [f["transaction_ids"] for f in findings] == [["txn1"], ["txn2"]]
+    assert "Saturday, 2024-01-13" in findings[1]["detail"]
+
+
+def test_finding_renders_detail_lazily():
+    """Findings format their detail on first access and behave like finding dicts."""
+    finding = Finding(
+        "DUP_INVOICE", "medium", "Duplicate", "Amount: ${amount:.2f}. IDs: {ids}",
+        ["a", "b"], amount=1000, ids=["a", "b"],
+    )
+
+    assert finding._detail is None
+    assert finding["detail"] == "Amount: $1000.00. IDs: a, b"
+    assert finding.get("code") == "DUP_INVOICE"
+    assert finding.get("missing", "default") == "default"
+    assert dict(finding) == finding.to_dict()
+
+    # Verbatim detail without values; dicts are accepted by the state
+    state = RunState(
+        run_id="test-11",
+        tenant_id="tenant-1",
+        r2_key="test.pdf",
+        findings=[{"code": "X", "severity": "low", "title": "T", "detail": "{braces}"}, finding],
+    )
+    assert isinstance(state.findings[0], Finding)
+    assert state.findings[0]["detail"] == "{braces}"
+    assert state.findings[1] is finding
+    assert state.model_dump()["findings"][1]["detail"] == "Amount: $1000.00. IDs: a, b"
+
+
+def test_validate_txns_in_bulk():
+    """Untrusted records are validated and coerced in one pass."""
+    txns = validate_txns([{"id": "t1", "amount": "12.50", "date": "2024-01-15"}])
+
+    assert txns == [Txn(id="t1", amount=12.5, date="2024-01-15")]
+    with pytest.raises(ValueError):
+        validate_txns([{"id": "t2", "amount": "twelve", "date": "2024-01-15"}])
+
+
+def test_streaming_checks_match_batch():
+    """Chunked runs find what a whole-ledger run finds."""
+    txns = [
+        Txn(id="a1", amount=100.00, date="2024-01-08", vendor="Acme Corp"),
+        Txn(id="b1", amount=5000.00, date="2024-01-09", vendor="Beta Inc"),
+        Txn(id="a2", amount=100.00, date="2024-01-08", vendor="Acme Corp"),
+        Txn(id="a3", amount=100.50, date="2024-01-10", vendor="ACME Corporation"),
+        Txn(id="g1", amount=75.00, date="2024-01-13", vendor="Gamma LLC"),  # Saturday
+        Txn(id="b2", amount=42.00, date="2024-01-30", vendor="Beta Inc"),
+    ]
+    state = RunState(run_id="test-12", tenant_id="tenant-1", r2_key="test.pdf", txns=txns)
+
+    batch = run_all_checks(state, max_workers=1)
+    # a2 arrives a day after a later date was seen
+    streamed = list(stream_all_checks(iter_chunks(txns, 2), state, lateness_days=1))
+
+    def key(f):
+        return f["code"], sorted(f["transaction_ids"])
+
+    assert sorted(map(key, streamed)) == sorted(map(key, batch))
+    assert {f["code"] for f in batch} >= {"DUP_INVOICE", "NEAR_DUP_INVOICE", "ROUND_NUMBER"}
+
+
+def test_streaming_emits_closed_findings_before_the_end():
+    """Windowed checks report a group once later dates rule out new members."""
+    stream = CheckStream({}, names=["duplicate_invoices"])
+
+    early = stream.update(
+        [
+            Txn(id="t1", amount=10.00, date="2024-01-01", vendor="Acme"),
+            Txn(id="t2", amount=10.00, date="2024-01-01", vendor="Acme"),
+        ]
+    )
+    later = stream.update([Txn(id="t3", amount=20.00, date="2024-01-05", vendor="Acme")])
+
+    assert early == []
+    assert [f["transaction_ids"] for f in later] == [["t1", "t2"]]
+    assert stream.finish() == []
+
+
+def test_aggregate_findings_by_vendor_and_month():
+    """Per-transaction findings collapse into summaries; evidence keeps every one."""
+    import orjson
+
+    table = TxnTable.from_columns(
+        ids=["t1", "t2", "t3", "t4", "t5"],
+        amounts=[1000.0, 2000.0, 3000.0, 4000.0, 5000.0],
+        dates=["2024-01-06", "2024-01-13", "2024-02-03", "2024-01-20", "2024-01-15"],
+        vendors=["Acme", "Acme", "Acme", "Beta", "Acme"],
+    )
+    findings = find_round_numbers(table)
+
+    aggregation = aggregate_findings(findings, table)
+
+    summary, february, beta = aggregation.findings
+    assert summary["transaction_ids"] == ["t1", "t2", "t5"]
+    assert summary["title"] == "Suspiciously Round Amount (3 transactions)"
+    assert "3 transactions from Acme in 2024-01, totalling $8,000.00" in summary["detail"]
+    assert february["transaction_ids"] == ["t3"] and beta["transaction_ids"] == ["t4"]
+    assert [len(group) for group in aggregation.members] == [3, 1, 1]
+
+    lines = list(iter_evidence(aggregation.members[0], table))
+    records = [orjson.loads(line) for line in lines]
+    assert [r["transactions"][0]["id"] for r in records] == ["t1", "t2", "t5"]
+    assert records[2]["transactions"] == [
+        {"id": "t5", "date": "2024-01-15", "vendor": "Acme", "amount": 5000.0, "memo": None}
+    ]
@@ -0,0 +1,57 @@
+"""Tests for offset-based chunking."""
+
+import pytest
+
+from src.chunking import ChunkView, estimate_tokens, iter_chunk_spans
+
+
+def test_spans_cover_text_with_overlap():
+    """Test that consecutive spans overlap and together cover the text."""
+    text = "This is a test text. " * 100
+    spans = list(iter_chunk_spans(text, max_tokens=50, overlap_tokens=10))
+
+    assert len(spans) > 1
+    assert spans[0][0] == 0
+    assert spans[-1][1] == len(text.rstrip())
+    for (_, prev_end), (start, _) in zip(spans, spans[1:]):
+        assert start < prev_end
+
+
+def test_spans_respect_token_budget():
+    """Test that no chunk exceeds the token budget."""
+    text = " ".join(f"word{i}" for i in range(2000))
+    for start, end in iter_chunk_spans(text, max_tokens=64, overlap_tokens=8):
+        assert sum(estimate_tokens(len(w)) for w in text[start:end].split()) <= 64
+
+
+def test_spans_prefer_sentence_boundaries():
+    """Test that chunks end at a sentence boundary when one is available."""
+    text = "Alpha beta gamma delta. " * 40
+    spans = list(iter_chunk_spans(text, max_tokens=30, overlap_tokens=0))
+
+    assert all(text[start:end].endswith(".") for start, end in spans)
+
+
+def test_spans_trim_whitespace():
+    """Test that spans never start or end on whitespace."""
+    text = "  leading\n\nand trailing words here.\n  "
+    spans = list(iter_chunk_spans(text, max_tokens=3, overlap_tokens=1))
+
+    for start, end in spans:
+        assert not text[start].isspace() and not text[end - 1].isspace()
+
+
+def test_invalid_overlap():
+    """Test that overlap must be smaller than the chunk size."""
+    with pytest.raises(ValueError):
+        list(iter_chunk_spans("text", max_tokens=10, overlap_tokens=10))
+
+
+def test_chunk_view_slices_lazily():
+    """Test that ChunkView returns the text for each span."""
+    view = ChunkView("hello world", [(0, 5), (6, 11)])
+
+    assert len(view) == 2
+    assert view[1] == "world"
+    assert view[:] == ["hello", "world"]
+    assert list(view) == ["hello", "world"]
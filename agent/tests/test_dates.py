@@ -0,0 +1,48 @@
+"""Tests for date normalization."""
+
+import pytest
+
+from src.dates import day_first_for_locale, normalize_date, parse_date
+
+
+@pytest.mark.parametrize(
+    "text,day_first,expected",
+    [
+        ("2024-01-15", False, "2024-01-15"),
+        ("2024-01-15T10:30:00", False, "2024-01-15"),
+        ("01/15/2024", False, "2024-01-15"),
+        ("01-15-24", False, "2024-01-15"),
+        ("03/04/2024", False, "2024-03-04"),
+        ("03/04/2024", True, "2024-04-03"),
+        # Unambiguous dates parse the same way in either locale
+        ("15/01/2024", False, "2024-01-15"),
+        ("01/15/2024", True, "2024-01-15"),
+        ("15.01.2024", True, "2024-01-15"),
+        ("Jan 15, 2024", False, "2024-01-15"),
+        ("15 January 2024", True, "2024-01-15"),
+        ("2024-02-30", False, None),
+        ("13/13/2024", False, None),
+        ("not a date", False, None),
+    ],
+)
+def test_normalize_date(text, day_first, expected):
+    """Test the supported formats and locale handling of ambiguous dates."""
+    assert normalize_date(text, day_first) == expected
+
+
+def test_parse_date_is_memoized():
+    """Test that repeated dates are served from the cache."""
+    parse_date.cache_clear()
+
+    for _ in range(3):
+        parse_date("01/15/2024")
+
+    assert parse_date.cache_info().hits == 2
+
+
+def test_day_first_for_locale():
+    """Test locale to date order mapping."""
+    assert day_first_for_locale("en_US") is False
+    assert day_first_for_locale("en_US.UTF-8") is False
+    assert day_first_for_locale("en-GB") is True
+    assert day_first_for_locale("de_DE") is True
@@ -0,0 +1,50 @@
+"""Tests for near-duplicate chunk detection."""
+
+import pytest
+
+from src.dedupe import MinHashDeduplicator
+
+DISCLAIMER = (
+    "This statement is provided for information purposes only and does not "
+    "constitute an offer or solicitation. Past performance is not indicative "
+    "of future results. Please review the terms and conditions of your account "
+    "agreement for details on fees, interest charges and dispute procedures."
+)
+
+
+def test_identical_chunks_collapse():
+    """Exact repeats map to the first occurrence."""
+    dedup = MinHashDeduplicator()
+    texts = [DISCLAIMER, "01/15/2024 Payment to Acme Corp $1000.00", DISCLAIMER]
+
+    assert dedup.representatives(texts) == [0, 1, 0]
+
+
+def test_near_identical_chunks_collapse():
+    """Small edits such as page numbers still collapse."""
+    dedup = MinHashDeduplicator(threshold=0.8)
+    texts = [f"Page {page} of 12. " + DISCLAIMER for page in range(1, 6)]
+
+    assert dedup.representatives(texts) == [0, 0, 0, 0, 0]
+
+
+def test_distinct_chunks_are_kept():
+    """Chunks with different content remain their own representative."""
+    dedup = MinHashDeduplicator()
+    texts = [
+        "01/15/2024 Payment to Acme Corp $1000.00 invoice 4411 net 30",
+        "01/16/2024 Payment to Beta Inc $2000.00 invoice 9921 net 60",
+        DISCLAIMER,
+    ]
+
+    assert dedup.representatives(texts) == [0, 1, 2]
+
+
+def test_signature_is_deterministic():
+    """Signatures do not depend on the process hash seed."""
+    first = MinHashDeduplicator(seed=3).signature(DISCLAIMER)
+    second = MinHashDeduplicator(seed=3).signature(DISCLAIMER.upper())
+
+    assert (first == second).all()
+    with pytest.raises(ValueError):
+        MinHashDeduplicator(num_perm=100, bands=16)
@@ -0,0 +1,45 @@
+"""Tests for embedding compression."""
+
+import numpy as np
+import pytest
+
+from src.embeddings import EmbeddingCompressor, dequantize_int8, quantize_int8
+
+
+def test_quantize_int8_round_trip():
+    """Test that dequantized vectors stay close to the originals."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((20, 768)).astype(np.float32)
+
+    codes, scales = quantize_int8(vectors)
+    restored = dequantize_int8(codes, scales)
+
+    assert codes.dtype == np.int8
+    assert np.abs(restored - vectors).max() <= scales.max() / 2 + 1e-6
+
+
+def test_compressor_reduces_and_quantizes():
+    """Test dimension reduction combined with int8 quantization."""
+    vectors = [[0.1] * 768, [-0.2] * 768]
+    compressed = EmbeddingCompressor(dimensions=256, quantize=True).compress(vectors)
+
+    assert len(compressed.values[0]) == 256
+    assert all(isinstance(v, int) for v in compressed.values[0])
+    assert len(compressed.scales) == 2
+
+
+def test_compressor_disabled_passes_through():
+    """Test that a default compressor leaves vectors untouched."""
+    vectors = [[0.1, 0.2]]
+    compressed = EmbeddingCompressor().compress(vectors)
+
+    assert compressed.values is vectors
+    assert compressed.scales is None
+
+
+def test_compressor_bytes_per_vector():
+    """Test reported storage size."""
+    assert EmbeddingCompressor().bytes_per_vector() == 3072
+    assert EmbeddingCompressor(256, quantize=True).bytes_per_vector() == 260
+    with pytest.raises(ValueError):
+        EmbeddingCompressor(dimensions=1024)
@@ -0,0 +1,72 @@
+"""Tests for incremental re-audit planning."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.incremental import (
+    ChunkManifest,
+    ManifestStore,
+    fingerprint_chunk,
+    plan_incremental,
+    vector_id_for,
+)
+
+
+def test_fingerprint_ignores_whitespace():
+    """Whitespace-only edits keep the fingerprint."""
+    assert fingerprint_chunk("Paid  Acme\n$100") == fingerprint_chunk("Paid Acme $100 ")
+    assert fingerprint_chunk("Paid Acme $100") != fingerprint_chunk("Paid Acme $101")
+
+
+def test_plan_first_run_embeds_unique_chunks():
+    """Without a previous manifest every distinct chunk is pending."""
+    plan = plan_incremental(["a", "b", "a"], "t1", "ledger.pdf", None)
+
+    assert plan.pending == [0, 1]
+    assert plan.vector_ids[0] == plan.vector_ids[2] == vector_id_for("t1", "ledger.pdf", "a")
+    assert plan.stale_vector_ids == []
+    assert plan.reused == 0
+
+
+def test_plan_reuses_unchanged_and_marks_stale():
+    """Unchanged chunks keep their vectors; removed chunks become stale."""
+    previous = ChunkManifest("t1", "ledger.pdf", "run-a", {"a": "ch:a", "b": "ch:b"})
+
+    plan = plan_incremental(["a", "c"], "t1", "ledger.pdf", previous)
+
+    assert plan.vector_ids[0] == "ch:a"
+    assert plan.pending == [1]
+    assert plan.stale_vector_ids == ["ch:b"]
+    assert plan.reused == 1
+
+
+def test_manifest_store_round_trip():
+    """Manifests are saved to and loaded from R2."""
+    r2 = MagicMock()
+    store = ManifestStore(r2)
+    manifest = ChunkManifest("t1", "ledger.pdf", "run-a", {"a": "ch:a"})
+
+    store.save(manifest)
+    key, body = r2.put_object.call_args[0]
+    r2.get_object.return_value = body
+
+    assert key.startswith("manifests/t1/")
+    assert store.load("t1", "ledger.pdf") == manifest
+
+
+def test_manifest_store_missing_returns_none():
+    """A missing manifest means a first run."""
+    r2 = MagicMock()
+    r2.get_object.side_effect = ClientError(
+        {"Error": {"Code": "NoSuchKey", "Message": "missing"}}, "GetObject"
+    )
+
+    assert ManifestStore(r2).load("t1", "ledger.pdf") is None
+
+    r2.get_object.side_effect = ClientError(
+        {"Error": {"Code": "AccessDenied", "Message": "denied"}}, "GetObject"
+    )
+    with pytest.raises(ClientError):
+        ManifestStore(r2).load("t1", "ledger.pdf")
@@ -0,0 +1,249 @@
+"""Tests for the R2 client against an in-memory S3."""
+
+import gzip
+import hashlib
+import io
+import os
+import re
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.cache import BlobCache
+from src.r2 import R2Client
+
+
+class FakeS3:
+    """
+    S3 get_object over a dict of objects, with Range, IfMatch and IfNoneMatch support.
+
+    Methods take boto3's parameter names, hence the N803 exemptions.
+    """
+
+    def __init__(self, objects: dict[str, bytes], content_type: str = "application/pdf"):
+        self.objects = objects
+        self.content_type = content_type
+        self.calls: list[dict] = []
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None, IfNoneMatch=None):  # noqa: N803
+        self.calls.append({"Key": Key, "Range": Range, "IfMatch": IfMatch})
+        data = self.objects[Key]
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if IfMatch is not None and IfMatch != etag:
+            raise ClientError({"Error": {"Code": "PreconditionFailed"}}, "GetObject")
+        if IfNoneMatch == etag:
+            raise ClientError({"Error": {"Code": "304", "Message": "Not Modified"}}, "GetObject")
+        response = {"ETag": etag, "ContentType": self.content_type, "Metadata": {"run": "r1"}}
+        if Range is None:
+            return {**response, "Body": io.BytesIO(data), "ContentLength": len(data)}
+        start, end = map(int, re.fullmatch(r"bytes=(\d+)-(\d+)", Range).groups())
+        if start >= len(data):
+            raise ClientError({"Error": {"Code": "InvalidRange"}}, "GetObject")
+        part = data[start : end + 1]
+        return {
+            **response,
+            "Body": io.BytesIO(part),
+            "ContentLength": len(part),
+            "ContentRange": f"bytes {start}-{start + len(part) - 1}/{len(data)}",
+        }
+
+    def head_object(self, **kwargs):
+        raise AssertionError("download should not issue HEAD requests")
+
+    def put_object(self, Bucket, Key, Body, **extra_args):  # noqa: N803
+        self.objects[Key] = Body
+        self.extra_args = extra_args
+        return {"ETag": f'"{hashlib.md5(Body).hexdigest()}"'}
+
+    def create_multipart_upload(self, Bucket, Key, **extra_args):  # noqa: N803
+        self.extra_args = extra_args
+        self.parts: dict[int, bytes] = {}
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):  # noqa: N803
+        self.parts[PartNumber] = Body
+        return {"ETag": f'"{hashlib.md5(Body).hexdigest()}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):  # noqa: N803
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == sorted(self.parts)
+        self.objects[Key] = b"".join(self.parts[number] for number in numbers)
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):  # noqa: N803
+        self.aborted = UploadId
+        return {}
+
+
+@pytest.fixture
+def config():
+    """Config with R2 download settings."""
+    config = MagicMock()
+    config.r2_bucket = "test-bucket"
+    config.r2_part_size = 8 * 1024 * 1024
+    config.r2_download_workers = 4
+    config.r2_upload_workers = 4
+    config.r2_spool_max_bytes = 16 * 1024 * 1024
+    return config
+
+
+def make_client(config, objects, cache=None):
+    with patch("src.r2.boto3.client", return_value=FakeS3(objects)):
+        return R2Client(config, cache)
+
+
+def test_download_small_object_in_memory(config):
+    """An object smaller than a part takes one GET into a memory buffer."""
+    client = make_client(config, {"doc.pdf": b"%PDF small"})
+
+    with client.download("doc.pdf") as blob:
+        assert bytes(blob.view()) == b"%PDF small"
+        assert blob.content_type == "application/pdf"
+        assert blob.metadata == {"run": "r1"}
+        assert not blob.spooled
+    assert len(client.s3.calls) == 1
+
+
+def test_download_large_object_in_parallel_ranges(config):
+    """Remaining parts are fetched by conditional ranged GETs into a spooled file."""
+    data = bytes(range(256)) * 40 + b"tail"
+    client = make_client(config, {"ledger.pdf": data})
+
+    blob = client.download("ledger.pdf", part_size=1000, spool_max_bytes=4096)
+
+    assert blob.spooled
+    assert len(blob) == len(data)
+    assert bytes(blob.view()) == data
+    calls = client.s3.calls
+    assert len(calls) == 11
+    assert calls[0]["IfMatch"] is None
+    assert all(call["IfMatch"] == blob.etag for call in calls[1:])
+    assert sorted(call["Range"] for call in calls)[-1] == "bytes=9000-9999"
+    blob.close()
+    with pytest.raises(ValueError):
+        blob.view()
+
+
+def test_download_empty_object(config):
+    """An empty object cannot satisfy a range and falls back to a plain GET."""
+    client = make_client(config, {"empty.csv": b""})
+
+    blob = client.download("empty.csv")
+
+    assert len(blob) == 0
+    assert bytes(blob.view()) == b""
+    assert [call["Range"] for call in client.s3.calls] == ["bytes=0-8388607", None]
+
+
+def test_cached_download_revalidates_with_etag(config, tmp_path):
+    """Unchanged objects are served from the cache after a 304; changed ones re-download."""
+    cache = BlobCache(tmp_path)
+    client = make_client(config, {"doc.pdf": b"%PDF v1"}, cache)
+
+    with client.download("doc.pdf") as blob:
+        assert bytes(blob.view()) == b"%PDF v1"
+    with client.download("doc.pdf") as blob:
+        assert bytes(blob.view()) == b"%PDF v1"
+        assert blob.content_type == "application/pdf"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5, "bytes_served": 7}
+
+    client.s3.objects["doc.pdf"] = b"%PDF v2"
+    with client.download("doc.pdf") as blob:
+        assert bytes(blob.view()) == b"%PDF v2"
+    with client.download("doc.pdf") as blob:
+        assert bytes(blob.view()) == b"%PDF v2"
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_cached_download_maps_large_entries(config, tmp_path):
+    """Cached objects above the spool limit are mapped from the cache file."""
+    data = bytes(range(256)) * 40
+    client = make_client(config, {"ledger.pdf": data}, BlobCache(tmp_path))
+
+    client.download("ledger.pdf", part_size=1000).close()
+    blob = client.download("ledger.pdf", spool_max_bytes=1024)
+
+    assert blob.spooled
+    assert bytes(blob.view()) == data
+    # 11 ranged GETs for the first download, one revalidation for the second
+    assert len(client.s3.calls) == 12
+    blob.close()
+
+
+def test_blob_cache_evicts_least_recently_used(config, tmp_path):
+    """Entries are evicted oldest first once the total size exceeds max_bytes."""
+    cache = BlobCache(tmp_path, max_bytes=10)
+    objects = {"a": b"aaaa", "b": b"bbbb", "c": b"cccc"}
+    client = make_client(config, objects, cache)
+
+    for key in ("a", "b"):
+        client.download(key).close()
+    # Touch "a" so "b" is the least recently used
+    client.download("a").close()
+    old = time.time() - 60
+    os.utime(cache._paths("b")[0], (old, old))
+    client.download("c").close()
+
+    assert cache.lookup("a") is not None
+    assert cache.lookup("b") is None
+    assert cache.lookup("c") is not None
+
+
+def test_upload_streams_compressed_multipart(config):
+    """A generator is gzipped on the fly and uploaded in equal-sized parts."""
+    client = make_client(config, {})
+    lines = (f"line {i}: {hashlib.sha256(str(i).encode()).hexdigest()}\n" for i in range(2000))
+
+    client.upload(
+        "export.jsonl",
+        lines,
+        content_type="application/x-ndjson",
+        compression="gzip",
+        part_size=4096,
+        max_workers=2,
+    )
+
+    s3 = client.s3
+    assert s3.extra_args == {"ContentType": "application/x-ndjson", "ContentEncoding": "gzip"}
+    assert len(s3.parts) > 2
+    assert {len(part) for number, part in s3.parts.items() if number < len(s3.parts)} == {4096}
+    text = gzip.decompress(s3.objects["export.jsonl"]).decode()
+    assert text.splitlines()[1999].startswith("line 1999: ")
+
+
+def test_upload_small_object_in_one_put(config):
+    """Data that fits in one part is sent with a single PUT."""
+    client = make_client(config, {})
+
+    client.upload("reports/r.md", io.BytesIO(b"# Report"), content_type="text/markdown")
+
+    assert client.s3.objects["reports/r.md"] == b"# Report"
+    assert client.s3.extra_args == {"ContentType": "text/markdown"}
+
+
+def test_upload_zstd(config):
+    """zstd uploads set the matching Content-Encoding."""
+    zstandard = pytest.importorskip("zstandard")
+    client = make_client(config, {})
+
+    client.upload("text.txt", ["abc" * 1000, b"def"], compression="zstd")
+
+    assert client.s3.extra_args == {"ContentEncoding": "zstd"}
+    data = zstandard.ZstdDecompressor().decompressobj().decompress(client.s3.objects["text.txt"])
+    assert data == b"abc" * 1000 + b"def"
+
+
+def test_failed_multipart_upload_is_aborted(config):
+    """A part that fails aborts the multipart upload."""
+    client = make_client(config, {})
+    client.s3.upload_part = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "InternalError"}}, "UploadPart")
+    )
+
+    with pytest.raises(ClientError):
+        client.upload("big.bin", [b"x" * 100] * 5, part_size=100)
+
+    assert client.s3.aborted == "upload-1"
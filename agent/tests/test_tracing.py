@@ -0,0 +1,131 @@
+"""Tests for tracing spans and their exporters."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import httpx
+import orjson
+import pytest
+from tenacity import wait_none
+
+from src import tracing
+from src.edge_client import EdgeClient
+from src.tracing import JsonlExporter, OtlpExporter, Tracer
+
+
+class ListExporter:
+    """Exporter collecting the spans of each exported trace."""
+
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(list(spans))
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Process-wide tracer exporting to a list, restored after the test."""
+    exporter = ListExporter()
+    monkeypatch.setattr(tracing, "_tracer", Tracer(exporter))
+    return exporter
+
+
+def test_spans_nest_across_threads(exporter):
+    """Child spans, including those opened in other threads, share the root's trace."""
+
+    def fetch():
+        with tracing.span("r2.get_object"):
+            pass
+
+    with tracing.span("run", run_id="run-1") as root:
+        with tracing.span("node.extract", chars=10) as child:
+            child.add("bytes", 5)
+            child.add("bytes", 7)
+        with tracing.span("node.audit") as audit:
+            thread = threading.Thread(target=tracing.in_context(fetch))
+            thread.start()
+            thread.join()
+        with pytest.raises(ValueError), tracing.span("step.analyze"):
+            raise ValueError("bad response")
+    assert exporter.traces == [exporter.traces[0]]
+
+    spans = {span.name: span for span in exporter.traces[0]}
+    assert {span.trace_id for span in spans.values()} == {root.trace_id}
+    assert {span.run_id for span in spans.values()} == {"run-1"}
+    assert spans["node.extract"].parent_id == root.span_id
+    assert spans["node.extract"].attributes == {"chars": 10, "bytes": 12}
+    assert spans["r2.get_object"].parent_id == audit.span_id
+    assert spans["step.analyze"].error == "ValueError: bad response"
+    assert spans["run"].duration_ms >= spans["node.extract"].duration_ms
+
+
+def test_edge_call_records_attempts_bytes_and_tokens(exporter):
+    """An LLM call's span has its retries, the HTTP span its sizes, and Gemini token usage."""
+    responses = [
+        httpx.Response(503),
+        httpx.Response(
+            200,
+            json={
+                "candidates": [],
+                "usageMetadata": {
+                    "promptTokenCount": 120,
+                    "candidatesTokenCount": 30,
+                    "totalTokenCount": 150,
+                },
+            },
+        ),
+    ]
+    config = MagicMock(edge_base_url="https://edge.test", edge_api_token="token")
+    client = EdgeClient(config)
+    client.client = httpx.Client(transport=httpx.MockTransport(lambda request: responses.pop(0)))
+
+    with patch.object(EdgeClient.llm_gateway.retry, "wait", wait_none()):
+        client.llm_gateway([{"role": "user", "parts": [{"text": "hi"}]}])
+
+    spans = exporter.traces[0]
+    llm = spans[-1]
+    assert llm.name == "edge.llm_gateway"
+    assert llm.attributes == {
+        "attempts": 2,
+        "prompt_tokens": 120,
+        "output_tokens": 30,
+        "total_tokens": 150,
+    }
+    http = [span for span in spans if span.name == "POST /llm/gateway"]
+    assert [span.attributes["status_code"] for span in http] == [503, 200]
+    assert http[0].error and http[1].error is None
+    assert http[1].attributes["request_bytes"] > 0
+    assert all(span.parent_id == llm.span_id for span in http)
+
+
+def test_exporters_write_jsonl_and_otlp(tmp_path):
+    """Traces are appended as JSON lines or posted to a collector in OTLP JSON."""
+    requests = []
+
+    def collector(request):
+        requests.append(request)
+        return httpx.Response(200)
+
+    otlp = OtlpExporter(
+        "http://collector:4318", client=httpx.Client(transport=httpx.MockTransport(collector))
+    )
+    tracer = Tracer(JsonlExporter(tmp_path))
+    with tracer.span("run", run_id="run-1"):
+        with tracer.span("r2.get_object", bytes=2048, spooled=False):
+            pass
+    tracer.exporter = otlp
+    with tracer.span("run", run_id="run-2"):
+        pass
+
+    [path] = tmp_path.iterdir()
+    lines = [orjson.loads(line) for line in path.read_bytes().splitlines()]
+    assert [line["name"] for line in lines] == ["r2.get_object", "run"]
+    assert lines[0]["attributes"] == {"bytes": 2048, "spooled": False}
+    assert lines[0]["parent_id"] == lines[1]["span_id"]
+
+    assert str(requests[0].url) == "http://collector:4318/v1/traces"
+    [span] = orjson.loads(requests[0].content)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert span["name"] == "run" and "parentSpanId" not in span
+    assert span["attributes"] == [{"key": "run_id", "value": {"stringValue": "run-2"}}]
+    assert span["status"] == {"code": 1}
@@ -0,0 +1,78 @@
+"""Tests for streaming transaction extraction."""
+
+from src.graph.nodes import extract_transactions_from_text
+from src.transactions import iter_transactions
+
+
+def test_extracts_vendor_and_memo_from_prose():
+    """Test that prose descriptions yield the counterparty as vendor."""
+    text = "01/15/2024 Payment to Acme Corp $1000.00. 01/16/2024 Refund from Beta Inc $2,000.50."
+
+    txns = list(iter_transactions(text))
+
+    assert [t.id for t in txns] == ["txn_0", "txn_1"]
+    assert [t.amount for t in txns] == [1000.0, 2000.5]
+    assert [t.date for t in txns] == ["01/15/2024", "01/16/2024"]
+    assert [t.iso_date for t in txns] == ["2024-01-15", "2024-01-16"]
+    assert [t.vendor for t in txns] == ["Acme Corp", "Beta Inc"]
+    assert txns[0].memo == "Payment to Acme Corp"
+
+
+def test_extracts_tabular_rows():
+    """Test column splitting, ISO dates and negative amounts."""
+    text = (
+        "Date\tVendor\tMemo\tAmount\n"
+        "2024-03-02\tAcme Corp\tInvoice 4411\t$1,250.00\n"
+        "03/09/2024 | Beta Inc | Refund | (45.10)\n"
+        "03/10/2024  Gamma LLC  Credit  -12.00\n"
+    )
+
+    txns = list(iter_transactions(text))
+
+    assert [(t.date, t.vendor, t.memo, t.amount) for t in txns] == [
+        ("2024-03-02", "Acme Corp", "Invoice 4411", 1250.0),
+        ("03/09/2024", "Beta Inc", "Refund", -45.1),
+        ("03/10/2024", "Gamma LLC", "Credit", -12.0),
+    ]
+
+
+def test_separator_dash_is_not_a_sign():
+    """Test that only a dash or parentheses attached to the amount make it negative."""
+    text = (
+        "01/15/2024 Acme Corp - $1,000.00\n"
+        "01/16/2024 Payment to Acme - 1000.00 fee\n"
+        "01/17/2024 Beta Inc -$25.00\n"
+        "01/18/2024 Gamma LLC (see note 250.00\n"
+        "01/19/2024 Delta Co ($75.50)\n"
+    )
+
+    txns = list(iter_transactions(text))
+
+    assert [t.amount for t in txns] == [1000.0, 1000.0, -25.0, 250.0, -75.5]
+    assert txns[0].vendor is None and txns[0].memo == "Acme Corp"
+
+
+def test_amount_must_be_on_the_same_line():
+    """Test that a date is never paired with an amount on a later line."""
+    text = "03/10/2024 no amount here\n12.50 orphan\n" + "01/01/2024 " + "x" * 500 + " $5.00"
+
+    assert list(iter_transactions(text)) == []
+
+
+def test_no_row_cap():
+    """Test that long statements are extracted in full."""
+    text = "\n".join(f"01/{i % 28 + 1:02d}/2024 Vendor {i}  ${i}.00" for i in range(1, 501))
+
+    txns = extract_transactions_from_text(text)
+
+    assert len(txns) == 500
+    assert txns[-1].id == "txn_499"
+    assert txns[-1].amount == 500.0
+
+
+def test_day_first_dates():
+    """Test that ambiguous dates follow the requested order."""
+    text = "03/04/2024 Payment to Acme Corp $10.00"
+
+    assert list(iter_transactions(text))[0].iso_date == "2024-03-04"
+    assert list(iter_transactions(text, day_first=True))[0].iso_date == "2024-04-03"
@@ -0,0 +1,115 @@
+"""Tests for the local vector index."""
+
+import numpy as np
+import pytest
+
+from src.vector_index import LocalVectorIndex, matches_filter
+
+
+@pytest.fixture
+def corpus():
+    """Random unit vectors with IDs."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 32)).astype(np.float32)
+    ids = [f"v{i}" for i in range(len(vectors))]
+    return ids, vectors
+
+
+def brute_force(vectors, query, k):
+    """Reference cosine top-k."""
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+def test_exact_query_matches_brute_force(corpus):
+    """Blocked exact search returns the true nearest neighbours in order."""
+    ids, vectors = corpus
+    index = LocalVectorIndex(block_size=64)
+    index.vector_upsert(ids, vectors.tolist())
+
+    matches = index.vector_query(vectors[7].tolist(), top_k=5)
+
+    assert [m["id"] for m in matches] == [ids[i] for i in brute_force(vectors, vectors[7], 5)]
+    assert matches[0]["score"] == pytest.approx(1.0)
+
+
+def test_query_applies_metadata_filter(corpus):
+    """Filtered-out vectors never appear, even if fewer than top_k remain."""
+    ids, vectors = corpus
+    index = LocalVectorIndex()
+    metadatas = [{"run_id": f"run-{i % 5}", "chunk_index": i} for i in range(len(ids))]
+    index.vector_upsert(ids, vectors.tolist(), metadatas)
+
+    matches = index.vector_query(
+        vectors[0].tolist(),
+        top_k=200,
+        filter={"run_id": "run-0", "chunk_index": {"$lt": 50}},
+    )
+
+    assert len(matches) == 10
+    assert all(m["metadata"]["run_id"] == "run-0" for m in matches)
+
+
+def test_matches_filter_operators():
+    """Vectorize filter operators are supported."""
+    metadata = {"tenant_id": "t1", "amount": 10}
+
+    assert matches_filter(metadata, {"tenant_id": {"$in": ["t1", "t2"]}})
+    assert matches_filter(metadata, {"tenant_id": {"$ne": "t2"}, "amount": {"$gte": 10}})
+    assert not matches_filter(metadata, {"amount": {"$gt": 10}})
+    assert not matches_filter(metadata, {"missing": {"$lt": 5}})
+    with pytest.raises(ValueError):
+        matches_filter(metadata, {"amount": {"$regex": "1"}})
+
+
+def test_upsert_replaces_and_delete_removes(corpus):
+    """Upserting an existing ID replaces it; deleted IDs are no longer returned."""
+    ids, vectors = corpus
+    index = LocalVectorIndex()
+    index.vector_upsert(ids[:10], vectors[:10].tolist())
+    index.vector_upsert([ids[0]], [vectors[20].tolist()], [{"replaced": True}])
+
+    assert len(index) == 10
+    assert index.vector_query(vectors[20].tolist(), top_k=1)[0]["metadata"] == {"replaced": True}
+
+    assert index.vector_delete([ids[0], ids[3], "unknown"])["count"] == 2
+    assert len(index) == 8
+    assert index.get(ids[0]) is None
+    # The row moved into the hole still resolves to its own vector
+    assert index.vector_query(vectors[9].tolist(), top_k=1)[0]["id"] == ids[9]
+
+
+def test_ivf_search_recall(corpus):
+    """Approximate IVF search recovers most exact neighbours."""
+    ids, vectors = corpus
+    index = LocalVectorIndex(nprobe=4)
+    index.vector_upsert(ids, vectors.tolist())
+    index.build_ivf(nlist=16)
+
+    queries = vectors[:50]
+    results = index.vector_query_batch(queries.tolist(), top_k=10)
+    hits = sum(
+        len({m["id"] for m in found} & {ids[i] for i in brute_force(vectors, q, 10)})
+        for q, found in zip(queries, results)
+    )
+
+    assert hits / 500 > 0.5
+    assert all(found[0]["id"] == ids[i] for i, found in enumerate(results))
+
+
+def test_save_and_load_memory_mapped(corpus, tmp_path):
+    """A saved index reopens memory-mapped and accepts further writes."""
+    ids, vectors = corpus
+    index = LocalVectorIndex(metric="euclidean")
+    index.vector_upsert(ids[:100], vectors[:100].tolist(), [{"i": i} for i in range(100)])
+    index.save(tmp_path)
+
+    loaded = LocalVectorIndex.load(tmp_path)
+    assert isinstance(loaded.vectors, np.memmap)
+    match = loaded.vector_query(vectors[42].tolist(), top_k=1)[0]
+    assert match == {"id": ids[42], "score": pytest.approx(0.0, abs=1e-3), "metadata": {"i": 42}}
+
+    loaded.vector_upsert([ids[100]], [vectors[100].tolist()])
+    loaded.vector_delete([ids[0]])
+    assert len(loaded) == 100
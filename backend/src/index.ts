@@ -11,7 +11,7 @@ import { rateLimit } from './middleware/ratelimit.js';
 import { authStart } from './routes/auth.js';
 import { createUpload, directUpload } from './routes/uploads.js';
 import { enqueueRun, getRunStatus, getReportUrl, getReportContent } from './routes/runs.js';
-import { vectorUpsert, vectorQuery } from './routes/vector.js';
+import { vectorUpsert, vectorQuery, vectorDelete } from './routes/vector.js';
 import { d1Query } from './routes/d1.js';
 import { llmGateway, llmEmbed } from './routes/llm.js';
 import { wsRunConnection } from './routes/ws.js';
@@ -88,6 +88,7 @@ app.get('/ws/run/:runId', wsRunConnection);
 // Vector routes
 app.post('/vector/upsert', rateLimit({ maxTokens: 30, refillRate: 3 }), vectorUpsert);
 app.post('/vector/query', rateLimit({ maxTokens: 60, refillRate: 6 }), vectorQuery);
+app.post('/vector/delete', rateLimit({ maxTokens: 30, refillRate: 3 }), vectorDelete);
 
 // D1 proxy routes
 app.post('/d1/query', rateLimit({ maxTokens: 30, refillRate: 3 }), d1Query);
@@ -34,6 +34,10 @@ export const vectorQuerySchema = z.object({
   filter: z.record(z.any()).optional(),
 });
 
+export const vectorDeleteSchema = z.object({
+  ids: z.array(z.string()).min(1).max(1000),
+});
+
 // D1 query schemas
 export const d1QuerySchema = z.object({
   name: z.enum(['insert_run', 'update_status', 'insert_finding', 'get_run', 'get_findings', 'insert_event']),
@@ -130,7 +130,8 @@ export async function llmEmbed(c: Context<{ Bindings: Env }>): Promise<Response>
       // Convert requests to Google AI Studio format
       const googleRequests = body.requests.map(req => ({
         model: req.model || "models/text-embedding-004",
-        content: req.content
+        content: req.content,
+        ...(req.outputDimensionality ? { outputDimensionality: req.outputDimensionality } : {}),
       }));
       
       const payload = {
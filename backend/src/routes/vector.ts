@@ -4,7 +4,7 @@
 
 import { Context } from 'hono';
 import { Env } from '../types.js';
-import { vectorUpsertSchema, vectorQuerySchema } from '../lib/schema.js';
+import { vectorUpsertSchema, vectorQuerySchema, vectorDeleteSchema } from '../lib/schema.js';
 import { ValidationError, ServerError } from '../lib/errors.js';
 
 /**
@@ -89,3 +89,31 @@ export async function vectorQuery(c: Context<{ Bindings: Env }>): Promise<Respon
   }
 }
 
+
+/**
+ * POST /vector/delete
+ * Delete vectors from Vectorize index by ID
+ */
+export async function vectorDelete(c: Context<{ Bindings: Env }>): Promise<Response> {
+  const body = await c.req.json();
+
+  // Validate input
+  const parsed = vectorDeleteSchema.safeParse(body);
+  if (!parsed.success) {
+    throw new ValidationError('Invalid request', parsed.error.errors);
+  }
+
+  const { ids } = parsed.data;
+
+  try {
+    await c.env.VEC.deleteByIds(ids);
+
+    return c.json({
+      success: true,
+      count: ids.length,
+    });
+  } catch (error) {
+    console.error('Vectorize delete failed:', error);
+    throw new ServerError('Failed to delete vectors');
+  }
+}